@@ -0,0 +1,123 @@
+"""
+Last edited: October 18 2026
+
+Content-addressed on-disk cache for the results of the time series aggregation.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import pandas as pd
+
+
+class ClusterCache(object):
+    """
+    The ClusterCache class stores the results of the time series aggregation (clusterPeriodDict, clusterOrder,
+    clusterPeriodIdx, clusterCenterIndices and the segment durations of the tsam TimeSeriesAggregation instance) in a
+    directory. Each entry is stored in one file whose name is a hash of the clustered time series data, the weights
+    and all clustering arguments. If the total size of the stored files exceeds the maximum size, the least recently
+    used entries are removed.
+    """
+
+    def __init__(self, directory, maxSize=1024):
+        """
+        Constructor for creating a ClusterCache class instance.
+
+        :param directory: directory in which the cache files are stored. It is created if it does not exist.
+        :type directory: string
+
+        :param maxSize: maximum size of the cache [MB].
+            |br| * the default value is 1024
+        :type maxSize: strictly positive float or integer
+        """
+        self.directory, self.maxSize = directory, maxSize
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def getKey(timeSeriesData, weightDict, **clusteringArgs):
+        """
+        Get the key of a clustering run, i.e. the hash of the time series data (values, index and columns), the
+        weights and the clustering arguments.
+
+        :param timeSeriesData: time series data which is clustered.
+        :type timeSeriesData: pandas DataFrame
+
+        :param weightDict: weights of the time series.
+        :type weightDict: dictionary
+
+        :param clusteringArgs: arguments of the clustering run (e.g. numberOfTypicalPeriods).
+
+        :return: key of the clustering run
+        :rtype: string
+        """
+        hashObject = hashlib.sha256()
+        hashObject.update(pd.util.hash_pandas_object(timeSeriesData, index=True).values.tobytes())
+        hashObject.update(repr(list(timeSeriesData.columns)).encode())
+        hashObject.update(repr(sorted(weightDict.items())).encode())
+        hashObject.update(repr(sorted(clusteringArgs.items())).encode())
+        return hashObject.hexdigest()
+
+    def getFileName(self, key):
+        """ Return the name of the file of a cache entry. """
+        return os.path.join(self.directory, key + '.pkl')
+
+    def load(self, key):
+        """
+        Load the results of a clustering run. The access time of the entry is updated for the LRU eviction.
+
+        :param key: key of the clustering run (cf. getKey).
+        :type key: string
+
+        :return: clusterPeriodDict, clusterOrder, clusterPeriodIdx, clusterCenterIndices and segment durations or None
+            if the entry does not exist
+        :rtype: tuple or None
+        """
+        fileName = self.getFileName(key)
+        try:
+            with open(fileName, 'rb') as file:
+                results = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(fileName)
+        return results
+
+    def store(self, key, clusterPeriodDict, clusterOrder, clusterPeriodIdx, clusterCenterIndices,
+              segmentDurations=None):
+        """
+        Store the results of a clustering run and remove the least recently used entries if the maximum size of the
+        cache is exceeded. The file is written to a temporary file first such that no incomplete entries are read.
+
+        :param key: key of the clustering run (cf. getKey).
+        :type key: string
+        """
+        file, tmpFileName = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(file, 'wb') as file:
+            pickle.dump((clusterPeriodDict, clusterOrder, clusterPeriodIdx, clusterCenterIndices, segmentDurations),
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpFileName, self.getFileName(key))
+        self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used entries until the total size of the cache is below its maximum size.
+
+        :param keep: key of an entry which is not removed (e.g. the one which was just stored).
+            |br| * the default value is None
+        :type keep: string or None
+        """
+        entries = []
+        for fileName in os.listdir(self.directory):
+            if fileName.endswith('.pkl'):
+                stat = os.stat(os.path.join(self.directory, fileName))
+                entries.append((stat.st_mtime, stat.st_size, fileName))
+        totalSize, maxSize = sum(entry[1] for entry in entries), self.maxSize * 1e6
+        for _, size, fileName in sorted(entries):
+            if totalSize <= maxSize:
+                break
+            if keep is not None and fileName == keep + '.pkl':
+                continue
+            try:
+                os.remove(os.path.join(self.directory, fileName))
+            except OSError:
+                continue
+            totalSize -= size
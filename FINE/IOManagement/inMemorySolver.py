@@ -0,0 +1,282 @@
+"""
+Last edited: October 18 2026
+
+In-memory interface to the HiGHS solver which passes the optimization problem of an energy system model to the
+solver without writing and reading files.
+"""
+from array import array
+import numpy as np
+import pyomo.environ as pyomo
+import pyomo.opt as opt
+from pyomo.repn import generate_standard_repn
+
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
+
+class ProblemMatrix(object):
+    """
+    The ProblemMatrix class assembles the (linear) optimization problem of a declared pyomo model in memory. Each
+    active constraint results in one row with a lower and an upper bound (compressed sparse row format). Each unfixed
+    variable which occurs in a constraint or in the objective function results in one column; fixed variables are
+    considered as constants. In contrast to the ProblemWriter, the pyomo model is not changed such that it can be
+    modified and optimized again afterwards.
+    """
+
+    def __init__(self, pyM):
+        """
+        Constructor for creating a ProblemMatrix class instance.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        # Columns: pyomo variables (by id); rows: pyomo constraints
+        self.columns, self.variables, self.constraints = {}, [], []
+        self.rowStarts, self.rowColumns, self.rowCoefficients = array('l', [0]), array('l'), array('d')
+        self.rowLower, self.rowUpper = array('d'), array('d')
+
+        for constr in pyM.component_objects(pyomo.Constraint, active=True, descend_into=True):
+            for index in constr:
+                self.addConstraint(constr[index])
+
+        repn = generate_standard_repn(pyM.Obj.expr, compute_values=True)
+        if repn.nonlinear_expr is not None or repn.quadratic_vars:
+            raise ValueError('The objective function is not linear.')
+        self.objective = {}
+        for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+            col = self.getColumn(var)
+            self.objective[col] = self.objective.get(col, 0) + float(coef)
+        self.objectiveConstant = float(repn.constant)
+
+    @property
+    def numberOfColumns(self):
+        return len(self.variables)
+
+    @property
+    def numberOfRows(self):
+        return len(self.constraints)
+
+    def getColumn(self, varData):
+        """ Return the column of a pyomo variable. A new column is assigned if the variable is not registered yet. """
+        col = self.columns.get(id(varData))
+        if col is None:
+            col = self.columns[id(varData)] = len(self.variables)
+            self.variables.append(varData)
+        return col
+
+    def addConstraint(self, constrData):
+        """
+        Add a row for a pyomo constraint, i.e. lower <= sum(coefficients * columns) <= upper.
+
+        :param constrData: (linear) pyomo constraint.
+        :type constrData: pyomo ConstraintData
+        """
+        repn = generate_standard_repn(constrData.body, compute_values=True)
+        if repn.nonlinear_expr is not None or repn.quadratic_vars:
+            raise ValueError('The constraint ' + constrData.name + ' is not linear.')
+        self.rowColumns.extend(self.getColumn(var) for var in repn.linear_vars)
+        self.rowCoefficients.extend(float(coef) for coef in repn.linear_coefs)
+        self.rowStarts.append(len(self.rowColumns))
+        self.rowLower.append(-np.inf if constrData.lower is None else pyomo.value(constrData.lower) - repn.constant)
+        self.rowUpper.append(np.inf if constrData.upper is None else pyomo.value(constrData.upper) - repn.constant)
+        self.constraints.append(constrData)
+
+    def getObjectiveCoefficients(self):
+        """ Return the objective function coefficients of the columns. """
+        cost = np.zeros(self.numberOfColumns)
+        cost[list(self.objective.keys())] = list(self.objective.values())
+        return cost
+
+    def getBounds(self):
+        """ Return the lower bounds, upper bounds and integrality (True for integer and binary columns). """
+        lower = np.array([-np.inf if varData.lb is None else varData.lb for varData in self.variables], dtype=float)
+        upper = np.array([np.inf if varData.ub is None else varData.ub for varData in self.variables], dtype=float)
+        isInteger = np.array([varData.is_integer() or varData.is_binary() for varData in self.variables], dtype=bool)
+        return lower, upper, isInteger
+
+    def getMatrix(self):
+        """ Return the row starts, column indices and coefficients of the constraint matrix as numpy arrays. """
+        return np.frombuffer(self.rowStarts, dtype=np.dtype(self.rowStarts.typecode)), \
+            np.frombuffer(self.rowColumns, dtype=np.dtype(self.rowColumns.typecode)) \
+            if self.rowColumns else np.zeros(0, dtype=int), \
+            np.frombuffer(self.rowCoefficients, dtype=float) if self.rowCoefficients else np.zeros(0)
+
+    def getRowActivities(self, values):
+        """ Return the values of sum(coefficients * columns) of the rows for the given values of the columns. """
+        starts, columns, coefficients = self.getMatrix()
+        rows = np.repeat(np.arange(self.numberOfRows), np.diff(starts))
+        return np.bincount(rows, weights=coefficients * np.asarray(values, dtype=float)[columns],
+                           minlength=self.numberOfRows)
+
+    def loadSolution(self, pyM, values, duals=None):
+        """
+        Set the values of the pyomo variables of the columns and, if given and if the pyomo model has an importing
+        'dual' suffix, the dual values of the pyomo constraints of the rows.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param values: values of the columns.
+        :type values: list or numpy array
+
+        :param duals: dual values of the rows.
+            |br| * the default value is None
+        :type duals: list, numpy array or None
+        """
+        for varData, value in zip(self.variables, values):
+            varData.value = float(value)
+        dual = getattr(pyM, 'dual', None)
+        if duals is not None and isinstance(dual, pyomo.Suffix) and dual.import_enabled():
+            for constrData, value in zip(self.constraints, duals):
+                dual[constrData] = float(value)
+
+
+def checkHighsAvailability():
+    """ Raise an ImportError if the highspy python package is not installed. """
+    if highspy is None:
+        raise ImportError('The highspy python package is required to solve the optimization problem with the '
+                          'in-memory HiGHS interface.')
+
+
+def getSolverStatus(modelStatus, hasSolution):
+    """
+    Translate a HiGHS model status into the pyomo solver status and termination condition. If a limit was reached
+    but a valid primal solution is available, the status is a warning such that the solution is processed. If no
+    valid primal solution is available, the status is at least an error (even if HiGHS reports an optimal model
+    status) such that no output is generated.
+
+    :param modelStatus: name of the HiGHS model status (e.g. 'kOptimal').
+    :type modelStatus: string
+
+    :param hasSolution: states if a valid primal solution is available.
+    :type hasSolution: boolean
+
+    :return: solver status and termination condition
+    :rtype: tuple (pyomo SolverStatus, pyomo TerminationCondition)
+    """
+    status, termCondition = {
+        'kOptimal': (opt.SolverStatus.ok, opt.TerminationCondition.optimal),
+        'kInfeasible': (opt.SolverStatus.warning, opt.TerminationCondition.infeasible),
+        'kUnbounded': (opt.SolverStatus.warning, opt.TerminationCondition.unbounded),
+        'kUnboundedOrInfeasible': (opt.SolverStatus.warning, opt.TerminationCondition.infeasibleOrUnbounded),
+        'kTimeLimit': (opt.SolverStatus.aborted, opt.TerminationCondition.maxTimeLimit),
+        'kIterationLimit': (opt.SolverStatus.aborted, opt.TerminationCondition.maxIterations)}.get(
+        modelStatus, (opt.SolverStatus.error, opt.TerminationCondition.error))
+    if hasSolution and status == opt.SolverStatus.aborted:
+        status = opt.SolverStatus.warning
+    elif not hasSolution and status == opt.SolverStatus.ok:
+        status, termCondition = opt.SolverStatus.error, opt.TerminationCondition.error
+    return status, termCondition
+
+
+def solveHighs(pyM, threads=0, timeLimit=None, logFileName='', optimizationSpecs='', warmstart=False, tee=True):
+    """
+    Solve the optimization problem of a declared pyomo model with HiGHS. The problem is passed to HiGHS in memory
+    (cf. ProblemMatrix) and the primal values (and, for linear programs, the dual values) are read back into the
+    pyomo model.
+
+    :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+    :type pyM: pyomo ConcreteModel
+
+    :param threads: number of threads used by HiGHS. A value of 0 results in the HiGHS default.
+        |br| * the default value is 0
+    :type threads: nonnegative integer
+
+    :param timeLimit: maximum solve time in seconds.
+        |br| * the default value is None
+    :type timeLimit: strictly positive number or None
+
+    :param logFileName: name of the log file. If empty, no log file is written.
+        |br| * the default value is ''
+    :type logFileName: string
+
+    :param optimizationSpecs: HiGHS options. Example: 'presolve=on mip_rel_gap=1e-4'
+        |br| * the default value is ''
+    :type optimizationSpecs: string
+
+    :param warmstart: states if the current values of the variables are passed to HiGHS as a starting solution.
+        |br| * the default value is False
+    :type warmstart: boolean
+
+    :param tee: states if the HiGHS log is shown in the console.
+        |br| * the default value is True
+    :type tee: boolean
+
+    :return: solver results with the solver status and termination condition
+    :rtype: pyomo SolverResults
+    """
+    checkHighsAvailability()
+
+    matrix = ProblemMatrix(pyM)
+    lower, upper, isInteger = matrix.getBounds()
+    starts, columns, coefficients = matrix.getMatrix()
+
+    lp = highspy.HighsLp()
+    lp.num_col_, lp.num_row_, lp.offset_ = matrix.numberOfColumns, matrix.numberOfRows, matrix.objectiveConstant
+    lp.col_cost_, lp.col_lower_, lp.col_upper_ = matrix.getObjectiveCoefficients(), lower, upper
+    lp.row_lower_, lp.row_upper_ = np.array(matrix.rowLower), np.array(matrix.rowUpper)
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    lp.a_matrix_.num_col_, lp.a_matrix_.num_row_ = matrix.numberOfColumns, matrix.numberOfRows
+    lp.a_matrix_.start_, lp.a_matrix_.index_, lp.a_matrix_.value_ = starts, columns, coefficients
+    if isInteger.any():
+        lp.integrality_ = [highspy.HighsVarType.kInteger if i else highspy.HighsVarType.kContinuous
+                           for i in isInteger]
+
+    # The global task scheduler of HiGHS keeps the number of threads it was first initialized with (also by other
+    # HiGHS instances of the process, e.g. earlier solves) and HiGHS does not solve a model with another number of
+    # threads. Hence, the scheduler is reset such that it is initialized with the threads of this solve.
+    if hasattr(highspy.Highs, 'resetGlobalScheduler'):
+        highspy.Highs.resetGlobalScheduler(True)
+
+    options = {'output_flag': tee or logFileName != '', 'log_to_console': tee}
+    if logFileName != '':
+        options['log_file'] = logFileName
+    if threads > 0:
+        options['threads'] = threads
+    if timeLimit is not None:
+        options['time_limit'] = float(timeLimit)
+    for option in optimizationSpecs.split():
+        name, value = option.split('=', 1)
+        for valueType in [int, float]:
+            try:
+                value = valueType(value)
+                break
+            except ValueError:
+                pass
+        options[name] = value
+
+    highs = highspy.Highs()
+    for name, value in options.items():
+        if highs.setOptionValue(name, value) == highspy.HighsStatus.kError:
+            raise ValueError('The HiGHS option ' + name + ' can not be set to ' + str(value) + '.')
+    if highs.passModel(lp) == highspy.HighsStatus.kError:
+        raise ValueError('The optimization problem can not be passed to HiGHS.')
+
+    if warmstart and all(varData.value is not None for varData in matrix.variables):
+        solution = highspy.HighsSolution()
+        solution.col_value = [varData.value for varData in matrix.variables]
+        solution.value_valid = True
+        highs.setSolution(solution)
+
+    if highs.run() == highspy.HighsStatus.kError:
+        raise RuntimeError('HiGHS could not solve the optimization problem (model status: ' +
+                           str(highs.getModelStatus()) + '). Check the HiGHS log for details.')
+    modelStatus, info, solution = highs.getModelStatus(), highs.getInfo(), highs.getSolution()
+
+    # Translate the HiGHS model status to the pyomo solver status and termination condition
+    results = opt.SolverResults()
+    results.solver.name = 'HiGHS'
+    results.solver.status, results.solver.termination_condition = \
+        getSolverStatus(getattr(modelStatus, 'name', str(modelStatus).split('.')[-1]), solution.value_valid)
+    results.problem.number_of_variables, results.problem.number_of_constraints = \
+        matrix.numberOfColumns, matrix.numberOfRows
+    results.problem.number_of_nonzeros = len(coefficients)
+
+    # Load the solution if one is available (also if a limit was reached before optimality was proven)
+    if solution.value_valid:
+        matrix.loadSolution(pyM, solution.col_value, solution.row_dual if solution.dual_valid else None)
+        results.problem.upper_bound = info.objective_function_value
+        results.problem.lower_bound = info.mip_dual_bound if isInteger.any() else info.objective_function_value
+    return results
@@ -0,0 +1,300 @@
+"""
+Last edited: October 18 2026
+
+Direct writer for LP and MPS files of an energy system model and reader for the corresponding solution files.
+"""
+from array import array
+import json
+import os
+import re
+import shutil
+import tempfile
+import numpy as np
+import pyomo.environ as pyomo
+from pyomo.repn import generate_standard_repn
+
+
+class ProblemWriter(object):
+    """
+    The ProblemWriter class streams the optimization problem of an energy system model into an LP file (CPLEX LP
+    format) or a (free) MPS file. The variables are taken from the declared pyomo model. The constraints are either
+    passed directly as rows (column indices, coefficients, sense and right-hand side), which does not require any
+    pyomo constraint objects, or are taken from the pyomo constraints declared so far, which are removed from the
+    pyomo model after they are written.
+
+    The columns are named x0, x1, ... and the rows c0, c1, ... in the order in which they are registered. The
+    pyomo variable of each column is stored in a mapping file (JSON) such that a solution file can be read back
+    (cf. readSolution).
+    """
+
+    def __init__(self, fileName, fileFormat='lp', mappingFileName=None):
+        """
+        Constructor for creating a ProblemWriter class instance.
+
+        :param fileName: name of the LP or MPS file which is written.
+        :type fileName: string
+
+        :param fileFormat: format of the written file ('lp' or 'mps').
+            |br| * the default value is 'lp'
+        :type fileFormat: string
+
+        :param mappingFileName: name of the mapping file. If None, the file name with the ending '.map.json' is
+            used.
+            |br| * the default value is None
+        :type mappingFileName: string or None
+        """
+        if fileFormat not in ['lp', 'mps']:
+            raise ValueError('The fileFormat parameter has to be either \'lp\' or \'mps\'.')
+        self.fileName, self.fileFormat = fileName, fileFormat
+        self.mappingFileName = mappingFileName if mappingFileName is not None else getMappingFileName(fileName)
+
+        # Columns: pyomo variables (by id) and their names and indices for the mapping file
+        self.columns, self.variables, self.variableNames = {}, [], []
+        self.numberOfRows = 0
+        self.objective, self.objectiveConstant = ([], []), 0
+
+        # LP files: rows are streamed to a temporary file which is copied into the LP file when it is closed.
+        # MPS files: rows are stored as (row, column, coefficient) arrays since MPS files are column-oriented.
+        if fileFormat == 'lp':
+            self._rowFile = tempfile.TemporaryFile(mode='w+')
+        else:
+            self._rowEntries, self._colEntries, self._coefEntries = array('l'), array('l'), array('d')
+            self._senses, self._rhs = [], array('d')
+
+    def registerVariables(self, pyM):
+        """
+        Assign a column to each variable of the pyomo model which is not registered yet.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        for var in pyM.component_objects(pyomo.Var, descend_into=True):
+            for index in var:
+                varData = var[index]
+                if id(varData) not in self.columns:
+                    self.columns[id(varData)] = len(self.variables)
+                    self.variables.append(varData)
+                    index = index if isinstance(index, tuple) else (index,)
+                    self.variableNames.append((var.name, [i.item() if isinstance(i, np.generic) else i
+                                                          for i in index]))
+
+    def getColumn(self, varData):
+        """ Return the column of a (registered) pyomo variable. """
+        return self.columns[id(varData)]
+
+    def addRow(self, columns, coefficients, sense, rhs):
+        """
+        Write a row, i.e. sum(coefficients * columns) sense rhs.
+
+        :param columns: columns of the row (cf. getColumn).
+        :type columns: list of integers
+
+        :param coefficients: coefficients of the columns.
+        :type coefficients: list of floats
+
+        :param sense: sense of the row ('<=', '>=' or '==').
+        :type sense: string
+
+        :param rhs: right-hand side of the row.
+        :type rhs: float
+        """
+        row = self.numberOfRows
+        self.numberOfRows += 1
+        if self.fileFormat == 'lp':
+            terms = ['{:+} x{}'.format(float(coef), col) for col, coef in zip(columns, coefficients)]
+            lines = [' '.join(terms[i:i + 8]) for i in range(0, len(terms), 8)]
+            self._rowFile.write('c{}: '.format(row) + '\n'.join(lines) +
+                                ' {} {}\n'.format('=' if sense == '==' else sense, float(rhs)))
+        else:
+            self._rowEntries.extend([row] * len(columns))
+            self._colEntries.extend(columns)
+            self._coefEntries.extend(coefficients)
+            self._senses.append({'<=': 'L', '>=': 'G', '==': 'E'}[sense])
+            self._rhs.append(float(rhs))
+
+    def writeConstraints(self, pyM):
+        """
+        Write all active constraints of the pyomo model and remove them from the model afterwards.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        for constr in list(pyM.component_objects(pyomo.Constraint, active=True, descend_into=True)):
+            for index in constr:
+                constrData = constr[index]
+                repn = generate_standard_repn(constrData.body, compute_values=True)
+                if repn.nonlinear_expr is not None or repn.quadratic_vars:
+                    raise ValueError('The constraint ' + constrData.name + ' is not linear.')
+                columns = [self.getColumn(var) for var in repn.linear_vars]
+                coefficients = [float(coef) for coef in repn.linear_coefs]
+                lower = None if constrData.lower is None else pyomo.value(constrData.lower) - repn.constant
+                upper = None if constrData.upper is None else pyomo.value(constrData.upper) - repn.constant
+                if constrData.equality or (lower is not None and lower == upper):
+                    self.addRow(columns, coefficients, '==', upper)
+                else:
+                    if lower is not None:
+                        self.addRow(columns, coefficients, '>=', lower)
+                    if upper is not None:
+                        self.addRow(columns, coefficients, '<=', upper)
+            constr.parent_block().del_component(constr)
+
+    def writeObjective(self, pyM):
+        """
+        Store the (linear) objective function of the pyomo model. The objective is written when the file is closed.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+        """
+        repn = generate_standard_repn(pyM.Obj.expr, compute_values=True)
+        if repn.nonlinear_expr is not None or repn.quadratic_vars:
+            raise ValueError('The objective function is not linear.')
+        terms = {}
+        for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+            terms[self.getColumn(var)] = terms.get(self.getColumn(var), 0) + float(coef)
+        self.objective = (list(terms.keys()), list(terms.values()))
+        self.objectiveConstant = float(repn.constant)
+
+    def getBounds(self):
+        """ Return the lower bounds, upper bounds and types ('C', 'I' or 'B') of the columns. """
+        lower, upper, types = [], [], []
+        for varData in self.variables:
+            if varData.fixed:
+                lower.append(varData.value), upper.append(varData.value)
+            else:
+                lower.append(varData.lb), upper.append(varData.ub)
+            types.append('B' if varData.is_binary() else 'I' if varData.is_integer() else 'C')
+        return lower, upper, types
+
+    def close(self):
+        """ Write the LP or MPS file and the mapping file. """
+        if self.fileFormat == 'lp':
+            self._writeLP()
+        else:
+            self._writeMPS()
+        with open(self.mappingFileName, 'w') as f:
+            json.dump({'fileFormat': self.fileFormat, 'objectiveConstant': self.objectiveConstant,
+                       'variables': self.variableNames}, f)
+
+    def _writeLP(self):
+        lower, upper, types = self.getBounds()
+        with open(self.fileName, 'w') as f:
+            f.write('\\* Optimization problem of an energy system model written by FINE *\\\n\nminimize\n')
+            columns, coefficients = self.objective
+            if not columns:
+                columns, coefficients = [0], [0]
+            terms = ['{:+} x{}'.format(coef, col) for col, coef in zip(columns, coefficients)]
+            f.write('obj: ' + '\n'.join(' '.join(terms[i:i + 8]) for i in range(0, len(terms), 8)) + '\n\n')
+
+            f.write('subject to\n')
+            self._rowFile.seek(0)
+            shutil.copyfileobj(self._rowFile, f)
+            self._rowFile.close()
+
+            f.write('\nbounds\n')
+            for col, (lb, ub) in enumerate(zip(lower, upper)):
+                if lb is not None and lb == ub:
+                    f.write(' x{} = {}\n'.format(col, float(lb)))
+                elif lb is None or lb != 0 or ub is not None:
+                    f.write(' {} <= x{} <= {}\n'.format('-inf' if lb is None else float(lb), col,
+                                                         '+inf' if ub is None else float(ub)))
+            for section, colType in [('generals', 'I'), ('binaries', 'B')]:
+                cols = [col for col, type_ in enumerate(types) if type_ == colType]
+                if cols:
+                    f.write('\n' + section + '\n' + ''.join(' x{}\n'.format(col) for col in cols))
+            f.write('\nend\n')
+
+    def _writeMPS(self):
+        lower, upper, types = self.getBounds()
+        rows = np.frombuffer(self._rowEntries, dtype=np.dtype(self._rowEntries.typecode)) \
+            if self._rowEntries else np.zeros(0, dtype=int)
+        cols = np.frombuffer(self._colEntries, dtype=np.dtype(self._colEntries.typecode)) \
+            if self._colEntries else np.zeros(0, dtype=int)
+        coefs = np.frombuffer(self._coefEntries, dtype=float) if self._coefEntries else np.zeros(0)
+        order = np.argsort(cols, kind='stable')
+        rows, cols, coefs = rows[order].tolist(), cols[order].tolist(), coefs[order].tolist()
+        objective = dict(zip(*self.objective))
+
+        with open(self.fileName, 'w') as f:
+            f.write('NAME FINE\nROWS\n N obj\n')
+            f.write(''.join(' {} c{}\n'.format(sense, row) for row, sense in enumerate(self._senses)))
+
+            f.write('COLUMNS\n')
+            position, isInteger = 0, False
+            for col in range(len(self.variables)):
+                if (types[col] != 'C') != isInteger:
+                    isInteger = not isInteger
+                    f.write('    MARKER \'MARKER\' \'{}\'\n'.format('INTORG' if isInteger else 'INTEND'))
+                entries = ['    x{} obj {}\n'.format(col, objective[col])] if col in objective else []
+                while position < len(cols) and cols[position] == col:
+                    entries.append('    x{} c{} {}\n'.format(col, rows[position], coefs[position]))
+                    position += 1
+                f.write(''.join(entries) if entries else '    x{} obj 0.0\n'.format(col))
+            if isInteger:
+                f.write('    MARKER \'MARKER\' \'INTEND\'\n')
+
+            f.write('RHS\n')
+            f.write(''.join('    RHS c{} {}\n'.format(row, rhs) for row, rhs in enumerate(self._rhs) if rhs != 0))
+
+            f.write('BOUNDS\n')
+            for col, (lb, ub) in enumerate(zip(lower, upper)):
+                if types[col] == 'B' and lb == 0 and ub == 1:
+                    f.write(' BV BND x{}\n'.format(col))
+                elif lb is not None and lb == ub:
+                    f.write(' FX BND x{} {}\n'.format(col, float(lb)))
+                else:
+                    if lb is None:
+                        f.write(' MI BND x{}\n'.format(col))
+                    elif lb != 0:
+                        f.write(' LO BND x{} {}\n'.format(col, float(lb)))
+                    if ub is not None:
+                        f.write(' UP BND x{} {}\n'.format(col, float(ub)))
+                    elif types[col] != 'C':
+                        f.write(' PL BND x{}\n'.format(col))
+            f.write('ENDATA\n')
+
+
+def getMappingFileName(fileName):
+    """ Return the default name of the mapping file of an LP or MPS file. """
+    return os.path.splitext(fileName)[0] + '.map.json'
+
+
+def readSolution(pyM, solution, mappingFileName):
+    """
+    Read a solution of an optimization problem written with the ProblemWriter class into the variables of a pyomo
+    model. Variables which are not listed in the solution are set to zero (if they are not fixed).
+
+    :param pyM: pyomo ConcreteModel with the variables of the written optimization problem.
+    :type pyM: pyomo ConcreteModel
+
+    :param solution: name of a solution file in which each line lists a column name (x0, x1, ...) followed by its
+        value (e.g. solution files of Gurobi, CPLEX, HiGHS or CBC) or a dictionary with the column names as keys and
+        the values of the columns as values.
+    :type solution: string or dict
+
+    :param mappingFileName: name of the mapping file which was written with the LP or MPS file.
+    :type mappingFileName: string
+    """
+    with open(mappingFileName) as f:
+        mapping = json.load(f)
+
+    if not isinstance(solution, dict):
+        values, columnName = {}, re.compile(r'x\d+$')
+        with open(solution) as f:
+            for line in f:
+                tokens = line.split()
+                if not tokens or tokens[0].startswith('#'):
+                    continue
+                for i, token in enumerate(tokens[:-1]):
+                    if columnName.match(token):
+                        try:
+                            values[token] = float(tokens[i + 1])
+                        except ValueError:
+                            pass
+                        break
+        solution = values
+
+    for col, (varName, index) in enumerate(mapping['variables']):
+        var = pyM.find_component(varName)
+        varData = var[tuple(index) if len(index) > 1 else index[0]]
+        if not varData.fixed:
+            varData.value = solution.get('x{}'.format(col), 0)
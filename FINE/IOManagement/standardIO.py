@@ -96,6 +96,8 @@ def writeOptimizationOutputToExcel(esM, outputFileName='scenarioOutput', optSumO
 
     periodsOrder = pd.DataFrame([esM.periodsOrder], index=['periodsOrder'], columns=esM.periods)
     periodsOrder.to_excel(writer, 'Misc')
+    if esM.solverSpecs['buildProfile'] is not None:
+        esM.solverSpecs['buildProfile'].to_excel(writer, 'BuildProfile')
     utils.output('\tSaving file...', esM.verbose, 0)
     writer.save()
     utils.output('Done. (%.4f' % (time.time() - _t) + ' sec)', esM.verbose, 0)
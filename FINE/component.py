@@ -3,6 +3,203 @@ from FINE import utils
 import warnings
 import pyomo.environ as pyomo
 import pandas as pd
+import numpy as np
+try:
+    from pyomo.core.expr.numeric_expr import LinearExpression
+except ImportError:
+    from pyomo.core.expr.expr_pyomo5 import LinearExpression
+try:
+    from pyomo.core.base.block import ScalarBlock
+except ImportError:
+    from pyomo.core.base.block import SimpleBlock as ScalarBlock
+
+
+class TimeSeriesArray(object):
+    """
+    The TimeSeriesArray class stores the data of a time series parameter of a component (e.g. a maximum operation
+    rate) in one contiguous float array which is laid out as periods x time steps x locations. The periods and the
+    time steps are numbered consecutively starting at zero, such that a value is accessed by integer offsets.
+    A pandas DataFrame with a (Period, TimeStep) MultiIndex and the locations as columns is built lazily on request.
+    """
+    def __init__(self, data, locations=None):
+        """
+        Constructor for creating a TimeSeriesArray class instance.
+
+        :param data: time series data with a (Period, TimeStep) MultiIndex and the locations as columns or an array
+            (periods x time steps x locations) which is not copied (e.g. a view of a TimeSeriesColumnRegistry).
+        :type data: Pandas DataFrame or NumPy array
+
+        :param locations: location names which replace the column names of the data (required for arrays).
+            |br| * the default value is None
+        :type locations: list or None
+        """
+        if isinstance(data, np.ndarray):
+            self.locations = list(locations)
+            self.locationIndex = {loc: ix for ix, loc in enumerate(self.locations)}
+            self.values, self._frame = data, None
+            return
+        periods, timeSteps = data.index.get_level_values(0), data.index.get_level_values(1)
+        index = pd.MultiIndex.from_product([range(max(periods) + 1), range(max(timeSteps) + 1)],
+                                           names=['Period', 'TimeStep'])
+        self.locations = list(data.columns) if locations is None else list(locations)
+        self.locationIndex = {loc: ix for ix, loc in enumerate(self.locations)}
+        self.values = np.ascontiguousarray(data.reindex(index).values, dtype=float).reshape(
+            len(index.levels[0]), len(index.levels[1]), len(self.locations))
+        self._frame = None
+
+    def __getitem__(self, key):
+        """ Return the value of a (location, period, time step) tuple as float. """
+        loc, p, t = key
+        return float(self.values[p, t, self.locationIndex[loc]])
+
+    def getIndex(self):
+        """ Return the (Period, TimeStep) MultiIndex which belongs to the first two axes of the array. """
+        return pd.MultiIndex.from_product([range(self.values.shape[0]), range(self.values.shape[1])],
+                                          names=['Period', 'TimeStep'])
+
+    def getFrame(self, columns=None):
+        """
+        Return the data as a pandas DataFrame. The array is not copied.
+
+        :param columns: column names which replace the location names.
+            |br| * the default value is None
+        :type columns: list or None
+        """
+        return pd.DataFrame(self.values.reshape(-1, len(self.locations)), index=self.getIndex(),
+                            columns=self.locations if columns is None else columns, copy=False)
+
+    @property
+    def frame(self):
+        """ Lazily built (and cached) pandas DataFrame view of the data. """
+        if self._frame is None:
+            self._frame = self.getFrame()
+        return self._frame
+
+
+class TimeSeriesColumnRegistry(object):
+    """
+    The TimeSeriesColumnRegistry class collects the time series of the components for the time series aggregation.
+    Each time series (TimeSeriesArray) is registered with one unique identifier per location and is assigned to the
+    columns of one shared two-dimensional array (time steps x columns, sorted by the identifiers) which is handed to
+    the tsam package. The aggregated time series data is stored in one shared array as well and handed back to the
+    components as array views, i.e. the time series data is neither renamed nor copied per component.
+    """
+    def __init__(self):
+        """
+        Constructor for creating a TimeSeriesColumnRegistry class instance.
+        """
+        self.weightDict, self._series, self._columnIndex, self.aggregatedValues = {}, [], None, None
+
+    def register(self, identifiers, data, weight):
+        """
+        Register a time series.
+
+        :param identifiers: unique identifiers of the time series (one per location of the data).
+        :type identifiers: list of strings
+
+        :param data: time series data.
+        :type data: TimeSeriesArray
+
+        :param weight: weight of the time series in the clustering process.
+        :type weight: positive float (>=0)
+        """
+        self._series.append((list(identifiers), data))
+        self.weightDict.update({identifier: weight for identifier in identifiers})
+        self._columnIndex = None
+
+    @property
+    def columnIndex(self):
+        """ Column of each identifier in the shared arrays (the identifiers are sorted). """
+        if self._columnIndex is None:
+            columns = sorted(identifier for identifiers, data in self._series for identifier in identifiers)
+            self._columnIndex = {identifier: ix for ix, identifier in enumerate(columns)}
+        return self._columnIndex
+
+    @property
+    def columns(self):
+        """ Identifiers of the registered time series in the order of the columns of the shared arrays. """
+        return sorted(self.columnIndex, key=self.columnIndex.get)
+
+    def getArray(self):
+        """
+        Return the registered time series data as one array (time steps x columns). This is the only copy of the
+        time series data which is made for the time series aggregation.
+
+        :return: time series data
+        :rtype: NumPy array
+        """
+        columnIndex = self.columnIndex
+        numberOfTimeSteps = self._series[0][1].values.shape[0] * self._series[0][1].values.shape[1] \
+            if self._series else 0
+        values = np.empty((numberOfTimeSteps, len(columnIndex)), dtype=float)
+        for identifiers, data in self._series:
+            values[:, [columnIndex[identifier] for identifier in identifiers]] = \
+                data.values.reshape(numberOfTimeSteps, len(identifiers))
+        return values
+
+    def getFrame(self, index=None):
+        """
+        Return the registered time series data as a pandas DataFrame (without copying the array, cf. getArray) with
+        the identifiers as columns.
+
+        :param index: index of the DataFrame.
+            |br| * the default value is None
+        :type index: pandas Index or None
+        """
+        return pd.DataFrame(self.getArray(), index=index, columns=self.columns, copy=False)
+
+    def setAggregatedData(self, data):
+        """
+        Set the aggregated time series data.
+
+        :param data: aggregated time series data with a (Period, TimeStep) MultiIndex and (at least) the registered
+            identifiers as columns or an array (periods x time steps x columns) in the order of the columns.
+        :type data: Pandas DataFrame or NumPy array
+        """
+        if isinstance(data, pd.DataFrame):
+            periods, timeSteps = data.index.get_level_values(0), data.index.get_level_values(1)
+            index = pd.MultiIndex.from_product([range(max(periods) + 1), range(max(timeSteps) + 1)])
+            data = data.reindex(index=index, columns=self.columns).values.reshape(
+                len(index.levels[0]), len(index.levels[1]), len(self.columns))
+        self.aggregatedValues = np.ascontiguousarray(data, dtype=float)
+
+    def getAggregatedArray(self, identifiers, locations):
+        """
+        Return the aggregated data of a registered time series. If the columns of the time series are adjacent (which
+        is the case if its identifiers only differ in the location), the returned data is a view of the shared array.
+
+        :param identifiers: unique identifiers of the time series.
+        :type identifiers: list of strings
+
+        :param locations: locations of the time series.
+        :type locations: list of strings
+
+        :return: aggregated time series data
+        :rtype: TimeSeriesArray
+        """
+        ix = [self.columnIndex[identifier] for identifier in identifiers]
+        if ix == list(range(ix[0], ix[0] + len(ix))):
+            return TimeSeriesArray(self.aggregatedValues[:, :, ix[0]:ix[0] + len(ix)], locations)
+        return TimeSeriesArray(self.aggregatedValues[:, :, ix], locations)
+
+
+class TimeSeriesParameter(object):
+    """
+    The TimeSeriesParameter class is a descriptor for the time series parameters of a component. Assigned pandas
+    DataFrames are converted to TimeSeriesArray instances which are held in the time series store of the component.
+    Reading the attribute returns the (lazily built) pandas DataFrame view or None.
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        data = instance.getTimeSeries(self.name)
+        return None if data is None else data.frame
+
+    def __set__(self, instance, value):
+        instance.setTimeSeries(self.name, value)
 
 
 class Component(metaclass=ABCMeta):
@@ -302,7 +499,6 @@ class Component(metaclass=ABCMeta):
         :param esM: EnergySystemModel instance representing the energy system in which the component should be modeled.
         :type esM: EnergySystemModel instance
         """
-        esM.isTimeSeriesDataClustered = False
         if self.name in esM.componentNames:
             if esM.componentNames[self.name] == self.modelingClass.__name__ and esM.verbose < 2:
                 warnings.warn('Component identifier ' + self.name + ' already exists. Data will be overwritten.')
@@ -314,17 +510,61 @@ class Component(metaclass=ABCMeta):
         if mdl not in esM.componentModelingDict:
             esM.componentModelingDict.update({mdl: self.modelingClass()})
         esM.componentModelingDict[mdl].componentsDict.update({self.name: self})
+        esM.changedModelingClasses.add(mdl)
+        # If the time series data of the energy system model is already clustered, the time series data of the
+        # component is aggregated with the stored cluster order (a re-clustering requires calling esM.cluster())
+        if esM.isTimeSeriesDataClustered:
+            esM.aggregateComponentTimeSeriesData(self)
+
+    def setTimeSeries(self, name, data):
+        """
+        Set a time series parameter of the component in its time series store.
+
+        :param name: name of the time series parameter (e.g. 'fullOperationRateMax').
+        :type name: string
 
-    def prepareTSAInput(self, rateFix, rateMax, rateName, rateWeight, weightDict, data):
+        :param data: time series data with a (Period, TimeStep) MultiIndex or None
+        :type data: Pandas DataFrame, TimeSeriesArray or None
         """
-        Format the time series data of a component to fit the requirements of the time series aggregation package and
-        return a list of formatted data.
+        if data is not None and not isinstance(data, TimeSeriesArray):
+            data = TimeSeriesArray(data)
+        self.__dict__.setdefault('_timeSeriesStore', {})[name] = data
+
+    def getTimeSeries(self, name):
+        """
+        Get a time series parameter of the component from its time series store.
+
+        :param name: name of the time series parameter (e.g. 'operationRateMax').
+        :type name: string
+
+        :return: time series data or None
+        :rtype: TimeSeriesArray or None
+        """
+        return self.__dict__.get('_timeSeriesStore', {}).get(name)
+
+    def selectTimeSeries(self, name, hasTSA):
+        """
+        Set a time series parameter of the component to its aggregated (hasTSA is True) or full (hasTSA is False)
+        version. The data is not copied.
+
+        :param name: name of the time series parameter (e.g. 'operationRateMax').
+        :type name: string
+
+        :param hasTSA: indicates if time series aggregation should be considered for modeling
+        :type hasTSA: boolean
+        """
+        self.setTimeSeries(name, self.getTimeSeries(('aggregated' if hasTSA else 'full') + name[0].upper() + name[1:]))
+
+    def prepareTSAInput(self, rateFix, rateMax, rateName, rateWeight, registry):
+        """
+        Register the time series data of a component in the column registry of the time series aggregation with one
+        unique identifier per location. The data is not copied.
 
         :param rateFix: a fixed operation time series or None
-        :type rateFix: Pandas DataFrame or None
+        :type rateFix: TimeSeriesArray or None
 
         :param rateMax: a maximum operation time series or None
-        :type rateMax: Pandas DataFrame of None
+        :type rateMax: TimeSeriesArray or None
 
         :param rateName: name of the time series (to ensure uniqueness if a component has multiple relevant time series)
         :type rateName: string
@@ -332,45 +572,32 @@ class Component(metaclass=ABCMeta):
         :param rateWeight: weight of the time series in the clustering process
         :type rateWeight: positive float (>=0)
 
-        :param weightDict: dictionary to which the weight is added
-        :type weightDict: dict
-
-        :param data: list to which the formatted data is added
-        :type data: list of Pandas DataFrames
-
-        :return: data
-        :rtype: Pandas DataFrame
+        :param registry: column registry in which the time series is registered
+        :type registry: TimeSeriesColumnRegistry
         """
-        data_ = rateFix if rateFix is not None else rateMax
-        if data_ is not None:
-            data_ = data_.copy()
-            uniqueIdentifiers = [self.name + rateName + loc for loc in data_.columns]
-            data_.rename(columns={loc: self.name + rateName + loc for loc in data_.columns}, inplace=True)
-            weightDict.update({id: rateWeight for id in uniqueIdentifiers}), data.append(data_)
-        return weightDict, data
+        data = rateFix if rateFix is not None else rateMax
+        if data is not None:
+            registry.register([self.name + rateName + loc for loc in data.locations], data, rateWeight)
 
-    def getTSAOutput(self, rate, rateName, data):
+    def getTSAOutput(self, rate, rateName, registry):
         """
-        Return a reformatted time series data after applying time series aggregation, if the original time series
-        data is not None.
+        Return the aggregated time series data (a view of the aggregated data in the column registry) after applying
+        time series aggregation, if the original time series data is not None.
 
         :param rate: Full (unclustered) time series data or None
-        :type rate: Pandas DataFrame or None
+        :type rate: TimeSeriesArray or None
 
         :param rateName: name of the time series (to ensure uniqueness if a component has multiple relevant time series)
         :type rateName: string
 
-        :param data: Pandas DataFrame with the clustered time series data of all components in the energy system
-        :type data: Pandas DataFrame
+        :param registry: column registry with the clustered time series data of the energy system
+        :type registry: TimeSeriesColumnRegistry
 
-        :return: reformatted data or None
-        :rtype: Pandas DataFrame
+        :return: aggregated data or None
+        :rtype: TimeSeriesArray
         """
         if rate is not None:
-            uniqueIdentifiers = [self.name + rateName + loc for loc in rate.columns]
-            data_ = data[uniqueIdentifiers].copy()
-            data_.rename(columns={self.name + rateName + loc: loc for loc in rate.columns}, inplace=True)
-            return data_
+            return registry.getAggregatedArray([self.name + rateName + loc for loc in rate.locations], rate.locations)
         else:
             return None
 
@@ -387,24 +614,249 @@ class Component(metaclass=ABCMeta):
         raise NotImplementedError
 
     @abstractmethod
-    def getDataForTimeSeriesAggregation(self):
+    def getDataForTimeSeriesAggregation(self, registry):
         """
-        Abstract method which has to be implemented by subclasses (otherwise a NotImplementedError raises). Get
-        all time series data of a component for time series aggregation.
+        Abstract method which has to be implemented by subclasses (otherwise a NotImplementedError raises). Register
+        all time series data of a component for time series aggregation (cf. prepareTSAInput).
+
+        :param registry: column registry of the time series aggregation
+        :type registry: TimeSeriesColumnRegistry
         """
         raise NotImplementedError
 
     @abstractmethod
-    def setAggregatedTimeSeriesData(self, data):
+    def setAggregatedTimeSeriesData(self, registry):
         """
         Abstract method which has to be implemented by subclasses (otherwise a NotImplementedError raises). Set
-        aggregated time series data after applying time series aggregation.
+        aggregated time series data after applying time series aggregation (cf. getTSAOutput).
 
-        :param data: time series data
-        :type data: Pandas DataFrame
+        :param registry: column registry with the aggregated time series data
+        :type registry: TimeSeriesColumnRegistry
         """
         raise NotImplementedError
 
+    def getTimeSeriesResamplingMethod(self, name):
+        """
+        Get the method with which a time series is aggregated when the temporal resolution is reduced (cf.
+        resampleTimeSeriesData). Time series which are given relative to the capacity are averaged ('mean'), time
+        series which are given as absolute values for each time step are summed up ('sum').
+
+        :param name: name of the time series parameter (e.g. 'fullOperationRateMax').
+        :type name: string
+
+        :return: 'mean' or 'sum'
+        :rtype: string
+        """
+        return 'mean' if self.hasCapacityVariable else 'sum'
+
+    def getTimeSeriesResamplingWeights(self, name):
+        """
+        Get the weights with which the values of an averaged time series are weighted when the temporal resolution is
+        reduced (cf. resampleTimeSeriesData). If None, the merged time steps are weighted with their durations, which
+        are the same for all time steps of the full time series data.
+
+        :param name: name of the time series parameter (e.g. 'fullCommodityCostTimeSeries').
+        :type name: string
+
+        :return: weights (full time series data) or None
+        :rtype: TimeSeriesArray or None
+        """
+        return None
+
+    def resampleTimeSeriesData(self, factor):
+        """
+        Resample the full time series data of the component to a coarser temporal resolution in which one time step
+        comprises factor time steps of the current resolution (cf. EnergySystemModel.resample). The chronology of the
+        time series is preserved.
+
+        :param factor: number of time steps which are merged into one time step.
+        :type factor: strictly positive integer
+
+        :return: original time series data and resampled time series data at the original resolution (i.e. the
+            (weighted) mean of the merged time steps, cf. getTimeSeriesResamplingWeights) with (component name, time
+            series name, location) tuples as keys
+        :rtype: tuple (dictionary, dictionary)
+        """
+        original, predicted = {}, {}
+        store = self.__dict__.get('_timeSeriesStore', {})
+        # The weights are taken before the time series data is replaced by the resampled one
+        weights = {name: self.getTimeSeriesResamplingWeights(name) for name in store}
+        for name, data in list(store.items()):
+            if data is None or not name.startswith('full'):
+                continue
+            values = data.values.reshape(-1, factor, len(data.locations))
+            mean, weight = values.mean(axis=1), weights[name]
+            if weight is not None and all(loc in weight.locationIndex for loc in data.locations):
+                weight = weight.values[:, :, [weight.locationIndex[loc] for loc in data.locations]]
+                weightSum = weight.reshape(values.shape).sum(axis=1)
+                mean = np.where(weightSum > 0, (values * weight.reshape(values.shape)).sum(axis=1) /
+                                np.where(weightSum > 0, weightSum, 1), mean)
+            resampled = mean if self.getTimeSeriesResamplingMethod(name) == 'mean' else values.sum(axis=1)
+            for loc, ix in data.locationIndex.items():
+                original[self.name, name[4].lower() + name[5:], loc] = values[:, :, ix].reshape(-1)
+                predicted[self.name, name[4].lower() + name[5:], loc] = np.repeat(mean[:, ix], factor)
+            self.setTimeSeries(name, TimeSeriesArray(resampled.reshape(1, -1, len(data.locations)), data.locations))
+        self.setTimeSeriesData(False)
+        return original, predicted
+
+    def getFullTimeSeriesData(self):
+        """
+        Get the full time series data of the component (e.g. to restore it after setTimeSeriesWindow was called).
+
+        :return: full time series data with the names of the time series parameters (e.g. 'fullOperationRateMax') as
+            keys
+        :rtype: dictionary
+        """
+        return {name: data for name, data in self.__dict__.get('_timeSeriesStore', {}).items()
+                if data is not None and name.startswith('full')}
+
+    def setTimeSeriesWindow(self, fullTimeSeriesData, start=None, end=None):
+        """
+        Set the full time series data of the component to the time steps start, ..., end-1 of the given full time
+        series data (cf. EnergySystemModel.optimizeRollingHorizon). The data is not copied.
+
+        :param fullTimeSeriesData: full time series data (cf. getFullTimeSeriesData).
+        :type fullTimeSeriesData: dictionary
+
+        :param start: first time step of the window. If None, the given full time series data is set as it is.
+            |br| * the default value is None
+        :type start: positive integer or None
+
+        :param end: time step after the last time step of the window.
+            |br| * the default value is None
+        :type end: strictly positive integer or None
+        """
+        for name, data in fullTimeSeriesData.items():
+            self.setTimeSeries(name, data if start is None else
+                               TimeSeriesArray(data.values[:, start:end], data.locations))
+        self.setTimeSeriesData(False)
+
+    def isUpdatableParameter(self, name):
+        """
+        Check if a parameter of the component can be updated in a declared optimization problem (cf.
+        EnergySystemModel.updateComponentData). These are the capacity bounds, the fixed capacities and the operation
+        rate time series (e.g. operationRateMax or chargeOpRateFix).
+
+        :param name: name of the parameter.
+        :type name: string
+
+        :return: True if the parameter can be updated, False otherwise
+        :rtype: boolean
+        """
+        if name in ['capacityMin', 'capacityMax', 'capacityFix']:
+            return True
+        return isinstance(getattr(type(self), name, None), TimeSeriesParameter) and \
+            name.endswith(('RateMax', 'RateFix')) and not name.startswith(('full', 'aggregated'))
+
+    def prepareDesignParameter(self, name, data):
+        """
+        Prepare a location specific design parameter (capacityMin, capacityMax or capacityFix) in the same way as it
+        is done when the component is initialized.
+
+        :param name: name of the design parameter.
+        :type name: string
+
+        :param data: design parameter data.
+        :type data: positive (>=0) float or Pandas Series with positive (>=0) values or None
+
+        :return: prepared design parameter data
+        :rtype: positive (>=0) float or Pandas Series with positive (>=0) values or None
+        """
+        return data
+
+    def updateParameters(self, esM, params):
+        """
+        Update parameters of the component (cf. EnergySystemModel.updateComponentData). The new values are checked in
+        the same way as when the component is initialized. If a check fails, the component is not changed.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: EnergySystemModel instance
+
+        :param params: new parameter values (cf. isUpdatableParameter) with the parameter names as keys.
+        :type params: dict
+        """
+        for name, data in params.items():
+            if not self.isUpdatableParameter(name):
+                raise ValueError('The parameter ' + name + ' of component ' + self.name + ' can not be updated.')
+            if (data is None) != (getattr(self, name) is None):
+                raise ValueError('The parameter ' + name + ' of component ' + self.name + ' can not be set from or ' +
+                                 'to None since this changes the structure of the optimization problem.')
+            if name == 'capacityMax' and self.sharedPotentialID is not None:
+                raise ValueError('The capacityMax parameter of component ' + self.name + ' can not be updated since ' +
+                                 'the component shares its potential with other components.')
+            if name not in ['capacityMin', 'capacityMax', 'capacityFix'] and esM.pyM.hasTSA:
+                raise ValueError('Time series can not be updated in an optimization problem which was declared ' +
+                                 'with time series aggregation.')
+
+        # Align the location labels of the data with the index of the locational eligibility since the checks
+        # compare them element-wise
+        locations = self.locationalEligibility.index
+        params = {name: data[list(locations)] if isinstance(data, pd.DataFrame) and set(data.columns) == set(locations)
+                  else data for name, data in params.items()}
+
+        # Check the time series data before any data of the component is changed
+        timeSeries = {name: utils.checkAndSetTimeSeries(esM, data, self.locationalEligibility)
+                      for name, data in params.items() if name not in ['capacityMin', 'capacityMax', 'capacityFix']}
+
+        design = {name: self.prepareDesignParameter(name, data) for name, data in params.items()
+                  if name in ['capacityMin', 'capacityMax', 'capacityFix']}
+        design = {name: data.reindex(locations) if isinstance(data, pd.Series) and set(data.index) == set(locations)
+                  else data for name, data in design.items()}
+        if design:
+            previous = {name: getattr(self, name) for name in design}
+            try:
+                for name, data in design.items():
+                    setattr(self, name, data)
+                utils.checkLocationSpecficDesignInputParams(self, esM)
+            except (TypeError, ValueError):
+                for name, data in previous.items():
+                    setattr(self, name, data)
+                raise
+
+        for name, data in timeSeries.items():
+            self.setTimeSeries('full' + name[0].upper() + name[1:], data)
+            self.selectTimeSeries(name, False)
+        if timeSeries:
+            esM.isTimeSeriesDataClustered = False
+
+
+class ProfiledBlock(object):
+    """
+    The ProfiledBlock class is a mixin for pyomo Blocks which passes each added component to the BuildProfiler
+    instance stored in the buildProfiler attribute of the (parent) model, if one is specified.
+    """
+    def add_component(self, name, val):
+        profiler = getattr(self, 'buildProfiler', None)
+        if profiler is None:
+            return super().add_component(name, val)
+        with profiler.profile(val):
+            super().add_component(name, val)
+
+
+class ProfiledConcreteModel(ProfiledBlock, pyomo.ConcreteModel):
+    """
+    The ProfiledConcreteModel class is the pyomo ConcreteModel in which the optimization problem of an energy system
+    model is declared. Its components can be recorded by a BuildProfiler (cf. ProfiledBlock).
+    """
+    pass
+
+
+class ModelingClassBlock(ProfiledBlock, ScalarBlock):
+    """
+    The ModelingClassBlock class is a pyomo Block which stores the sets, variables and constraints of one modeling
+    class (e.g. the block pyM.stor of the StorageModel). Attributes which are not declared in the block (e.g. the time
+    sets or the hasTSA flag) are looked up in the parent model, such that the functions of the modeling classes can
+    be called with the block instead of the ConcreteModel.
+    """
+    def __getattr__(self, name):
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            parent = self.parent_block() if not name.startswith('_') else None
+            if parent is None:
+                raise
+            return getattr(parent, name)
+
 
 class ComponentModel(metaclass=ABCMeta):
     """
@@ -503,22 +955,24 @@ class ComponentModel(metaclass=ABCMeta):
                     for loc in comp.locationalEligibility.index if comp.locationalEligibility[loc] == 1)
         setattr(pyM, 'operationVarSet_' + abbrvName, pyomo.Set(dimen=2, initialize=declareOpVarSet))
 
+        # The dictionaries are filled in one pass over the operation variable set, i.e. only the eligible entries are
+        # visited. For two-dimensional components, the locations of a connection are looked up in the component.
         if self.dimension == '1dim':
             # Dictionary which lists all components of the modeling class at one location
-            setattr(pyM, 'operationVarDict_' + abbrvName,
-                    {loc: {compName for compName in compDict
-                           if (loc, compName) in getattr(pyM, 'operationVarSet_' + abbrvName)}
-                     for loc in esM.locations})
+            opVarDict = {loc: set() for loc in esM.locations}
+            for loc, compName in getattr(pyM, 'operationVarSet_' + abbrvName):
+                opVarDict[loc].add(compName)
+            setattr(pyM, 'operationVarDict_' + abbrvName, opVarDict)
         elif self.dimension == '2dim':
-            # Dictionaries which list all outgoing and incoming components at a location
-            setattr(pyM, 'operationVarDictOut_' + abbrvName,
-                    {loc: {loc_: {compName for compName in compDict
-                                  if (loc + '_' + loc_, compName) in getattr(pyM, 'operationVarSet_' + abbrvName)}
-                           for loc_ in esM.locations} for loc in esM.locations})
-            setattr(pyM, 'operationVarDictIn_' + abbrvName,
-                    {loc: {loc_: {compName for compName in compDict
-                                  if (loc_ + '_' + loc, compName) in getattr(pyM, 'operationVarSet_' + abbrvName)}
-                           for loc_ in esM.locations} for loc in esM.locations})
+            # Dictionaries which list all outgoing and incoming components at a location (only connected locations
+            # are listed in the inner dictionaries)
+            opVarDictOut, opVarDictIn = {loc: {} for loc in esM.locations}, {loc: {} for loc in esM.locations}
+            for loc1_loc2, compName in getattr(pyM, 'operationVarSet_' + abbrvName):
+                loc1, loc2 = compDict[compName]._mapC[loc1_loc2]
+                opVarDictOut[loc1].setdefault(loc2, set()).add(compName)
+                opVarDictIn[loc2].setdefault(loc1, set()).add(compName)
+            setattr(pyM, 'operationVarDictOut_' + abbrvName, opVarDictOut)
+            setattr(pyM, 'operationVarDictIn_' + abbrvName, opVarDictIn)
 
     ####################################################################################################################
     #                                   Functions for declaring operation mode sets                                    #
@@ -534,8 +988,8 @@ class ComponentModel(metaclass=ABCMeta):
 
         def declareOpConstrSet1(pyM):
             return ((loc, compName) for loc, compName in varSet if compDict[compName].hasCapacityVariable
-                    and getattr(compDict[compName], rateMax) is None
-                    and getattr(compDict[compName], rateFix) is None)
+                    and compDict[compName].getTimeSeries(rateMax) is None
+                    and compDict[compName].getTimeSeries(rateFix) is None)
 
         setattr(pyM, constrSetName + '1_' + abbrvName, pyomo.Set(dimen=2, initialize=declareOpConstrSet1))
 
@@ -549,7 +1003,7 @@ class ComponentModel(metaclass=ABCMeta):
 
         def declareOpConstrSet2(pyM):
             return ((loc, compName) for loc, compName in varSet if compDict[compName].hasCapacityVariable
-                    and getattr(compDict[compName], rateFix) is not None)
+                    and compDict[compName].getTimeSeries(rateFix) is not None)
 
         setattr(pyM, constrSetName + '2_' + abbrvName, pyomo.Set(dimen=2, initialize=declareOpConstrSet2))
 
@@ -563,7 +1017,7 @@ class ComponentModel(metaclass=ABCMeta):
 
         def declareOpConstrSet3(pyM):
             return ((loc, compName) for loc, compName in varSet if compDict[compName].hasCapacityVariable
-                    and getattr(compDict[compName], rateMax) is not None)
+                    and compDict[compName].getTimeSeries(rateMax) is not None)
 
         setattr(pyM, constrSetName + '3_' + abbrvName, pyomo.Set(dimen=2, initialize=declareOpConstrSet3))
 
@@ -577,7 +1031,7 @@ class ComponentModel(metaclass=ABCMeta):
 
         def declareOpConstrSet4(pyM):
             return ((loc, compName) for loc, compName in varSet if not compDict[compName].hasCapacityVariable
-                    and getattr(compDict[compName], rateFix) is not None)
+                    and compDict[compName].getTimeSeries(rateFix) is not None)
 
         setattr(pyM, constrSetName + '4_' + abbrvName, pyomo.Set(dimen=2, initialize=declareOpConstrSet4))
 
@@ -591,7 +1045,7 @@ class ComponentModel(metaclass=ABCMeta):
 
         def declareOpConstrSet5(pyM):
             return ((loc, compName) for loc, compName in varSet if not compDict[compName].hasCapacityVariable
-                    and getattr(compDict[compName], rateMax) is not None)
+                    and compDict[compName].getTimeSeries(rateMax) is not None)
 
         setattr(pyM, constrSetName + '5_' + abbrvName, pyomo.Set(dimen=2, initialize=declareOpConstrSet5))
 
@@ -632,13 +1086,28 @@ class ComponentModel(metaclass=ABCMeta):
 
         def capBounds(pyM, loc, compName):
             """ Function for setting lower and upper capacity bounds. """
-            comp = self.componentsDict[compName]
-            return (comp.capacityMin[loc] if (comp.capacityMin is not None and not comp.hasIsBuiltBinaryVariable)
-                    else 0,
-                    comp.capacityMax[loc] if comp.capacityMax is not None else None)
+            return self.getCapacityBounds(loc, compName)
         setattr(pyM, 'cap_' + abbrvName, pyomo.Var(getattr(pyM, 'designDimensionVarSet_' + abbrvName),
                 domain=pyomo.NonNegativeReals, bounds=capBounds))
 
+    def getCapacityBounds(self, loc, compName):
+        """
+        Get the lower and upper bound of a capacity variable.
+
+        :param loc: location (or connection) of the capacity variable.
+        :type loc: string
+
+        :param compName: name of the component.
+        :type compName: string
+
+        :return: lower and upper bound (None if the capacity is not bounded from above)
+        :rtype: tuple
+        """
+        comp = self.componentsDict[compName]
+        return (comp.capacityMin[loc] if (comp.capacityMin is not None and not comp.hasIsBuiltBinaryVariable)
+                else 0,
+                comp.capacityMax[loc] if comp.capacityMax is not None else None)
+
     def declareRealNumbersVars(self, pyM):
         """ 
         Declare variables representing the (continuous) number of installed components [-]. 
@@ -732,6 +1201,32 @@ class ComponentModel(metaclass=ABCMeta):
             return capVar[loc, compName] <= designBinVar[loc, compName] * compDict[compName].bigM
         setattr(pyM, 'ConstrBigM_' + abbrvName, pyomo.Constraint(designBinVarSet, rule=bigM))
 
+    def getDesignParam(self, pyM, paramName, varSet):
+        """
+        Declare, if not already done, a mutable parameter which stores the values of a location specific design
+        parameter (e.g. capacityFix) of the components in a variable set and return it. The parameter is only defined
+        for (location, component name) tuples of components for which the design parameter is not None.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param paramName: attribute of the considered components which stores the design parameter.
+        :type paramName: string
+
+        :param varSet: set of (location, component name) tuples.
+        :type varSet: pyomo Set
+
+        :return: design parameter
+        :rtype: pyomo Param
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        if not hasattr(pyM, paramName + 'Param_' + abbrvName):
+            values = {(loc, compName): float(getattr(compDict[compName], paramName)[loc]) for loc, compName in varSet
+                      if getattr(compDict[compName], paramName) is not None}
+            setattr(pyM, paramName + 'Param_' + abbrvName,
+                    pyomo.Param(list(values.keys()), initialize=values, mutable=True))
+        return getattr(pyM, paramName + 'Param_' + abbrvName)
+
     def capacityMinDec(self, pyM):
         """ 
         Enforce the consideration of minimum capacities for components with design decision variables. 
@@ -743,10 +1238,23 @@ class ComponentModel(metaclass=ABCMeta):
         capVar, designBinVar = getattr(pyM, 'cap_' + abbrvName), getattr(pyM, 'designBin_' + abbrvName)
         designBinVarSet = getattr(pyM, 'designDecisionVarSet_' + abbrvName)
 
+        # Set of the components with design decision variables for which a minimum capacity is given
+        def initCapacityMinDecSet(pyM):
+            return ((loc, compName) for loc, compName in designBinVarSet if compDict[compName].capacityMin is not None)
+        setattr(pyM, 'capacityMinDecConstrSet_' + abbrvName, pyomo.Set(dimen=2, initialize=initCapacityMinDecSet))
+        constrSet = getattr(pyM, 'capacityMinDecConstrSet_' + abbrvName)
+
+        if pyM.useMutableParameters:
+            capMinParam = self.getDesignParam(pyM, 'capacityMin', designBinVarSet)
+
+            def capacityMinDec(pyM, loc, compName):
+                return capVar[loc, compName] >= capMinParam[loc, compName] * designBinVar[loc, compName]
+            setattr(pyM, 'ConstrCapacityMinDec_' + abbrvName, pyomo.Constraint(constrSet, rule=capacityMinDec))
+            return
+
         def capacityMinDec(pyM, loc, compName):
-            return (capVar[loc, compName] >= compDict[compName].capacityMin[loc] * designBinVar[loc, compName]
-                    if compDict[compName].capacityMin is not None else pyomo.Constraint.Skip)
-        setattr(pyM, 'ConstrCapacityMinDec_' + abbrvName, pyomo.Constraint(designBinVarSet, rule=capacityMinDec))
+            return capVar[loc, compName] >= compDict[compName].capacityMin[loc] * designBinVar[loc, compName]
+        setattr(pyM, 'ConstrCapacityMinDec_' + abbrvName, pyomo.Constraint(constrSet, rule=capacityMinDec))
 
     def capacityFix(self, pyM):
         """ 
@@ -759,10 +1267,29 @@ class ComponentModel(metaclass=ABCMeta):
         capVar = getattr(pyM, 'cap_' + abbrvName)
         capVarSet = getattr(pyM, 'designDimensionVarSet_' + abbrvName)
 
+        if pyM.useVariableBounds:
+            for loc, compName in capVarSet:
+                if compDict[compName].capacityFix is not None:
+                    capVar[loc, compName].fix(float(compDict[compName].capacityFix[loc]))
+            return
+
+        # Set of the components for which a fixed capacity is given
+        def initCapacityFixSet(pyM):
+            return ((loc, compName) for loc, compName in capVarSet if compDict[compName].capacityFix is not None)
+        setattr(pyM, 'capacityFixConstrSet_' + abbrvName, pyomo.Set(dimen=2, initialize=initCapacityFixSet))
+        constrSet = getattr(pyM, 'capacityFixConstrSet_' + abbrvName)
+
+        if pyM.useMutableParameters:
+            capFixParam = self.getDesignParam(pyM, 'capacityFix', capVarSet)
+
+            def capacityFix(pyM, loc, compName):
+                return capVar[loc, compName] == capFixParam[loc, compName]
+            setattr(pyM, 'ConstrCapacityFix_' + abbrvName, pyomo.Constraint(constrSet, rule=capacityFix))
+            return
+
         def capacityFix(pyM, loc, compName):
-            return (capVar[loc, compName] == compDict[compName].capacityFix[loc]
-                    if compDict[compName].capacityFix is not None else pyomo.Constraint.Skip)
-        setattr(pyM, 'ConstrCapacityFix_' + abbrvName, pyomo.Constraint(capVarSet, rule=capacityFix))
+            return capVar[loc, compName] == compDict[compName].capacityFix[loc]
+        setattr(pyM, 'ConstrCapacityFix_' + abbrvName, pyomo.Constraint(constrSet, rule=capacityFix))
 
     def designBinFix(self, pyM):
         """ 
@@ -775,20 +1302,313 @@ class ComponentModel(metaclass=ABCMeta):
         designBinVar = getattr(pyM, 'designBin_' + abbrvName)
         designBinVarSet = getattr(pyM, 'designDecisionVarSet_' + abbrvName)
 
+        if pyM.useVariableBounds:
+            for loc, compName in designBinVarSet:
+                if compDict[compName].isBuiltFix is not None:
+                    designBinVar[loc, compName].fix(float(compDict[compName].isBuiltFix[loc]))
+            return
+
+        # Set of the components for which the binary design variables are fixed
+        def initDesignBinFixSet(pyM):
+            return ((loc, compName) for loc, compName in designBinVarSet if compDict[compName].isBuiltFix is not None)
+        setattr(pyM, 'designBinFixConstrSet_' + abbrvName, pyomo.Set(dimen=2, initialize=initDesignBinFixSet))
+
         def designBinFix(pyM, loc, compName):
-            return (designBinVar[loc, compName] == compDict[compName].isBuiltFix[loc]
-                    if compDict[compName].isBuiltFix is not None else pyomo.Constraint.Skip)
-        setattr(pyM, 'ConstrDesignBinFix_' + abbrvName, pyomo.Constraint(designBinVarSet, rule=designBinFix))
+            return designBinVar[loc, compName] == compDict[compName].isBuiltFix[loc]
+        setattr(pyM, 'ConstrDesignBinFix_' + abbrvName,
+                pyomo.Constraint(getattr(pyM, 'designBinFixConstrSet_' + abbrvName), rule=designBinFix))
+
+    def getDesignVariableValues(self, pyM):
+        """
+        Get the values of the design variables (capacities, numbers of installed components and binary design
+        decision variables) of the modeling class, e.g. after the optimization.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :return: values of the design variables (the keys are the variable names, the values are dictionaries with
+            the (location, component name) indices as keys)
+        :rtype: dictionary
+        """
+        abbrvName = self.abbrvName
+        return {varName: getattr(pyM, varName + '_' + abbrvName).get_values()
+                for varName in ['cap', 'nbReal', 'nbInt', 'designBin']}
+
+    def fixDesignVariables(self, pyM, designVariableValues):
+        """
+        Fix the design variables of the modeling class to the given values (cf. getDesignVariableValues). The values
+        of the integer and binary variables are rounded. Fixed variables are not passed to the solver such that the
+        integer and binary design variables are removed from the optimization problem.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param designVariableValues: values of the design variables.
+        :type designVariableValues: dictionary
+        """
+        abbrvName = self.abbrvName
+        for varName, values in designVariableValues.items():
+            var = getattr(pyM, varName + '_' + abbrvName)
+            for index, value in values.items():
+                var[index].fix(round(value) if varName in ['nbInt', 'designBin'] else max(value, 0))
+
+    def setWarmstartValues(self, pyM, sourcePyM, timeStepMap):
+        """
+        Set the values of the variables of the modeling class to the optimal values of another optimization problem
+        (e.g. one with clustered time series data), which are used as a starting point by the solver (cf.
+        EnergySystemModel.optimize).
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param sourcePyM: pyomo ConcreteModel which stores the optimal values of the other optimization problem.
+        :type sourcePyM: pyomo ConcreteModel
+
+        :param timeStepMap: (period index, period, time step) tuples of the other optimization problem for each time
+            step of the full time horizon (cf. EnergySystemModel.getTimeStepMap).
+        :type timeStepMap: list
+        """
+        self.setDesignWarmstartValues(pyM, sourcePyM)
+        self.setOperationWarmstartValues(pyM, sourcePyM, 'op', timeStepMap)
+
+    def setDesignWarmstartValues(self, pyM, sourcePyM):
+        """
+        Set the values of the design variables to the optimal values of another optimization problem (cf.
+        setWarmstartValues). The values of the integer and binary variables are rounded.
+        """
+        abbrvName = self.abbrvName
+        for varName, values in self.getDesignVariableValues(sourcePyM).items():
+            var = getattr(pyM, varName + '_' + abbrvName)
+            for index, value in values.items():
+                if value is not None:
+                    var[index].value = round(value) if varName in ['nbInt', 'designBin'] else max(value, 0)
+
+    def setOperationWarmstartValues(self, pyM, sourcePyM, opVarName, timeStepMap):
+        """
+        Set the values of time dependent variables (e.g. operation variables) to the optimal values of another
+        optimization problem, whose time series are expanded to the full time horizon (cf. setWarmstartValues).
+
+        :param opVarName: name of the variables (e.g. 'op').
+        :type opVarName: string
+        """
+        abbrvName = self.abbrvName
+        var, sourceVar = getattr(pyM, opVarName + '_' + abbrvName), getattr(sourcePyM, opVarName + '_' + abbrvName)
+        for index in var:
+            var[index].value = sourceVar[index[:-2] + timeStepMap[index[-1]][1:]].value
 
     ####################################################################################################################
     #                               Functions for declaring time dependent constraints                                 #
     ####################################################################################################################
 
+    def getTimeStepDurations(self, pyM):
+        """
+        Get the durations of the time steps (number of original time steps per time step, cf.
+        EnergySystemModel.declareTimeSets) in the order of the time set. The durations are only larger than one if
+        the time steps of the typical periods are merged into segments.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :return: durations of the time steps
+        :rtype: NumPy array
+        """
+        return np.fromiter(pyM.timeStepDurations.values(), dtype=float, count=len(pyM.timeStepDurations))
+
+    def getOperationRateArray(self, pyM, constrSet, opRateName, factor=1):
+        """
+        Get the operation rate time series of all location-component tuples in a constraint set as a NumPy array.
+        The rows of the array refer to the tuples (in the order of the constraint set) and the columns to the time
+        steps (in the order of the time set). The array is multiplied with the given factor.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param constrSet: set of (location, component name) tuples
+        :type constrSet: pyomo Set
+
+        :param opRateName: attribute of the considered components which stores the operation rate time series.
+        :type opRateName: string
+
+        :param factor: factor with which the operation rates are multiplied (either one factor or one factor per
+            time step in the order of the time set).
+            |br| * the default value is 1
+        :type factor: float or NumPy array
+
+        :return: operation rates
+        :rtype: NumPy array (number of tuples x number of time steps)
+        """
+        compDict, timeSteps = self.componentsDict, list(pyM.timeSet)
+        periods, steps = np.array([p for p, t in timeSteps], dtype=int), np.array([t for p, t in timeSteps], dtype=int)
+        rows = []
+        for loc, compName in constrSet:
+            rate = compDict[compName].getTimeSeries(opRateName)
+            rows.append(rate.values[periods, steps, rate.locationIndex[loc]])
+        return np.array(rows, dtype=float).reshape(len(rows), len(timeSteps)) * factor
+
+    def getOperationRateParam(self, pyM, opRateName):
+        """
+        Declare, if not already done, a mutable parameter which stores the operation rate time series of the
+        components of the modeling class and return it. The parameter is indexed by (location, component name,
+        period, time step) tuples of all operation variables whose components have the time series.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param opRateName: attribute of the considered components which stores the operation rate time series.
+        :type opRateName: string
+
+        :return: operation rate parameter
+        :rtype: pyomo Param
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        if not hasattr(pyM, opRateName + 'Param_' + abbrvName):
+            varSet = [(loc, compName) for loc, compName in getattr(pyM, 'operationVarSet_' + abbrvName)
+                      if compDict[compName].getTimeSeries(opRateName) is not None]
+            rates = self.getOperationRateArray(pyM, varSet, opRateName)
+            values = {(loc, compName, p, t): r for (loc, compName), rate in zip(varSet, rates.tolist())
+                      for (p, t), r in zip(pyM.timeSet, rate)}
+            setattr(pyM, opRateName + 'Param_' + abbrvName,
+                    pyomo.Param(list(values.keys()), initialize=values, mutable=True))
+        return getattr(pyM, opRateName + 'Param_' + abbrvName)
+
+    def getOperationRates(self, pyM, constrSet, opRateName, factor=1):
+        """
+        Get the operation rate time series of all location-component tuples in a constraint set for the array-based
+        declaration of the operation mode constraints (cf. getOperationRateArray). If mutable parameters are used,
+        the entries are expressions of the operation rate parameter (cf. getOperationRateParam).
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param constrSet: set of (location, component name) tuples
+        :type constrSet: pyomo Set
+
+        :param opRateName: attribute of the considered components which stores the operation rate time series.
+        :type opRateName: string
+
+        :param factor: factor with which the operation rates are multiplied (either one factor or one factor per
+            time step in the order of the time set).
+            |br| * the default value is 1
+        :type factor: float or NumPy array
+
+        :return: operation rates
+        :rtype: NumPy array or list of lists (number of tuples x number of time steps)
+        """
+        if not pyM.useMutableParameters:
+            return self.getOperationRateArray(pyM, constrSet, opRateName, factor)
+        rate, timeSteps = self.getOperationRateParam(pyM, opRateName), list(pyM.timeSet)
+        factors = np.broadcast_to(factor, len(timeSteps)).tolist()
+        return [[rate[loc, compName, p, t] * f if f != 1 else rate[loc, compName, p, t]
+                 for (p, t), f in zip(timeSteps, factors)] for loc, compName in constrSet]
+
+    def declareOperationModeArrays(self, pyM, constrName, constrSet, opVar, rates, capVar=None, isEquality=False):
+        """
+        Declare an operation mode constraint from an array of operation rates instead of a rule callback. The
+        operation is either set equal to (isEquality=True) or limited by (isEquality=False)\n
+        * the capacity multiplied with the rate (capVar is given) or
+        * the rate itself (capVar is None).\n
+        The constraint is indexed by the constraint set and the time set just like the rule-based constraints.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param constrName: name of the constraint.
+        :type constrName: string
+
+        :param constrSet: set of (location, component name) tuples for which the constraint is declared.
+        :type constrSet: pyomo Set
+
+        :param opVar: operation variables.
+        :type opVar: pyomo Var
+
+        :param rates: operation rates (cf. getOperationRates).
+        :type rates: NumPy array or list of lists (number of tuples x number of time steps)
+
+        :param capVar: capacity variables or None.
+            |br| * the default value is None
+        :type capVar: pyomo Var or None
+
+        :param isEquality: states if the operation is equal to or limited by the right-hand side.
+            |br| * the default value is False
+        :type isEquality: boolean
+        """
+        timeSteps = list(pyM.timeSet)
+
+        # If the optimization problem is directly written to a file, the rows are passed to the problem writer
+        # without declaring pyomo constraints (cf. EnergySystemModel.writeOptimizationProblem)
+        writer = getattr(pyM, 'problemWriter', None)
+        if writer is not None:
+            sense = '==' if isEquality else '<='
+            for (loc, compName), rate in zip(constrSet, rates.tolist() if isinstance(rates, np.ndarray) else rates):
+                opCols = [writer.getColumn(opVar[loc, compName, p, t]) for p, t in timeSteps]
+                if capVar is None:
+                    for col, r in zip(opCols, rate):
+                        writer.addRow([col], [1], sense, r)
+                else:
+                    capCol = writer.getColumn(capVar[loc, compName])
+                    for col, r in zip(opCols, rate):
+                        writer.addRow([col, capCol] if r != 0 else [col], [1, -r] if r != 0 else [1], sense, 0)
+            return
+
+        # The rule only looks up the rate of a row by the (location, component name) tuple and the time step
+        rates = dict(zip(constrSet, rates.tolist() if isinstance(rates, np.ndarray) else rates))
+        timeStepIndex = {timeStep: i for i, timeStep in enumerate(timeSteps)}
+
+        def operationModeRule(pyM, loc, compName, p, t):
+            rate = rates[loc, compName][timeStepIndex[p, t]]
+            if capVar is not None:
+                # Zero rates do not result in a capacity entry of the row
+                rate = rate * capVar[loc, compName] if not isinstance(rate, float) or rate != 0 else 0
+            return opVar[loc, compName, p, t] == rate if isEquality else opVar[loc, compName, p, t] <= rate
+
+        setattr(pyM, constrName, pyomo.Constraint(constrSet, pyM.timeSet, rule=operationModeRule))
+
+    def setOperationModeBounds(self, pyM, constrSet, opVar, opRateName, isEquality=False):
+        """
+        Model an operation mode restriction, in which the operation is either set equal to (isEquality=True) or
+        limited by (isEquality=False) a time series, by fixing the operation variables respectively by setting their
+        upper bounds instead of declaring a constraint. The time series is multiplied with the durations of the time
+        steps. Previously set values are overwritten.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param constrSet: set of (location, component name) tuples for which the restriction is modeled.
+        :type constrSet: pyomo Set or list
+
+        :param opVar: operation variables.
+        :type opVar: pyomo Var
+
+        :param opRateName: attribute of the considered components which stores the operation rate time series.
+        :type opRateName: string
+
+        :param isEquality: states if the operation is equal to or limited by the operation rates.
+            |br| * the default value is False
+        :type isEquality: boolean
+        """
+        timeSteps = list(pyM.timeSet)
+        rates = self.getOperationRateArray(pyM, constrSet, opRateName, self.getTimeStepDurations(pyM))
+        for (loc, compName), rate in zip(constrSet, rates.tolist()):
+            for (p, t), r in zip(timeSteps, rate):
+                if isEquality:
+                    opVar[loc, compName, p, t].fix(r)
+                else:
+                    opVar[loc, compName, p, t].setub(r)
+
+    def registerOperationModeBounds(self, pyM, constrSet, opVar, opRateName, isEquality=False):
+        """
+        Register the operation variables whose bounds are set from an operation rate time series (cf.
+        setOperationModeBounds) such that the bounds can be updated if the time series changes.
+        """
+        if not hasattr(pyM, 'operationRateBoundsDict_' + self.abbrvName):
+            setattr(pyM, 'operationRateBoundsDict_' + self.abbrvName, {})
+        getattr(pyM, 'operationRateBoundsDict_' + self.abbrvName)[opRateName] = (constrSet, opVar, isEquality)
+
     def operationMode1(self, pyM, esM, constrName, constrSetName, opVarName, factorName=None, isStateOfCharge=False):
         """
         Define operation mode 1. The operation [commodityUnit*h] is limited by the installed capacity in:\n
         * [commodityUnit*h] (for storages) or in
-        * [commodityUnit] multiplied by the hours per time step (else).\n
+        * [commodityUnit] multiplied by the hours per time step and the duration of the time step (else).\n
         An additional factor can limited the operation further.
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
@@ -796,9 +1616,22 @@ class ComponentModel(metaclass=ABCMeta):
         constrSet1 = getattr(pyM, constrSetName + '1_' + abbrvName)
         factor1 = 1 if isStateOfCharge else esM.hoursPerTimeStep
 
+        if pyM.buildBackend == 'arrays':
+            factors = np.array([factor1 * (1 if factorName is None else getattr(compDict[compName], factorName))
+                                for loc, compName in constrSet1], dtype=float)
+            if isStateOfCharge:
+                rates = np.repeat(factors.reshape(-1, 1), len(pyM.timeSet), axis=1)
+            else:
+                rates = factors.reshape(-1, 1) * self.getTimeStepDurations(pyM).reshape(1, -1)
+            self.declareOperationModeArrays(pyM, constrName + '1_' + abbrvName, constrSet1, opVar, rates, capVar)
+            return
+
+        durations = pyM.timeStepDurations
+
         def op1(pyM, loc, compName, p, t):
             factor2 = 1 if factorName is None else getattr(compDict[compName], factorName)
-            return opVar[loc, compName, p, t] <= factor1 * factor2 * capVar[loc, compName]
+            factor = factor1 if isStateOfCharge else factor1 * durations[p, t]
+            return opVar[loc, compName, p, t] <= factor * factor2 * capVar[loc, compName]
         setattr(pyM, constrName + '1_' + abbrvName, pyomo.Constraint(constrSet1, pyM.timeSet, rule=op1))
 
     def operationMode2(self, pyM, esM, constrName, constrSetName, opVarName, opRateName='operationRateFix',
@@ -807,16 +1640,32 @@ class ComponentModel(metaclass=ABCMeta):
         Define operation mode 2. The operation [commodityUnit*h] is equal to the installed capacity multiplied
         with a time series in:\n
         * [commodityUnit*h] (for storages) or in
-        * [commodityUnit] multiplied by the hours per time step (else).\n
+        * [commodityUnit] multiplied by the hours per time step and the duration of the time step (else).\n
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
         opVar, capVar = getattr(pyM, opVarName + '_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet2 = getattr(pyM, constrSetName + '2_' + abbrvName)
         factor = 1 if isStateOfCharge else esM.hoursPerTimeStep
+        factors = {(p, t): factor if isStateOfCharge else factor * d for (p, t), d in pyM.timeStepDurations.items()}
+
+        if pyM.buildBackend == 'arrays':
+            rates = self.getOperationRates(pyM, constrSet2, opRateName, np.fromiter(factors.values(), dtype=float))
+            self.declareOperationModeArrays(pyM, constrName + '2_' + abbrvName, constrSet2, opVar, rates, capVar,
+                                            isEquality=True)
+            return
+
+        if pyM.useMutableParameters:
+            rateParam = self.getOperationRateParam(pyM, opRateName)
+
+            def op2(pyM, loc, compName, p, t):
+                return (opVar[loc, compName, p, t] ==
+                        capVar[loc, compName] * rateParam[loc, compName, p, t] * factors[p, t])
+            setattr(pyM, constrName + '2_' + abbrvName, pyomo.Constraint(constrSet2, pyM.timeSet, rule=op2))
+            return
 
         def op2(pyM, loc, compName, p, t):
-            rate = getattr(compDict[compName], opRateName)
-            return opVar[loc, compName, p, t] == capVar[loc, compName] * rate[loc][p, t] * factor
+            rate = compDict[compName].getTimeSeries(opRateName)
+            return opVar[loc, compName, p, t] == capVar[loc, compName] * rate[loc, p, t] * factors[p, t]
         setattr(pyM, constrName + '2_' + abbrvName, pyomo.Constraint(constrSet2, pyM.timeSet, rule=op2))
 
     def operationMode3(self, pyM, esM, constrName, constrSetName, opVarName, opRateName='operationRateMax',
@@ -825,42 +1674,102 @@ class ComponentModel(metaclass=ABCMeta):
         Define operation mode 3. The operation [commodityUnit*h] is limited by an installed capacity multiplied
         with a time series in:\n
         * [commodityUnit*h] (for storages) or in
-        * [commodityUnit] multiplied by the hours per time step (else).\n
+        * [commodityUnit] multiplied by the hours per time step and the duration of the time step (else).\n
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
         opVar, capVar = getattr(pyM, opVarName + '_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet3 = getattr(pyM, constrSetName + '3_' + abbrvName)
         factor = 1 if isStateOfCharge else esM.hoursPerTimeStep
+        factors = {(p, t): factor if isStateOfCharge else factor * d for (p, t), d in pyM.timeStepDurations.items()}
+
+        if pyM.buildBackend == 'arrays':
+            rates = self.getOperationRates(pyM, constrSet3, opRateName, np.fromiter(factors.values(), dtype=float))
+            self.declareOperationModeArrays(pyM, constrName + '3_' + abbrvName, constrSet3, opVar, rates, capVar)
+            return
+
+        if pyM.useMutableParameters:
+            rateParam = self.getOperationRateParam(pyM, opRateName)
+
+            def op3(pyM, loc, compName, p, t):
+                return (opVar[loc, compName, p, t] <=
+                        capVar[loc, compName] * rateParam[loc, compName, p, t] * factors[p, t])
+            setattr(pyM, constrName + '3_' + abbrvName, pyomo.Constraint(constrSet3, pyM.timeSet, rule=op3))
+            return
 
         def op3(pyM, loc, compName, p, t):
-            rate = getattr(compDict[compName], opRateName)
-            return opVar[loc, compName, p, t] <= capVar[loc, compName] * rate[loc][p, t] * factor
+            rate = compDict[compName].getTimeSeries(opRateName)
+            return opVar[loc, compName, p, t] <= capVar[loc, compName] * rate[loc, p, t] * factors[p, t]
         setattr(pyM, constrName + '3_' + abbrvName, pyomo.Constraint(constrSet3, pyM.timeSet, rule=op3))
 
     def operationMode4(self, pyM, esM, constrName, constrSetName, opVarName, opRateName='operationRateFix'):
         """
-        Define operation mode 4. The operation [commodityUnit*h] is equal to a time series in.
+        Define operation mode 4. The operation [commodityUnit*h] is equal to a time series in (multiplied by the
+        duration of the time step).
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
         opVar = getattr(pyM, opVarName + '_' + abbrvName)
         constrSet4 = getattr(pyM, constrSetName + '4_' + abbrvName)
 
+        if pyM.useVariableBounds:
+            self.setOperationModeBounds(pyM, constrSet4, opVar, opRateName, isEquality=True)
+            self.registerOperationModeBounds(pyM, constrSet4, opVar, opRateName, isEquality=True)
+            return
+
+        durations = pyM.timeStepDurations
+
+        if pyM.buildBackend == 'arrays':
+            rates = self.getOperationRates(pyM, constrSet4, opRateName, self.getTimeStepDurations(pyM))
+            self.declareOperationModeArrays(pyM, constrName + '4_' + abbrvName, constrSet4, opVar, rates,
+                                            isEquality=True)
+            return
+
+        if pyM.useMutableParameters:
+            rateParam = self.getOperationRateParam(pyM, opRateName)
+
+            def op4(pyM, loc, compName, p, t):
+                rate = rateParam[loc, compName, p, t]
+                return opVar[loc, compName, p, t] == (rate * durations[p, t] if durations[p, t] != 1 else rate)
+            setattr(pyM, constrName + '4_' + abbrvName, pyomo.Constraint(constrSet4, pyM.timeSet, rule=op4))
+            return
+
         def op4(pyM, loc, compName, p, t):
-            rate = getattr(compDict[compName], opRateName)
-            return opVar[loc, compName, p, t] == rate[loc][p, t]
+            rate = compDict[compName].getTimeSeries(opRateName)
+            return opVar[loc, compName, p, t] == rate[loc, p, t] * durations[p, t]
         setattr(pyM, constrName + '4_' + abbrvName, pyomo.Constraint(constrSet4, pyM.timeSet, rule=op4))
 
     def operationMode5(self, pyM, esM, constrName, constrSetName, opVarName, opRateName='operationRateMax'):
         """
-        Define operation mode 4. The operation  [commodityUnit*h] is limited by a time series.
+        Define operation mode 4. The operation  [commodityUnit*h] is limited by a time series (multiplied by the
+        duration of the time step).
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
         opVar = getattr(pyM, opVarName + '_' + abbrvName)
         constrSet5 = getattr(pyM, constrSetName + '5_' + abbrvName)
 
+        if pyM.useVariableBounds:
+            self.setOperationModeBounds(pyM, constrSet5, opVar, opRateName)
+            self.registerOperationModeBounds(pyM, constrSet5, opVar, opRateName)
+            return
+
+        durations = pyM.timeStepDurations
+
+        if pyM.buildBackend == 'arrays':
+            rates = self.getOperationRates(pyM, constrSet5, opRateName, self.getTimeStepDurations(pyM))
+            self.declareOperationModeArrays(pyM, constrName + '5_' + abbrvName, constrSet5, opVar, rates)
+            return
+
+        if pyM.useMutableParameters:
+            rateParam = self.getOperationRateParam(pyM, opRateName)
+
+            def op5(pyM, loc, compName, p, t):
+                rate = rateParam[loc, compName, p, t]
+                return opVar[loc, compName, p, t] <= (rate * durations[p, t] if durations[p, t] != 1 else rate)
+            setattr(pyM, constrName + '5_' + abbrvName, pyomo.Constraint(constrSet5, pyM.timeSet, rule=op5))
+            return
+
         def op5(pyM, loc, compName, p, t):
-            rate = getattr(compDict[compName], opRateName)
-            return opVar[loc, compName, p, t] <= rate[loc][p, t]
+            rate = compDict[compName].getTimeSeries(opRateName)
+            return opVar[loc, compName, p, t] <= rate[loc, p, t] * durations[p, t]
         setattr(pyM, constrName + '5_' + abbrvName, pyomo.Constraint(constrSet5, pyM.timeSet, rule=op5))
 
     ####################################################################################################################
@@ -934,6 +1843,24 @@ class ComponentModel(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def getCommodityBalanceIncidence(self, pyM):
+        """
+        Get the incidence of the operation variables of the modeling class in the commodity balances. The incidence
+        is a dictionary which assigns each (location, commodity) tuple, to which the modeling class contributes, a
+        list of (operation variable, (location, component name), coefficient) tuples. The commodity balance
+        contribution in a time step (p, t) is then given by the sum of coefficient * variable[location, component name,
+        p, t] over the list. Only non-zero coefficients are listed.
+        Modeling classes which do not implement this function return None. Their contributions are then obtained
+        from the hasOpVariablesForLocationCommodity and getCommodityBalanceContribution functions.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :return: commodity balance incidence or None
+        :rtype: dictionary or None
+        """
+        return None
+
     @abstractmethod
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
@@ -1118,15 +2045,14 @@ class ComponentModel(metaclass=ABCMeta):
             |br| * the default value is False.
         :type getoptValue: boolean
         """
-        indices = getattr(pyM, dictName + '_' + self.abbrvName).items()
-        if self.dimension == '1dim':
-            return sum(self.getLocEconomicsTD(pyM, esM, factorNames, varName, loc, compName, getOptValue)
-                       for loc, compNames in indices for compName in compNames)
-        else:
-            return sum(self.getLocEconomicsTD(pyM, esM, factorNames, varName, loc + '_' + loc_, compName, getOptValue)
-                       for loc, subDict in indices
-                       for loc_, compNames in subDict.items()
-                       for compName in compNames)
+        compDict = self.componentsDict
+        factors = []
+        for loc, compName in self.getEconomicsIndices(pyM, dictName):
+            factor = 1.
+            for factorName in factorNames:
+                factor *= getattr(compDict[compName], factorName)[loc]
+            factors.append(((loc, compName), factor))
+        return self.getEconomicsTDSum(pyM, esM, varName, factors, getOptValue)
 
 
     def getLocEconomicsTimeSeries(self, pyM, esM, factorName, varName, loc, compName, getOptValue=False):
@@ -1167,13 +2093,14 @@ class ComponentModel(metaclass=ABCMeta):
         :type getoptValue: boolean
         """
         var = getattr(pyM, varName + '_' + self.abbrvName)
-        if getattr(self.componentsDict[compName], factorName) is not None:
-            factor = getattr(self.componentsDict[compName], factorName)[loc]
+        factor = self.componentsDict[compName].getTimeSeries(factorName)
+        if factor is not None:
+            factor = factor.values[:, :, factor.locationIndex[loc]].tolist()
             if not getOptValue:
-                return sum(factor[p, t] * var[loc, compName, p, t] * esM.periodOccurrences[p]
+                return sum(factor[p][t] * var[loc, compName, p, t] * esM.periodOccurrences[p]
                                        for p, t in pyM.timeSet)/esM.numberOfYears
             else:
-                return sum(factor[p, t] * var[loc, compName, p, t].value * esM.periodOccurrences[p]
+                return sum(factor[p][t] * var[loc, compName, p, t].value * esM.periodOccurrences[p]
                                        for p, t in pyM.timeSet)/esM.numberOfYears
         else:
             return 0
@@ -1209,15 +2136,130 @@ class ComponentModel(metaclass=ABCMeta):
             |br| * the default value is False.
         :type getoptValue: boolean
         """
+        compDict, timeSteps = self.componentsDict, list(pyM.timeSet)
+        periods, steps = np.array([p for p, t in timeSteps], dtype=int), np.array([t for p, t in timeSteps], dtype=int)
+        factors = []
+        for loc, compName in self.getEconomicsIndices(pyM, dictName):
+            factor = compDict[compName].getTimeSeries(factorName)
+            if factor is not None:
+                factors.append(((loc, compName), factor.values[periods, steps, factor.locationIndex[loc]]))
+        return self.getEconomicsTDSum(pyM, esM, varName, factors, getOptValue)
+
+    def getEconomicsIndices(self, pyM, dictName):
+        """
+        Get the (location, component name) tuples of a variable set. In case of a two-dimensional component (e.g. a
+        transmission component), the location refers to the connection between two locations ('loc1_loc2').
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param dictName: String of the variable set (e.g. 'operationVarDict')
+        :type dictName: string
+
+        :return: (location, component name) tuples
+        :rtype: list of tuples
+        """
         indices = getattr(pyM, dictName + '_' + self.abbrvName).items()
         if self.dimension == '1dim':
-            return sum(self.getLocEconomicsTimeSeries(pyM, esM, factorName, varName, loc, compName, getOptValue)
-                       for loc, compNames in indices for compName in compNames)
+            return [(loc, compName) for loc, compNames in indices for compName in compNames]
         else:
-            return sum(self.getLocEconomicsTimeSeries(pyM, esM, factorName, varName, loc + '_' + loc_, compName, getOptValue)
-                        for loc, subDict in indices
-                        for loc_, compNames in subDict.items()
-                        for compName in compNames)
+            return [(loc + '_' + loc_, compName) for loc, subDict in indices
+                    for loc_, compNames in subDict.items() for compName in compNames]
+
+    def getEconomicsTDSum(self, pyM, esM, varName, factors, getOptValue=False):
+        """
+        Get the sum of time-dependent variables which are weighted with the given factors and the occurrences of the
+        periods and which are divided by the number of years. The coefficients are computed as arrays and the sum is
+        returned as a single linear expression.
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param esM: EnergySystemModel instance representing the energy system in which the components should be modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param varName: String of the variable that has to be multiplied within the equation (e.g. 'op' for operation variable).
+        :type varName: string
+
+        :param factors: ((location, component name), factor) tuples. The factor is either a float or an array with
+            one value per time step (in the order of the time set).
+        :type factors: list of tuples
+
+        :param getOptValue: Boolean that defines the output of the function:
+            - True: Return the optimal value.
+            - False: Return the equation.
+            |br| * the default value is False.
+        :type getoptValue: boolean
+        """
+        var, timeSteps = getattr(pyM, varName + '_' + self.abbrvName), list(pyM.timeSet)
+        occurrences = np.array([esM.periodOccurrences[p] for p, t in timeSteps], dtype=float)
+        coefficients, variables = [], []
+        for (loc, compName), factor in factors:
+            # The order of the multiplications results in the same coefficients as the term-wise pyomo expressions
+            if np.ndim(factor) == 0:
+                coefs = np.broadcast_to(occurrences * ((1. / esM.numberOfYears) * factor), occurrences.shape)
+            else:
+                coefs = factor * occurrences * (1. / esM.numberOfYears)
+            coefficients.extend(coef for coef in coefs.tolist() if coef != 0)
+            variables.extend(var[loc, compName, p, t] for (p, t), coef in zip(timeSteps, coefs.tolist()) if coef != 0)
+        if getOptValue:
+            return sum(coef * var_.value for coef, var_ in zip(coefficients, variables))
+        return LinearExpression(constant=0, linear_coefs=coefficients, linear_vars=variables) if variables else 0
+
+    def updateComponentData(self, esM, pyM, compName, paramNames):
+        """
+        Push updated parameters of a component into the mutable parameters and the variable bounds of a declared
+        optimization problem (cf. EnergySystemModel.updateComponentData).
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: EnergySystemModel instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param compName: name of the component.
+        :type compName: string
+
+        :param paramNames: names of the updated parameters (cf. Component.isUpdatableParameter).
+        :type paramNames: list of strings
+        """
+        comp, abbrvName = self.componentsDict[compName], self.abbrvName
+        capVarSet = [(loc, compName_) for loc, compName_ in getattr(pyM, 'designDimensionVarSet_' + abbrvName)
+                     if compName_ == compName]
+        opVarSet = [(loc, compName_) for loc, compName_ in getattr(pyM, 'operationVarSet_' + abbrvName)
+                    if compName_ == compName]
+
+        # Update the capacity bounds, the fixed capacities and the minimum capacities of the design decisions
+        if 'capacityMin' in paramNames or 'capacityMax' in paramNames:
+            capVar = getattr(pyM, 'cap_' + abbrvName)
+            for loc, compName in capVarSet:
+                capVar[loc, compName].setlb(self.getCapacityBounds(loc, compName)[0])
+                capVar[loc, compName].setub(self.getCapacityBounds(loc, compName)[1])
+        if 'capacityFix' in paramNames and pyM.useVariableBounds:
+            capVar = getattr(pyM, 'cap_' + abbrvName)
+            for loc, compName in capVarSet:
+                capVar[loc, compName].fix(float(comp.capacityFix[loc]))
+        for paramName in ['capacityMin', 'capacityFix']:
+            if paramName in paramNames and hasattr(pyM, paramName + 'Param_' + abbrvName):
+                param = getattr(pyM, paramName + 'Param_' + abbrvName)
+                for loc, compName in capVarSet:
+                    if (loc, compName) in param:
+                        param[loc, compName] = float(getattr(comp, paramName)[loc])
+
+        # Update the operation rate time series
+        boundsDict = getattr(pyM, 'operationRateBoundsDict_' + abbrvName, {})
+        for opRateName in [name for name in paramNames if isinstance(getattr(type(comp), name, None),
+                                                                      TimeSeriesParameter)]:
+            if hasattr(pyM, opRateName + 'Param_' + abbrvName):
+                param = getattr(pyM, opRateName + 'Param_' + abbrvName)
+                rates = self.getOperationRateArray(pyM, opVarSet, opRateName)
+                for (loc, compName), rate in zip(opVarSet, rates.tolist()):
+                    for (p, t), r in zip(pyM.timeSet, rate):
+                        param[loc, compName, p, t] = r
+            if opRateName in boundsDict:
+                constrSet, opVar, isEquality = boundsDict[opRateName]
+                self.setOperationModeBounds(pyM, [(loc, compName) for loc, compName in opVarSet
+                                                  if (loc, compName) in constrSet], opVar, opRateName, isEquality)
 
     def setOptimalValues(self, esM, pyM, indexColumns, plantUnit, unitApp=''):
         """
@@ -1253,8 +2295,8 @@ class ComponentModel(metaclass=ABCMeta):
         :rtype: pandas DataFrame
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
-        capVar = getattr(esM.pyM, 'cap_' + abbrvName)
-        binVar = getattr(esM.pyM, 'designBin_' + abbrvName)
+        capVar = getattr(pyM, 'cap_' + abbrvName)
+        binVar = getattr(pyM, 'designBin_' + abbrvName)
 
         props = ['capacity', 'isBuilt', 'capexCap', 'capexIfBuilt', 'opexCap', 'opexIfBuilt', 'TAC',
                  'invest']
@@ -1346,3 +2388,54 @@ class ComponentModel(metaclass=ABCMeta):
                                                 'dimension': self.dimension},
                     'operationVariablesOptimum': {'values': self.operationVariablesOptimum, 'timeDependent': True,
                                                   'dimension': self.dimension}}
+
+    def setOptimalOperationValues(self, name, optVal):
+        """
+        Set the optimal values of time dependent variables (cf. getOptimalValues), e.g. the results of a rolling
+        horizon optimization which are stitched together from the results of the single time windows.
+
+        :param name: name of the variables (e.g. 'operationVariablesOptimum').
+        :type name: string
+
+        :param optVal: optimal values of the variables (the time steps are the columns).
+        :type optVal: pandas DataFrame or None
+        """
+        setattr(self, name, optVal)
+
+    def getStateOfChargeValues(self, pyM, timeStep):
+        """
+        Get the values of the state of charge variables of the components at a point in time of the (not aggregated)
+        inter time steps set. The modeling class has no state of charge variables unless the function is overwritten
+        (cf. StorageModel).
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param timeStep: point in time of the inter time steps set.
+        :type timeStep: integer
+
+        :return: values of the state of charge variables with (location, component name) tuples as keys
+        :rtype: dictionary
+        """
+        return {}
+
+    def fixStateOfCharge(self, pyM, initialValues=None, finalValues=None):
+        """
+        Fix the state of charge variables of the components at the beginning and/or at the end of the (not aggregated)
+        time horizon, e.g. to hand over the state of charge between the time windows of a rolling horizon
+        optimization. The modeling class has no state of charge variables unless the function is overwritten (cf.
+        StorageModel).
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param initialValues: values of the state of charge variables at the beginning of the time horizon with
+            (location, component name) tuples as keys (cf. getStateOfChargeValues).
+            |br| * the default value is None
+        :type initialValues: dictionary or None
+
+        :param finalValues: values of the state of charge variables at the end of the time horizon.
+            |br| * the default value is None
+        :type finalValues: dictionary or None
+        """
+        pass
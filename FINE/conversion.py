@@ -1,4 +1,4 @@
-from FINE.component import Component, ComponentModel
+from FINE.component import Component, ComponentModel, TimeSeriesParameter
 from FINE import utils
 import warnings
 import pandas as pd
@@ -12,6 +12,13 @@ class Conversion(Component):
     Last edited: July 27, 2018
     |br| @author: Lara Welder
     """
+    # Time series parameters (kept as NumPy arrays in the time series store of the component)
+    fullOperationRateMax = TimeSeriesParameter('fullOperationRateMax')
+    aggregatedOperationRateMax = TimeSeriesParameter('aggregatedOperationRateMax')
+    operationRateMax = TimeSeriesParameter('operationRateMax')
+    fullOperationRateFix = TimeSeriesParameter('fullOperationRateFix')
+    aggregatedOperationRateFix = TimeSeriesParameter('aggregatedOperationRateFix')
+    operationRateFix = TimeSeriesParameter('operationRateFix')
 
     def __init__(self, esM, name, physicalUnit, commodityConversionFactors, hasCapacityVariable=True,
                  capacityVariableDomain='continuous', capacityPerPlantUnit=1, linkedConversionCapacityID=None,
@@ -157,25 +164,24 @@ class Conversion(Component):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.operationRateMax = self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax
-        self.operationRateFix = self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix
+        self.selectTimeSeries('operationRateMax', hasTSA)
+        self.selectTimeSeries('operationRateFix', hasTSA)
 
-    def getDataForTimeSeriesAggregation(self):
-        """ Function for getting the required data if a time series aggregation is requested. """
-        weightDict, data = {}, []
-        weightDict, data = self.prepareTSAInput(self.fullOperationRateFix, self.fullOperationRateMax,
-                                                '_operationRate_', self.tsaWeight, weightDict, data)
-        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
+    def getDataForTimeSeriesAggregation(self, registry):
+        """ Function for registering the required data if a time series aggregation is requested. """
+        rateFix, rateMax = self.getTimeSeries('fullOperationRateFix'), self.getTimeSeries('fullOperationRateMax')
+        self.prepareTSAInput(rateFix, rateMax, '_operationRate_', self.tsaWeight, registry)
 
-    def setAggregatedTimeSeriesData(self, data):
+    def setAggregatedTimeSeriesData(self, registry):
         """
         Function for determining the aggregated maximum rate and the aggregated fixed operation rate.
 
-        :param data: Pandas DataFrame with the clustered time series data of the conversion component
-        :type data: Pandas DataFrame
+        :param registry: column registry with the clustered time series data of the energy system
+        :type registry: TimeSeriesColumnRegistry
         """
-        self.aggregatedOperationRateFix = self.getTSAOutput(self.fullOperationRateFix, '_operationRate_', data)
-        self.aggregatedOperationRateMax = self.getTSAOutput(self.fullOperationRateMax, '_operationRate_', data)
+        rateFix, rateMax = self.getTimeSeries('fullOperationRateFix'), self.getTimeSeries('fullOperationRateMax')
+        self.aggregatedOperationRateFix = self.getTSAOutput(rateFix, '_operationRate_', registry)
+        self.aggregatedOperationRateMax = self.getTSAOutput(rateMax, '_operationRate_', registry)
 
 
 class ConversionModel(ComponentModel):
@@ -369,6 +375,16 @@ class ConversionModel(ComponentModel):
         return any([(commod in comp.commodityConversionFactors and comp.commodityConversionFactors[commod] != 0)
                     and comp.locationalEligibility[loc] == 1 for comp in self.componentsDict.values()])
 
+    def getCommodityBalanceIncidence(self, pyM):
+        """ Get the incidence of the operation variables in the commodity balances (cf. ComponentModel). """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar, incidence = getattr(pyM, 'op_' + abbrvName), {}
+        for loc, compName in getattr(pyM, 'operationVarSet_' + abbrvName):
+            for commod, factor in compDict[compName].commodityConversionFactors.items():
+                if factor != 0:
+                    incidence.setdefault((loc, commod), []).append((opVar, (loc, compName), factor))
+        return incidence
+
     def getCommodityBalanceContribution(self, pyM, commod, loc, p, t):
         """ Get contribution to a commodity balance. """
         compDict, abbrvName = self.componentsDict, self.abbrvName
@@ -3,18 +3,61 @@ Last edited: July 27 2018
 |br| @author: Lara Welder
 """
 
-from FINE.component import Component, ComponentModel
+from FINE.component import Component, ComponentModel, ModelingClassBlock, ProfiledConcreteModel, \
+    TimeSeriesColumnRegistry
 from FINE import utils
 from tsam.timeseriesaggregation import TimeSeriesAggregation
+import numpy as np
 import pandas as pd
 import pyomo.environ as pyomo
 import pyomo.opt as opt
+try:
+    from pyomo.core.expr.numeric_expr import LinearExpression
+except ImportError:
+    from pyomo.core.expr.expr_pyomo5 import LinearExpression
+from FINE.IOManagement.problemWriter import ProblemWriter, readSolution
+from FINE.IOManagement.clusterCache import ClusterCache
+from FINE.IOManagement.inMemorySolver import solveHighs, checkHighsAvailability
+from concurrent.futures import ProcessPoolExecutor
 import time
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 
+def clusterTimeSeriesData(timeSeriesData, weightDict, numberOfTypicalPeriods, numberOfTimeStepsPerPeriod,
+                          hoursPerTimeStep, clusterMethod, sortValues, **kwargs):
+    """
+    Cluster time series data with the tsam package and compute the error metrics of the clustered time series data
+    (cf. utils.getAggregationErrors). The function is defined on module level such that it can be executed in a
+    process pool (cf. EnergySystemModel.clusterSweep).
+
+    :param timeSeriesData: time series data (cf. EnergySystemModel.getTimeSeriesDataForClustering).
+    :type timeSeriesData: pandas DataFrame
+
+    :param weightDict: weights of the time series.
+    :type weightDict: dictionary
+
+    The other parameters are described in EnergySystemModel.cluster.
+
+    :return: clustering results (clusterPeriodDict, clusterOrder, clusterPeriodIdx, clusterCenterIndices) and error
+        metrics of each time series
+    :rtype: tuple (tuple, pandas DataFrame)
+    """
+    clusterClass = TimeSeriesAggregation(timeSeries=timeSeriesData, noTypicalPeriods=numberOfTypicalPeriods,
+                                         hoursPerPeriod=numberOfTimeStepsPerPeriod*hoursPerTimeStep,
+                                         clusterMethod=clusterMethod, sortValues=sortValues, weightDict=weightDict,
+                                         **kwargs)
+    results = (clusterClass.clusterPeriodDict, clusterClass.clusterOrder, clusterClass.clusterPeriodIdx,
+               clusterClass.clusterCenterIndices)
+
+    # Place the typical periods in the order of the periods and compare them with the original time series data
+    data = pd.DataFrame.from_dict(clusterClass.clusterPeriodDict)[timeSeriesData.columns]
+    predicted = pd.DataFrame(np.concatenate([data.loc[p].values for p in clusterClass.clusterOrder]),
+                             index=timeSeriesData.index, columns=timeSeriesData.columns)
+    return results, utils.getAggregationErrors(timeSeriesData, predicted, weightDict)
+
+
 class EnergySystemModel:
     """
     EnergySystemModel class
@@ -33,7 +76,7 @@ class EnergySystemModel:
     * the modeled spatial representation of the energy system (**locations, lengthUnit**)
     * the modeled temporal representation of the energy system (**totalTimeSteps, hoursPerTimeStep,
       years, periods, periodsOrder, periodsOccurrences, timeStepsPerPeriod, interPeriodTimeSteps,
-      isTimeSeriesDataClustered, typicalPeriods, tsaInstance, timeUnit**)
+      isTimeSeriesDataClustered, typicalPeriods, segmentDurations, tsaInstance, timeUnit**)
     * the considered commodities in the energy system (**commodities, commodityUnitsDict**)
     * the considered components in the energy system (**componentNames, componentModelingDict, costUnit**)
     * optimization related parameters (**pyM, solverSpecs**)\n
@@ -44,6 +87,9 @@ class EnergySystemModel:
     * adding components and their respective modeling classes (**add**)
     * clustering the time series data of all added components using the time series aggregation package tsam, cf.
       https://github.com/FZJ-IEK3-VSA/tsam (**cluster**)
+    * iteratively refining the typical periods of the clustering during the optimization
+      (**optimizeAdaptiveClustering**)
+    * reducing the temporal resolution of the time series data of all components (**resample**)
     * optimizing the specified energy system (**optimize**), for which a pyomo concrete model instance is built
       and filled with \n
       (0) basic time sets, \n
@@ -52,6 +98,10 @@ class EnergySystemModel:
       (3) an objective function. \n
       The pyomo instance is then optimized by a specified solver. The optimization results are processed once
       available.
+    * optimizing the design with the clustered and the operation with the full time series data
+      (**optimizeDesignAndDispatch**)
+    * optimizing the operation with the full time series data in consecutive time windows
+      (**optimizeRollingHorizon**)
     * getting components and their attributes (**getComponent, getCompAttr, getOptimizationSummary**)
 
     Last edited: July 27, 2018
@@ -163,12 +213,19 @@ class EnergySystemModel:
         self.interPeriodTimeSteps = list(range(int(len(self.totalTimeSteps) / len(self.timeStepsPerPeriod)) + 1))
 
         # The isTimeSeriesDataClustered parameter is used to check data consistency.
-        # It is set to True if the class' cluster function is called. It is set to False if a new component is added.
+        # It is set to True if the class' cluster function is called. If a component with time series data is added
+        # afterwards, its time series data is aggregated with the stored cluster order (no re-clustering).
         # If the cluster function is called, the typicalPeriods parameter is set from None to
         # [0, ..., numberOfTypicalPeriods-1] and, if specified, the resulting TimeSeriesAggregation instance is stored
-        # in the tsaInstance parameter (default None).
+        # in the tsaInstance parameter (default None). The typical period assigned to each period (clusterOrder) and
+        # the number of time steps per period as well as the periods representing the typical periods
+        # (clusterCenterIndices) are stored as well (default None). If the time steps of the typical periods are merged
+        # into segments, the number of time steps of each segment is stored in the segmentDurations parameter
+        # (dictionary with (typical period, segment) keys, default None).
         # The time unit refers to time measure referred throughout the model. Currently, it has to be an hour 'h'.
         self.isTimeSeriesDataClustered, self.typicalPeriods, self.tsaInstance = False, None, None
+        self.clusterOrder, self.clusterCenterIndices, self.numberOfTimeStepsPerPeriod = None, None, None
+        self.segmentDurations = None
         self.timeUnit = 'h'
 
         ################################################################################################################
@@ -197,6 +254,11 @@ class EnergySystemModel:
         self.componentModelingDict = {}
         self.costUnit = costUnit
 
+        # The changedModelingClasses parameter (set) stores the names of the modeling classes whose components were
+        # added or changed since the optimization problem was last declared. Only the pyomo Blocks of these modeling
+        # classes have to be rebuilt if the optimization problem is declared again (cf. declareOptimizationProblem).
+        self.changedModelingClasses = set()
+
         ################################################################################################################
         #                                           Optimization parameters                                            #
         ################################################################################################################
@@ -212,10 +274,11 @@ class EnergySystemModel:
         # optimization problem in seconds), runtime (positive float, runtime of the optimization run in seconds),
         # timeLimit (positive float or None, if specified, indicates the maximum allowed runtime of the solver),
         # threads (positive int, number of threads used for optimization, can depend on solver), logFileName
-        # (string, name of logfile).
+        # (string, name of logfile), buildProfile (pandas DataFrame or None, statistics of each pyomo component
+        # declared during the last build of the optimization problem, cf. declareOptimizationProblem).
         self.pyM = None
         self.solverSpecs = {'solver': '', 'optimizationSpecs': '', 'hasTSA': False, 'buildtime': 0, 'solvetime': 0,
-                            'runtime': 0, 'timeLimit': None, 'threads': 0, 'logFileName': ''}
+                            'runtime': 0, 'timeLimit': None, 'threads': 0, 'logFileName': '', 'buildProfile': None}
 
         ################################################################################################################
         #                                           General model parameters                                           #
@@ -302,7 +365,8 @@ class EnergySystemModel:
             return df.loc[((df != 0) & (~df.isnull())).any(axis=1)]
 
     def cluster(self, numberOfTypicalPeriods=7, numberOfTimeStepsPerPeriod=24, clusterMethod='hierarchical',
-                sortValues=True, storeTSAinstance=False, **kwargs):
+                sortValues=True, storeTSAinstance=False, cacheDirectory=None, maxCacheSize=1024,
+                numberOfSegmentsPerPeriod=None, additionalPeriods=None, **kwargs):
         """
         Cluster the time series data of all components considered in the EnergySystemModel instance and then
         stores the clustered data in the respective components. For this, the time series data is broken down
@@ -345,60 +409,449 @@ class EnergySystemModel:
             |br| * the default value is False
         :type storeTSAinstance: boolean
 
+        :param cacheDirectory: directory of an on-disk cache for the clustering results. If a directory is given, the
+            results (typical periods, cluster order, cluster centers and segment durations) are stored in the cache
+            with a key that is a hash of the time series data, the weights and all clustering arguments. If the same
+            clustering is requested again, the results are taken from the cache and the tsam package is not called.
+            If storeTSAinstance is True, the cache is not read since no TimeSeriesAggregation instance is created on
+            a cache hit.
+            |br| * the default value is None
+        :type cacheDirectory: string or None
+
+        :param maxCacheSize: maximum size of the cache [MB]. If it is exceeded, the least recently used entries are
+            removed from the cache.
+            |br| * the default value is 1024
+        :type maxCacheSize: strictly positive float or integer
+
+        :param numberOfSegmentsPerPeriod: states the number of segments into which the time steps of each typical
+            period are merged. The segments are consecutive time steps of variable length (cf. the tsam package
+            parameters segmentation and noSegments). The operation variables of the components are then declared for
+            each segment and represent the operation during the whole segment. If None, no segmentation is applied.
+            |br| * the default value is None
+        :type numberOfSegmentsPerPeriod: strictly positive integer or None
+
+        :param additionalPeriods: indices of (original) periods which are added as additional typical periods after
+            the clustering. Each of these periods is only represented by itself (cf. addTypicalPeriods). This can not
+            be combined with segmentation.
+            |br| * the default value is None
+        :type additionalPeriods: list of positive integers or None
+
         Last edited: August 10, 2018
         |br| @author: Lara Welder
         """
 
         # Check input arguments which have to fit the temporal representation of the energy system
-        utils.checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, len(self.totalTimeSteps))
+        utils.checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, len(self.totalTimeSteps),
+                                   cacheDirectory, maxCacheSize, numberOfSegmentsPerPeriod, additionalPeriods)
 
         timeStart = time.time()
         utils.output('\nClustering time series data with ' + str(numberOfTypicalPeriods) + ' typical periods and '
                      + str(numberOfTimeStepsPerPeriod) + ' time steps per period...', self.verbose, 0)
 
-        # Format data to fit the input requirements of the tsam package:
-        # (a) append the time series data from all components stored in all initialized modeling classes to a pandas
-        #     DataFrame with unique column names
-        # (b) thereby collect the weights which should be considered for each time series as well in a dictionary
-        timeSeriesData, weightDict = [], {}
-        for mdlName, mdl in self.componentModelingDict.items():
-            for compName, comp in mdl.componentsDict.items():
-                compTimeSeriesData, compWeightDict = comp.getDataForTimeSeriesAggregation()
-                if compTimeSeriesData is not None:
-                    timeSeriesData.append(compTimeSeriesData), weightDict.update(compWeightDict)
-        timeSeriesData = pd.concat(timeSeriesData, axis=1)
+        # Merge the time steps of the typical periods into segments (if specified)
+        if numberOfSegmentsPerPeriod is not None:
+            kwargs.update(segmentation=True, noSegments=numberOfSegmentsPerPeriod)
+
+        # Format data to fit the input requirements of the tsam package
+        timeSeriesData, weightDict = self.getTimeSeriesDataForClustering()
+
+        # Look up the clustering results in the cache (if a cache directory is given)
+        clusterCache, cacheKey, results = None, None, None
+        if cacheDirectory is not None:
+            clusterCache = ClusterCache(cacheDirectory, maxCacheSize)
+            cacheKey = clusterCache.getKey(timeSeriesData, weightDict, numberOfTypicalPeriods=numberOfTypicalPeriods,
+                                           numberOfTimeStepsPerPeriod=numberOfTimeStepsPerPeriod,
+                                           hoursPerTimeStep=self.hoursPerTimeStep, clusterMethod=clusterMethod,
+                                           sortValues=sortValues, **kwargs)
+            if not storeTSAinstance:
+                results = clusterCache.load(cacheKey)
+                if results is not None:
+                    utils.output('\t\tClustering results were loaded from the cache.', self.verbose, 0)
+
+        if results is None:
+            # Cluster data with tsam package
+            clusterClass = TimeSeriesAggregation(timeSeries=timeSeriesData, noTypicalPeriods=numberOfTypicalPeriods,
+                                                 hoursPerPeriod=numberOfTimeStepsPerPeriod*self.hoursPerTimeStep,
+                                                 clusterMethod=clusterMethod, sortValues=sortValues,
+                                                 weightDict=weightDict, **kwargs)
+            results = (clusterClass.clusterPeriodDict, clusterClass.clusterOrder, clusterClass.clusterPeriodIdx,
+                       clusterClass.clusterCenterIndices,
+                       clusterClass.segmentDurationDict['Segment Duration'] if kwargs.get('segmentation') else None)
+            if clusterCache is not None:
+                clusterCache.store(cacheKey, *results)
+
+            # Store time series aggregation instance in class instance
+            if storeTSAinstance:
+                self.tsaInstance = clusterClass
+
+        # Add the additional periods as typical periods
+        if additionalPeriods:
+            results = self.addTypicalPeriods(results, timeSeriesData, numberOfTimeStepsPerPeriod, additionalPeriods)
+
+        # Store the clustered time series data in the components and the time series aggregation parameters in the
+        # class instance
+        self.setClusteredTimeSeriesData(numberOfTimeStepsPerPeriod, *results)
+
+        # Set cluster flag to true (used to ensure consistently clustered time series data)
+        self.isTimeSeriesDataClustered = True
+        self.changedModelingClasses.update(self.componentModelingDict.keys())
+        utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", self.verbose, 0)
+
+    @staticmethod
+    def addTypicalPeriods(results, timeSeriesData, numberOfTimeStepsPerPeriod, periods):
+        """
+        Add (original) periods as additional typical periods to the results of a clustering, similar to extreme
+        periods which are added as new cluster centers in the tsam package. Each of these periods is assigned to its
+        new typical period (which is the period itself) instead of to the typical period of its cluster.
+
+        :param results: clustering results (clusterPeriodDict, clusterOrder, clusterPeriodIdx, clusterCenterIndices and
+            segment durations, which have to be None, cf. setClusteredTimeSeriesData).
+        :type results: tuple
+
+        :param timeSeriesData: time series data which was clustered (cf. getTimeSeriesDataForClustering).
+        :type timeSeriesData: pandas DataFrame
+
+        :param numberOfTimeStepsPerPeriod: number of time steps per period.
+        :type numberOfTimeStepsPerPeriod: strictly positive integer
+
+        :param periods: indices of the periods which are added.
+        :type periods: list of positive integers
+
+        :return: clustering results with the additional typical periods
+        :rtype: tuple
+        """
+        clusterPeriodDict, clusterOrder, clusterPeriodIdx, clusterCenterIndices, segmentDurations = results
+        clusterPeriodDict = {column: dict(values) for column, values in clusterPeriodDict.items()}
+        clusterOrder, clusterPeriodIdx = np.array(clusterOrder), list(clusterPeriodIdx)
+        for period in periods:
+            typicalPeriod = len(clusterPeriodIdx)
+            values = timeSeriesData.values[period * numberOfTimeStepsPerPeriod:
+                                           (period + 1) * numberOfTimeStepsPerPeriod]
+            for ix, column in enumerate(timeSeriesData.columns):
+                clusterPeriodDict[column].update({(typicalPeriod, t): values[t, ix]
+                                                  for t in range(numberOfTimeStepsPerPeriod)})
+            clusterOrder[period] = typicalPeriod
+            clusterPeriodIdx.append(typicalPeriod)
+            if clusterCenterIndices is not None:
+                clusterCenterIndices = list(clusterCenterIndices) + [period]
+        return clusterPeriodDict, clusterOrder, clusterPeriodIdx, clusterCenterIndices, segmentDurations
+
+    def clusterSweep(self, candidates, numberOfTimeStepsPerPeriod=24, clusterMethod='hierarchical', sortValues=True,
+                     errorMetric='RMSE', errorBudget=None, processes=None, **kwargs):
+        """
+        Cluster the time series data for several numbers of typical periods (candidates) and report the error
+        metrics of the clustered time series data for each candidate. The clustering runs are executed in a process
+        pool. If an error budget is given, the candidate with the smallest number of typical periods whose weighted
+        error metric does not exceed the budget (or, if no candidate meets the budget, the candidate with the
+        smallest error) is applied to the EnergySystemModel instance as if the cluster function had been called.
+        The time steps of the typical periods are not merged into segments (cf. numberOfSegmentsPerPeriod in cluster).
+
+        **Required arguments:**
+
+        :param candidates: numbers of typical periods which are evaluated.
+        :type candidates: list of strictly positive integers
+
+        **Default arguments:**
+
+        :param numberOfTimeStepsPerPeriod: states the number of time steps per period (cf. cluster).
+            |br| * the default value is 24
+        :type numberOfTimeStepsPerPeriod: strictly positive integer
+
+        :param clusterMethod: states the method which is used in the tsam package for clustering (cf. cluster).
+            |br| * the default value is 'hierarchical'
+        :type clusterMethod: string
+
+        :param sortValues: states if the duration curves are used for clustering (cf. cluster).
+            |br| * the default value is True
+        :type sortValues: boolean
+
+        :param errorMetric: error metric which is used for selecting a candidate ('RMSE', 'RMSE duration' or
+            'Peak error'). The error metrics are computed on the time series data normalized with the range of the
+            original values and are weighted with the same weights as in the clustering (tsaWeight).
+            |br| * the default value is 'RMSE'
+        :type errorMetric: string
+
+        :param errorBudget: maximum weighted error metric of the applied candidate. If None, no candidate is applied.
+            |br| * the default value is None
+        :type errorBudget: positive float or None
+
+        :param processes: number of processes of the process pool. If None, the number of processors of the machine
+            is used. If 1, the clustering runs are executed in the current process.
+            |br| * the default value is None
+        :type processes: strictly positive integer or None
+
+        :return: weighted error metrics of each candidate (rows) and error metrics of each time series for each
+            candidate (rows: candidate, time series)
+        :rtype: tuple (pandas DataFrame, pandas DataFrame)
+        """
+        candidates = list(candidates)
+        utils.checkClusterSweepInput(candidates, numberOfTimeStepsPerPeriod, len(self.totalTimeSteps), errorMetric,
+                                     errorBudget, processes)
+
+        timeStart = time.time()
+        utils.output('\nClustering time series data for ' + str(len(candidates)) + ' numbers of typical periods...',
+                     self.verbose, 0)
+
+        timeSeriesData, weightDict = self.getTimeSeriesDataForClustering()
+        args = [(timeSeriesData, weightDict, numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, self.hoursPerTimeStep,
+                 clusterMethod, sortValues) for numberOfTypicalPeriods in candidates]
+        if processes == 1:
+            runs = [clusterTimeSeriesData(*arg, **kwargs) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                runs = [future.result() for future in [executor.submit(clusterTimeSeriesData, *arg, **kwargs)
+                                                       for arg in args]]
+
+        errors = pd.concat([run[1] for run in runs], keys=candidates, names=['Typical periods', 'Time series'])
+        summary = pd.DataFrame([utils.getWeightedAggregationErrors(run[1]) for run in runs],
+                               index=pd.Index(candidates, name='Typical periods'))
+
+        if errorBudget is not None:
+            withinBudget = summary.index[summary[errorMetric] <= errorBudget]
+            numberOfTypicalPeriods = min(withinBudget) if len(withinBudget) > 0 else summary[errorMetric].idxmin()
+            self.setClusteredTimeSeriesData(numberOfTimeStepsPerPeriod,
+                                            *runs[candidates.index(numberOfTypicalPeriods)][0])
+            self.isTimeSeriesDataClustered = True
+            self.changedModelingClasses.update(self.componentModelingDict.keys())
+            utils.output('\t\tApplied ' + str(numberOfTypicalPeriods) + ' typical periods (' + errorMetric + ': ' +
+                         '%.4f' % summary.loc[numberOfTypicalPeriods, errorMetric] + ').', self.verbose, 0)
+
+        utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", self.verbose, 0)
+        return summary, errors
+
+    def resample(self, hoursPerTimeStep):
+        """
+        Reduce the temporal resolution of the energy system model by merging consecutive time steps of the full time
+        series data of all components. Time series which are given relative to the capacities and specific time series
+        (e.g. commodity costs) are averaged while time series which are given as absolute values for each time step are
+        summed up (cf. Component.getTimeSeriesResamplingMethod). Commodity cost and revenue time series are weighted
+        with the operation rates of their components such that the costs of a fixed operation are preserved (cf.
+        Source.getTimeSeriesResamplingWeights). In contrast to clustering, the chronology of the time series (and
+        hence of the states of charge of the storage components) is preserved. The total number of time steps and
+        the hours per time step are updated accordingly. Clustered time series data refers to the previous
+        resolution and is discarded, i.e. the cluster function has to be called again if required.
+        Components which are added afterwards have to be given in the new temporal resolution.
+
+        **Required arguments:**
+
+        :param hoursPerTimeStep: hours per time step of the new temporal resolution. It has to be an integer multiple
+            of the current hours per time step.
+        :type hoursPerTimeStep: strictly positive float
+
+        :return: error metrics of the resampled time series data with respect to the original time series data
+            (cf. utils.getAggregationErrors) with (component, time series, location) tuples as index
+        :rtype: pandas DataFrame
+        """
+        utils.checkResamplingInput(hoursPerTimeStep, self.hoursPerTimeStep, len(self.totalTimeSteps))
+        factor = int(round(hoursPerTimeStep / self.hoursPerTimeStep))
+
+        timeStart = time.time()
+        utils.output('\nResampling time series data to ' + str(hoursPerTimeStep) + ' hours per time step...',
+                     self.verbose, 0)
+
+        original, predicted = {}, {}
+        for mdl in self.componentModelingDict.values():
+            for comp in mdl.componentsDict.values():
+                compOriginal, compPredicted = comp.resampleTimeSeriesData(factor)
+                original.update(compOriginal), predicted.update(compPredicted)
+
+        # Set the temporal parameters of the new resolution (the number of years is recomputed from the new number of
+        # time steps and hours per time step, i.e. it stays the same since the time horizon is preserved)
+        self.hoursPerTimeStep = hoursPerTimeStep
+        self.setTemporalParameters(len(self.totalTimeSteps) // factor)
+
+        # Discard the time series aggregation parameters of the previous resolution
+        self.isTimeSeriesDataClustered, self.typicalPeriods, self.tsaInstance = False, None, None
+        self.clusterOrder, self.clusterCenterIndices, self.numberOfTimeStepsPerPeriod = None, None, None
+        self.segmentDurations = None
+        self.changedModelingClasses.update(self.componentModelingDict.keys())
+
+        if original:
+            errors = utils.getAggregationErrors(pd.DataFrame(original), pd.DataFrame(predicted))
+            errors.index.names = ['Component', 'Time series', 'Location']
+        else:
+            errors = pd.DataFrame(columns=['RMSE', 'RMSE duration', 'Peak error', 'Weight'])
+        utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", self.verbose, 0)
+        return errors
+
+    def setTemporalParameters(self, numberOfTimeSteps):
+        """
+        Set the temporal parameters of the full (not aggregated) time series data for a total number of time steps
+        with the current hours per time step.
+
+        :param numberOfTimeSteps: total number of time steps.
+        :type numberOfTimeSteps: strictly positive integer
+        """
+        self.totalTimeSteps = list(range(numberOfTimeSteps))
+        self.numberOfYears = numberOfTimeSteps * self.hoursPerTimeStep / 8760.0
+        self.periods, self.periodsOrder, self.periodOccurrences = [0], [0], [1]
+        self.timeStepsPerPeriod = list(range(numberOfTimeSteps))
+        self.interPeriodTimeSteps = list(range(int(len(self.totalTimeSteps) / len(self.timeStepsPerPeriod)) + 1))
+
+    def getTimeSeriesColumnRegistry(self, components=None):
+        """
+        Register the time series data of components in a column registry (cf. TimeSeriesColumnRegistry). The time
+        series data is not copied.
+
+        :param components: components whose time series data is registered. If None, all components stored in all
+            initialized modeling classes are considered.
+            |br| * the default value is None
+        :type components: list of Component instances or None
+
+        :return: column registry
+        :rtype: TimeSeriesColumnRegistry
+        """
+        registry = TimeSeriesColumnRegistry()
+        if components is None:
+            components = [comp for mdl in self.componentModelingDict.values() for comp in mdl.componentsDict.values()]
+        for comp in components:
+            comp.getDataForTimeSeriesAggregation(registry)
+        return registry
+
+    def getTimeSeriesDataForClustering(self):
+        """
+        Format the time series data to fit the input requirements of the tsam package:
+        (a) register the time series data from all components stored in all initialized modeling classes with unique
+        column names and write it to one shared array (the only copy of the data, cf. TimeSeriesColumnRegistry)
+        (b) thereby collect the weights which should be considered for each time series as well in a dictionary
+
+        :return: time series data (columns sorted by name) and weights of the time series
+        :rtype: tuple (pandas DataFrame, dictionary)
+        """
+        registry = self.getTimeSeriesColumnRegistry()
         # Note: Sets index for the time series data. The index is of no further relevance in the energy system model.
-        timeSeriesData.index = pd.date_range('2050-01-01 00:30:00', periods=len(self.totalTimeSteps),
-                                             freq=(str(self.hoursPerTimeStep) + 'H'), tz='Europe/Berlin')
-
-        # Cluster data with tsam package (the reindex_axis call is here for reproducibility of TimeSeriesAggregation
-        # call)
-        timeSeriesData = timeSeriesData.reindex_axis(sorted(timeSeriesData.columns), axis=1)
-        clusterClass = TimeSeriesAggregation(timeSeries=timeSeriesData, noTypicalPeriods=numberOfTypicalPeriods,
-                                             hoursPerPeriod=numberOfTimeStepsPerPeriod*self.hoursPerTimeStep,
-                                             clusterMethod=clusterMethod, sortValues=sortValues, weightDict=weightDict,
-                                             **kwargs)
-
-        # Convert the clustered data to a pandas DataFrame and store the respective clustered time series data in the
-        # associated components
-        data = pd.DataFrame.from_dict(clusterClass.clusterPeriodDict)
+        # The columns are sorted by name for reproducibility of the TimeSeriesAggregation call.
+        timeSeriesData = registry.getFrame(pd.date_range('2050-01-01 00:30:00', periods=len(self.totalTimeSteps),
+                                                         freq=(str(self.hoursPerTimeStep) + 'H'), tz='Europe/Berlin'))
+        return timeSeriesData, registry.weightDict
+
+    def setClusteredTimeSeriesData(self, numberOfTimeStepsPerPeriod, clusterPeriodDict, clusterOrder,
+                                   clusterPeriodIdx, clusterCenterIndices=None, segmentDurations=None):
+        """
+        Store the clustered time series data in the components and the time series aggregation parameters
+        (typical periods, order and occurrences of the periods) in the class instance.
+
+        :param numberOfTimeStepsPerPeriod: number of time steps per period.
+        :type numberOfTimeStepsPerPeriod: strictly positive integer
+
+        :param clusterPeriodDict: clustered time series data (clusterPeriodDict of a tsam TimeSeriesAggregation
+            instance).
+        :type clusterPeriodDict: dictionary
+
+        :param clusterOrder: typical period which is assigned to each period.
+        :type clusterOrder: numpy array
+
+        :param clusterPeriodIdx: indices of the typical periods.
+        :type clusterPeriodIdx: list or numpy array
+
+        :param clusterCenterIndices: indices of the periods which represent the typical periods (medoids) or None if
+            the typical periods are not represented by original periods.
+            |br| * the default value is None
+        :type clusterCenterIndices: list or None
+
+        :param segmentDurations: number of time steps of each segment of the typical periods (segmentDurationDict
+            of a tsam TimeSeriesAggregation instance with (typical period, segment) keys) or None if the time steps
+            are not merged into segments.
+            |br| * the default value is None
+        :type segmentDurations: dictionary or None
+        """
+        # Convert the clustered data to one shared array of the column registry and store views of the respective
+        # clustered time series data in the associated components (with segmentation, the tsam package additionally
+        # indexes the data by the segment durations, which is dropped)
+        data = pd.DataFrame.from_dict(clusterPeriodDict)
+        if segmentDurations is not None:
+            data.index = data.index.droplevel(2)
+        registry = self.getTimeSeriesColumnRegistry()
+        registry.setAggregatedData(data)
         for mdlName, mdl in self.componentModelingDict.items():
             for compName, comp in mdl.componentsDict.items():
-                comp.setAggregatedTimeSeriesData(data)
+                comp.setAggregatedTimeSeriesData(registry)
 
         # Store time series aggregation parameters in class instance
-        if storeTSAinstance:
-            self.tsaInstance = clusterClass
-        self.typicalPeriods = clusterClass.clusterPeriodIdx
-        self.timeStepsPerPeriod = list(range(numberOfTimeStepsPerPeriod))
-        self.periods = list(range(int(len(self.totalTimeSteps) / len(self.timeStepsPerPeriod))))
-        self.interPeriodTimeSteps = list(range(int(len(self.totalTimeSteps) / len(self.timeStepsPerPeriod)) + 1))
-        self.periodsOrder = clusterClass.clusterOrder
+        self.typicalPeriods, self.clusterOrder = clusterPeriodIdx, clusterOrder
+        self.clusterCenterIndices, self.numberOfTimeStepsPerPeriod = clusterCenterIndices, numberOfTimeStepsPerPeriod
+        self.segmentDurations = segmentDurations
+        self.setTimeSeriesAggregationParameters()
+
+    def setTimeSeriesAggregationParameters(self):
+        """
+        Set the temporal parameters (time steps per period, periods, order and occurrences of the periods) from the
+        stored results of the time series aggregation. The parameters are overwritten when an optimization problem
+        with the full temporal resolution is declared. If the time steps are merged into segments, the time steps per
+        period refer to the segments.
+        """
+        numberOfPeriods = len(self.totalTimeSteps) // self.numberOfTimeStepsPerPeriod
+        if self.segmentDurations is None:
+            self.timeStepsPerPeriod = list(range(self.numberOfTimeStepsPerPeriod))
+        else:
+            self.timeStepsPerPeriod = list(range(len(self.segmentDurations) // len(self.typicalPeriods)))
+        self.periods = list(range(numberOfPeriods))
+        self.interPeriodTimeSteps = list(range(numberOfPeriods + 1))
+        self.periodsOrder = self.clusterOrder
         self.periodOccurrences = [(self.periodsOrder == tp).sum()/self.numberOfYears for tp in self.typicalPeriods]
 
-        # Set cluster flag to true (used to ensure consistently clustered time series data)
-        self.isTimeSeriesDataClustered = True
-        utils.output("\t\t(%.4f" % (time.time() - timeStart) + " sec)\n", self.verbose, 0)
+    def aggregateComponentTimeSeriesData(self, component):
+        """
+        Aggregate the time series data of a component with the stored cluster order, i.e. without re-clustering the
+        time series data of the energy system model. If the typical periods are represented by original periods
+        (medoids, e.g. for hierarchical clustering), the values of these periods are taken and rescaled such that the
+        mean of each time series is preserved (without exceeding the range of the original values). Otherwise, the
+        value of a typical period is the mean of the values of all periods which are assigned to it. This is used for
+        components which are added after the time series data was clustered.
+
+        :param component: component whose time series data is aggregated.
+        :type component: Component instance
+        """
+        registry = self.getTimeSeriesColumnRegistry([component])
+        if not registry.columns:
+            return
+        numberOfPeriods = len(self.totalTimeSteps) // self.numberOfTimeStepsPerPeriod
+        values = registry.getArray().reshape(numberOfPeriods, self.numberOfTimeStepsPerPeriod, -1)
+        clusterOrder = np.asarray(self.clusterOrder)
+        if self.clusterCenterIndices is not None and len(self.clusterCenterIndices) == len(self.typicalPeriods):
+            data = np.stack([values[p] for p in self.clusterCenterIndices])
+            occurrences = np.array([(clusterOrder == tp).sum() for tp in self.typicalPeriods])
+            sumRaw, valuesMin, valuesMax = values.sum(axis=(0, 1)), values.min(axis=(0, 1)), values.max(axis=(0, 1))
+            for i in range(20):
+                sumTypical = np.einsum('p,pij->j', occurrences, data)
+                if np.allclose(sumTypical, sumRaw, rtol=1e-6):
+                    break
+                scale = np.divide(sumRaw, sumTypical, out=np.ones_like(sumRaw), where=sumTypical != 0)
+                data = np.clip(data * scale, valuesMin, valuesMax)
+        else:
+            data = np.stack([values[clusterOrder == tp].mean(axis=0) for tp in self.typicalPeriods])
+        # If the time steps are merged into segments, the value of a segment is the mean of its time steps
+        if self.segmentDurations is not None:
+            durations = np.array([[self.segmentDurations[tp, t] for t in self.timeStepsPerPeriod]
+                                  for tp in self.typicalPeriods])
+            data = np.stack([np.add.reduceat(data[i], np.cumsum(durations[i]) - durations[i], axis=0) /
+                             durations[i][:, None] for i in range(len(self.typicalPeriods))])
+        registry.setAggregatedData(data)
+        component.setAggregatedTimeSeriesData(registry)
+
+    def getPeriodRepresentationErrors(self):
+        """
+        Get the error with which each (original) period is represented by its typical period, i.e. the mean squared
+        deviation of the full time series data of the components from the clustered time series data of the typical
+        period. The time series are normalized with the range of their values. Without segmentation.
+
+        :return: representation errors of the periods
+        :rtype: numpy array
+        """
+        numberOfPeriods = len(self.totalTimeSteps) // self.numberOfTimeStepsPerPeriod
+        clusterOrder, errors = np.asarray(self.clusterOrder), np.zeros(numberOfPeriods)
+        for mdl in self.componentModelingDict.values():
+            for comp in mdl.componentsDict.values():
+                for name, data in comp.getFullTimeSeriesData().items():
+                    aggregated = comp.getTimeSeries('aggregated' + name[4:])
+                    if aggregated is None:
+                        continue
+                    values = data.values.reshape(numberOfPeriods, self.numberOfTimeStepsPerPeriod, -1)
+                    typicalValues = aggregated.values[:, :, [aggregated.locationIndex[loc] for loc in data.locations]]
+                    valueRange = values.max(axis=(0, 1)) - values.min(axis=(0, 1))
+                    valueRange[valueRange == 0] = 1
+                    errors += (((values - typicalValues[clusterOrder]) / valueRange) ** 2).mean(axis=(1, 2))
+        return errors
 
     def declareTimeSets(self, pyM, timeSeriesAggregation):
         """
@@ -431,6 +884,10 @@ class EnergySystemModel:
         # The inter time steps set is a set of tuples as well, which again consist of two values. The first value again
         # indicates the period, however, the second one now refers to a point in time right before or after a time step
         # (or between two time steps). Hence, the second value reaches values from (0 ... numberOfTimeStepsPerPeriod).
+        # Both sets are declared as (virtual) products of a period set and integer range sets, i.e. the tuples are
+        # neither stored nor hashed in the sets themselves and membership is checked arithmetically. Note that this
+        # only reduces the memory and the declaration time of the two sets; the variables and constraints which are
+        # indexed by them still store a (period, time step) tuple per entry.
         if not pyM.hasTSA:
             # Reset timeStepsPerPeriod in case it was overwritten by the clustering function
             self.timeStepsPerPeriod = self.totalTimeSteps
@@ -439,29 +896,56 @@ class EnergySystemModel:
             self.periods = [0]
             self.periodsOrder = [0]
             self.periodOccurrences = [1]
-
-            # Define sets
-            def initTimeSet(pyM):
-                return ((p, t) for p in self.periods for t in self.timeStepsPerPeriod)
-
-            def initInterTimeStepsSet(pyM):
-                return ((p, t) for p in self.periods for t in range(len(self.timeStepsPerPeriod) + 1))
+            periods = self.periods
         else:
+            self.setTimeSeriesAggregationParameters()
             utils.output('Time series aggregation specifications:\n'
                          'Number of typical periods:' + str(len(self.typicalPeriods)) +
                          ', number of time steps per periods:' + str(len(self.timeStepsPerPeriod)) + '\n',
                          self.verbose, 0)
-
-            # Define sets
-            def initTimeSet(pyM):
-                return ((p, t) for p in self.typicalPeriods for t in self.timeStepsPerPeriod)
-
-            def initInterTimeStepsSet(pyM):
-                return ((p, t) for p in self.typicalPeriods for t in range(len(self.timeStepsPerPeriod) + 1))
+            periods = self.typicalPeriods
 
         # Initialize sets
-        pyM.timeSet = pyomo.Set(dimen=2, initialize=initTimeSet)
-        pyM.interTimeStepsSet = pyomo.Set(dimen=2, initialize=initInterTimeStepsSet)
+        pyM.periodSet = pyomo.Set(initialize=list(periods), ordered=True)
+        pyM.timeStepsSet = pyomo.RangeSet(0, len(self.timeStepsPerPeriod) - 1)
+        pyM.interTimeStepsRangeSet = pyomo.RangeSet(0, len(self.timeStepsPerPeriod))
+        pyM.timeSet = pyM.periodSet * pyM.timeStepsSet
+        pyM.interTimeStepsSet = pyM.periodSet * pyM.interTimeStepsRangeSet
+
+        # Set the durations of the time steps (number of original time steps per time step, which is only larger than
+        # one if the time steps of the typical periods are merged into segments) in the order of the time set and the
+        # starts of the time steps (number of original time steps before a point in time of the inter time steps set)
+        segmentDurations = self.segmentDurations if pyM.hasTSA else None
+        pyM.timeStepDurations = {(p, t): 1 if segmentDurations is None else segmentDurations[p, t]
+                                 for p in periods for t in range(len(self.timeStepsPerPeriod))}
+        pyM.timeStepStarts = {}
+        for p in periods:
+            start = 0
+            for t in range(len(self.timeStepsPerPeriod)):
+                pyM.timeStepStarts[p, t], start = start, start + pyM.timeStepDurations[p, t]
+            pyM.timeStepStarts[p, len(self.timeStepsPerPeriod)] = start
+
+    def getTimeStepMap(self):
+        """
+        Get the time steps of the declared optimization problem which represent the time steps of the full time
+        horizon, e.g. to expand the optimal values of an optimization problem with clustered time series data to the
+        full time horizon (cf. optimize). Without time series aggregation, the time steps are mapped to themselves.
+
+        :return: (period index, period, time step) tuples for each time step of the full time horizon (the period
+            index refers to the periods of the full time horizon, the period to the typical period which represents
+            it and the time step to the time step or segment within the typical period)
+        :rtype: list
+        """
+        if not self.pyM.hasTSA:
+            return [(0, 0, t) for t in range(len(self.pyM.timeStepsSet))]
+        timeStepMap, starts = [], self.pyM.timeStepStarts
+        for k, p in enumerate(self.periodsOrder):
+            t = 0
+            for timeStep in range(self.numberOfTimeStepsPerPeriod):
+                while starts[p, t + 1] <= timeStep:
+                    t += 1
+                timeStepMap.append((k, p, t))
+        return timeStepMap
 
     def declareSharedPotentialConstraints(self, pyM):
         """
@@ -489,7 +973,7 @@ class EnergySystemModel:
         # <= 100%. For this, get the contributions to the shared potential for the corresponding ID and
         # location from each modeling class.
         def sharedPotentialConstraint(pyM, ID, loc):
-            return sum(mdl.getSharedPotentialContribution(pyM, ID, loc)
+            return sum(mdl.getSharedPotentialContribution(getattr(pyM, mdl.abbrvName), ID, loc)
                        for mdl in self.componentModelingDict.values()) <= 1
         pyM.ConstraintSharedPotentials = \
             pyomo.Constraint(pyM.sharedPotentialDict.keys(), rule=sharedPotentialConstraint)
@@ -504,20 +988,56 @@ class EnergySystemModel:
         """
         utils.output('Declaring commodity balances...', self.verbose, 0)
 
+        # Build the commodity balance incidence once per model. It maps each location and commodity to the operation
+        # variables (with their location-component index and their coefficient) which contribute to the respective
+        # commodity balance (cf. ComponentModel.getCommodityBalanceIncidence). Modeling classes which do not provide
+        # an incidence contribute to the commodity balances via their getCommodityBalanceContribution function.
+        incidence, otherMdls = {}, []
+        for mdl in self.componentModelingDict.values():
+            mdlIncidence = mdl.getCommodityBalanceIncidence(getattr(pyM, mdl.abbrvName))
+            if mdlIncidence is None:
+                otherMdls.append(mdl)
+                continue
+            for key, terms in mdlIncidence.items():
+                incidence.setdefault(key, []).extend(terms)
+        for mdl in otherMdls:
+            for loc in self.locations:
+                for commod in self.commodities:
+                    if mdl.hasOpVariablesForLocationCommodity(self, loc, commod):
+                        incidence.setdefault((loc, commod), [])
+        pyM.commodityBalanceIncidence = incidence
+
         # Declare and initialize a set that states for which location and commodity the commodity balance constraints
         # are non-trivial (i.e. not 0 == 0; trivial constraints raise errors in pyomo).
         def initLocationCommoditySet(pyM):
             return ((loc, commod) for loc in self.locations for commod in self.commodities
-                    if any([mdl.hasOpVariablesForLocationCommodity(self, loc, commod)
-                            for mdl in self.componentModelingDict.values()]))
+                    if (loc, commod) in incidence)
         pyM.locationCommoditySet = pyomo.Set(dimen=2, initialize=initLocationCommoditySet)
 
         # Declare and initialize commodity balance constraints by checking for each location and commodity in the
         # locationCommoditySet and for each period and time step within the period if the commodity source and sink
-        # terms add up to zero. For this, get the contribution to commodity balance from each modeling class.
+        # terms add up to zero. For this, the terms listed in the commodity balance incidence are only indexed with
+        # the period and time step.
+        coefficients = {key: [coef for var, index, coef in terms] for key, terms in incidence.items()}
+
+        # If the optimization problem is directly written to a file, the rows are passed to the problem writer
+        # without declaring pyomo constraints (cf. writeOptimizationProblem)
+        writer = getattr(pyM, 'problemWriter', None)
+        if writer is not None and not otherMdls:
+            for loc, commod in pyM.locationCommoditySet:
+                terms = incidence[loc, commod]
+                for p, t in pyM.timeSet:
+                    writer.addRow([writer.getColumn(var[index + (p, t)]) for var, index, coef in terms],
+                                  coefficients[loc, commod], '==', 0)
+            return
+
         def commodityBalanceConstraint(pyM, loc, commod, p, t):
-            return sum(mdl.getCommodityBalanceContribution(pyM, commod, loc, p, t)
-                       for mdl in self.componentModelingDict.values()) == 0
+            balance = LinearExpression(constant=0, linear_coefs=list(coefficients[loc, commod]),
+                                       linear_vars=[var[index + (p, t)] for var, index, coef in incidence[loc, commod]])
+            if otherMdls:
+                balance = balance + sum(mdl.getCommodityBalanceContribution(getattr(pyM, mdl.abbrvName), commod,
+                                                                            loc, p, t) for mdl in otherMdls)
+            return balance == 0
         pyM.commodityBalanceConstraint = pyomo.Constraint(pyM.locationCommoditySet, pyM.timeSet,
                                                           rule=commodityBalanceConstraint)
 
@@ -534,19 +1054,28 @@ class EnergySystemModel:
         utils.output('Declaring objective function...', self.verbose, 0)
 
         def objective(pyM):
-            TAC = sum(mdl.getObjectiveFunctionContribution(self, pyM) for mdl in self.componentModelingDict.values())
+            TAC = sum(mdl.getObjectiveFunctionContribution(self, getattr(pyM, mdl.abbrvName))
+                      for mdl in self.componentModelingDict.values())
             return TAC
         pyM.Obj = pyomo.Objective(rule=objective)
 
-    def declareOptimizationProblem(self, timeSeriesAggregation=False):
+    def declareOptimizationProblem(self, timeSeriesAggregation=False, buildBackend='rules', useVariableBounds=False,
+                                   useMutableParameters=False, problemWriter=None, rebuildChangedOnly=False,
+                                   profileBuild=False):
         """
         Declare the optimization problem belonging to the specified energy system for which a pyomo concrete model
         instance is built and filled with
         * basic time sets,
-        * sets, variables and constraints contributed by the component modeling classes,
+        * sets, variables and constraints contributed by the component modeling classes (each modeling class is
+        declared in its own pyomo Block, e.g. pyM.stor for the StorageModel),
         * basic, component overreaching constraints, and
         * an objective function.
 
+        For each declared pyomo component (i.e. each set, variable and constraint family), the declaration time and
+        the number of rows and variables are stored in a build profile (pandas DataFrame) in
+        solverSpecs['buildProfile']. The time of a component includes the preparation of its data since the previous
+        component was declared.
+
         **Default arguments:**
 
         :param timeSeriesAggregation: states if the optimization of the energy system model should be done with
@@ -555,6 +1084,52 @@ class EnergySystemModel:
             |br| * the default value is False
         :type timeSeriesAggregation: boolean
 
+        :param buildBackend: states how the operation mode constraints of the components are built:
+            (a) with one pyomo rule callback per location, component and time step ('rules') or
+            (b) from NumPy arrays of the operation rate time series, which are computed once per constraint and
+            only looked up by the pyomo rule ('arrays'). Both options result in the same optimization problem,
+            which is declared as standard pyomo constraints and can be written and solved by all pyomo solvers.
+            |br| * the default value is 'rules'
+        :type buildBackend: string ('rules' or 'arrays')
+
+        :param useVariableBounds: states if fixed and maximum operation rates of components without a capacity
+            variable as well as fixed capacities and fixed design decisions are modeled
+            (a) as constraints (False) or
+            (b) as bounds of the respective variables, respectively by fixing the variables (True).
+            Option (b) results in a considerably smaller optimization problem. However, no dual values are
+            available for these restrictions.
+            |br| * the default value is False
+        :type useVariableBounds: boolean
+
+        :param useMutableParameters: states if the capacity bounds, the fixed capacities, the operation rate time
+            series and the yearly commodity limits are stored in mutable pyomo parameters (respectively in variable
+            bounds) such that they can be changed in the declared optimization problem with the updateComponentData
+            function (True) or not (False).
+            |br| * the default value is False
+        :type useMutableParameters: boolean
+
+        :param problemWriter: if specified, the optimization problem is directly written to a file by the problem
+            writer (cf. writeOptimizationProblem). The pyomo model then only keeps the sets, variables and the
+            objective function.
+            |br| * the default value is None
+        :type problemWriter: ProblemWriter instance or None
+
+        :param rebuildChangedOnly: states if the whole optimization problem is declared anew (False) or if only the
+            Blocks of the modeling classes whose components were added since the last declaration (e.g. by
+            overwriting a storage component with modified parameters) as well as the component overreaching
+            constraints and the objective function are rebuilt (True). The optimization problem is declared anew
+            if no optimization problem with the same arguments was declared before, if the time series data was
+            clustered since then or if a problemWriter is specified. Note: changes of components which are not
+            passed to the add function of the EnergySystemModel instance are not detected.
+            |br| * the default value is False
+        :type rebuildChangedOnly: boolean
+
+        :param profileBuild: states if the number of nonzeros and the peak memory allocated during the declaration
+            of each pyomo component are recorded in the build profile as well (True). Recording these statistics
+            considerably slows down the declaration of the optimization problem.
+            |br| * the default value is False
+        :type profileBuild: boolean
+
         Last edited: November 10, 2018
         |br| @author: Lara Welder
         """
@@ -562,34 +1137,87 @@ class EnergySystemModel:
         timeStart = time.time()
 
         # Check correctness of inputs
-        utils.checkDeclareOptimizationProblemInput(timeSeriesAggregation, self.isTimeSeriesDataClustered)
+        utils.checkDeclareOptimizationProblemInput(timeSeriesAggregation, self.isTimeSeriesDataClustered,
+                                                   buildBackend, useVariableBounds, useMutableParameters,
+                                                   rebuildChangedOnly, profileBuild)
+        profiler = utils.BuildProfiler(profileBuild)
+
+        # Check if the declared optimization problem can be kept and only the Blocks of the changed modeling classes
+        # have to be rebuilt
+        declarationSpecs = {'hasTSA': timeSeriesAggregation, 'buildBackend': buildBackend,
+                            'useVariableBounds': useVariableBounds, 'useMutableParameters': useMutableParameters,
+                            'problemWriter': problemWriter}
+        changedMdls = [key for key in self.componentModelingDict if key in self.changedModelingClasses]
+        rebuildChangedOnly = rebuildChangedOnly and self.pyM is not None and problemWriter is None and \
+            len(changedMdls) < len(self.componentModelingDict) and \
+            all(getattr(self.pyM, name, None) == value for name, value in declarationSpecs.items())
 
         ################################################################################################################
         #                           Initialize mathematical model (ConcreteModel) instance                             #
         ################################################################################################################
 
-        # Initialize a pyomo ConcreteModel which will be used to store the mathematical formulation of the model.
-        # The ConcreteModel instance is stored in the EnergySystemModel instance, which makes it available for
-        # post-processing or debugging. A pyomo Suffix with the name dual is declared to make dual values associated
-        # to the model's constraints available after optimization.
-        self.pyM = pyomo.ConcreteModel()
-        pyM = self.pyM
-        pyM.dual = pyomo.Suffix(direction=pyomo.Suffix.IMPORT)
-
-        # Set time sets for the model instance
-        self.declareTimeSets(pyM, timeSeriesAggregation)
+        if rebuildChangedOnly:
+            # Remove the Blocks of the changed modeling classes as well as the component overreaching constraints
+            # and the objective function from the declared pyomo ConcreteModel
+            pyM = self.pyM
+            pyM.buildProfiler = profiler
+            utils.output('Rebuilding the optimization problem for ' + ', '.join(changedMdls), self.verbose, 0)
+            for key in changedMdls:
+                if hasattr(pyM, self.componentModelingDict[key].abbrvName):
+                    pyM.del_component(self.componentModelingDict[key].abbrvName)
+            for name in ['Obj', 'ConstraintSharedPotentials', 'ConstraintSharedPotentials_index',
+                         'commodityBalanceConstraint', 'commodityBalanceConstraint_index', 'locationCommoditySet']:
+                if hasattr(pyM, name):
+                    pyM.del_component(name)
+            pyM.dual.clear_all_values()
+
+            # Select the time series data of the (added) components
+            for mdl in self.componentModelingDict.values():
+                for comp in mdl.componentsDict.values():
+                    comp.setTimeSeriesData(pyM.hasTSA)
+        else:
+            # Initialize a pyomo ConcreteModel which will be used to store the mathematical formulation of the model.
+            # The ConcreteModel instance is stored in the EnergySystemModel instance, which makes it available for
+            # post-processing or debugging. A pyomo Suffix with the name dual is declared to make dual values
+            # associated to the model's constraints available after optimization.
+            self.pyM = ProfiledConcreteModel()
+            pyM = self.pyM
+            pyM.dual = pyomo.Suffix(direction=pyomo.Suffix.IMPORT)
+            pyM.buildProfiler = profiler
+
+            # Store the information how the operation mode constraints should be built, if variable bounds should be
+            # used instead of constraints where possible and if mutable parameters should be used in the pyomo model
+            # instance
+            pyM.buildBackend, pyM.useVariableBounds = buildBackend, useVariableBounds
+            pyM.useMutableParameters = useMutableParameters
+            pyM.problemWriter = problemWriter
+
+            # Set time sets for the model instance
+            self.declareTimeSets(pyM, timeSeriesAggregation)
+            changedMdls = list(self.componentModelingDict.keys())
 
         ################################################################################################################
         #                         Declare component specific sets, variables and constraints                           #
         ################################################################################################################
 
-        for key, mdl in self.componentModelingDict.items():
+        # The sets, variables and constraints of each modeling class are declared in a separate pyomo Block which is
+        # named after the abbreviation of the modeling class (e.g. pyM.srcSnk)
+        for key in changedMdls:
             _t = time.time()
+            profiler.startSection(key)
+            mdl = self.componentModelingDict[key]
+            setattr(pyM, mdl.abbrvName, ModelingClassBlock())
+            block = getattr(pyM, mdl.abbrvName)
             utils.output('Declaring sets, variables and constraints for ' + key, self.verbose, 0)
-            utils.output('\tdeclaring sets... ', self.verbose, 0), mdl.declareSets(self, pyM)
-            utils.output('\tdeclaring variables... ', self.verbose, 0), mdl.declareVariables(self, pyM)
-            utils.output('\tdeclaring constraints... ', self.verbose, 0), mdl.declareComponentConstraints(self, pyM)
+            utils.output('\tdeclaring sets... ', self.verbose, 0), mdl.declareSets(self, block)
+            utils.output('\tdeclaring variables... ', self.verbose, 0), mdl.declareVariables(self, block)
+            if problemWriter is not None:
+                problemWriter.registerVariables(pyM)
+            utils.output('\tdeclaring constraints... ', self.verbose, 0), mdl.declareComponentConstraints(self, block)
+            if problemWriter is not None:
+                problemWriter.writeConstraints(pyM)
             utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
+        self.changedModelingClasses = set()
 
         ################################################################################################################
         #                              Declare cross-componential sets and constraints                                 #
@@ -597,12 +1225,17 @@ class EnergySystemModel:
 
         # Declare constraints for enforcing shared capacities
         _t = time.time()
+        profiler.startSection('EnergySystemModel')
         self.declareSharedPotentialConstraints(pyM)
+        if problemWriter is not None:
+            problemWriter.writeConstraints(pyM)
         utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
         # Declare commodity balance constraints (one balance constraint for each commodity, location and time step)
         _t = time.time()
         self.declareCommodityBalanceConstraints(pyM)
+        if problemWriter is not None:
+            problemWriter.writeConstraints(pyM)
         utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
         ################################################################################################################
@@ -612,13 +1245,120 @@ class EnergySystemModel:
         # Declare objective function by obtaining the contributions to the objective function from all modeling classes
         _t = time.time()
         self.declareObjective(pyM)
+        if problemWriter is not None:
+            problemWriter.writeObjective(pyM)
         utils.output('\t\t(%.4f' % (time.time() - _t) + ' sec)\n', self.verbose, 0)
 
-        # Store the build time of the optimize function call in the EnergySystemModel instance
+        # Store the build time of the optimize function call and the build profile in the EnergySystemModel instance
         self.solverSpecs['buildtime'] = time.time() - timeStart
+        pyM.buildProfiler = None
+        profiler.stop()
+        self.solverSpecs['buildProfile'] = profiler.getProfile()
+
+    def updateComponentData(self, componentName, **params):
+        """
+        Update parameters of a component and push the new values into the declared optimization problem without
+        rebuilding it. The optimization problem has to be declared with useMutableParameters=True. Afterwards, the
+        updated optimization problem can be solved by calling the optimize function with
+        declaresOptimizationProblem=False.
+
+        Parameters which can be updated are\n
+        * the capacity bounds and fixed capacities (capacityMin, capacityMax, capacityFix),\n
+        * the operation rate time series (e.g. operationRateMax, operationRateFix, chargeOpRateMax) if the
+          optimization problem was declared without time series aggregation and\n
+        * the yearlyLimit of Source and Sink components (for all components with the same commodityLimitID).\n
+        Parameters which are None can not be set and given parameters can not be set to None since this changes the
+        structure of the optimization problem.
+
+        **Required arguments:**
+
+        :param componentName: name of the component which should be updated
+        :type componentName: string
+
+        :param params: new parameter values with the parameter names as keywords.
+            Example: esM.updateComponentData('Wind turbines', capacityMax=capacityMax, operationRateMax=profile)
+        """
+        if self.pyM is None or not getattr(self.pyM, 'useMutableParameters', False):
+            raise ValueError('Component data can only be updated if the optimization problem was declared with ' +
+                             'useMutableParameters=True.')
+        component = self.getComponent(componentName)
+        component.updateParameters(self, params)
+        mdl = self.componentModelingDict[self.componentNames[componentName]]
+        mdl.updateComponentData(self, getattr(self.pyM, mdl.abbrvName), componentName, list(params.keys()))
+
+    def writeOptimizationProblem(self, fileName, fileFormat='lp', mappingFileName=None, timeSeriesAggregation=False,
+                                 useVariableBounds=False):
+        """
+        Write the optimization problem of the energy system directly to an LP (CPLEX LP format) or a (free) MPS
+        file, e.g. for solving it with an external solver. Additionally, a mapping file is written which assigns the
+        columns of the file to the variables of the model. The solution of the solver can then be read back with the
+        readOptimizationSolution function.
+
+        In contrast to the optimize function, the operation mode constraints and the commodity balances are passed
+        from their coefficient arrays directly to the file without building pyomo constraints. The remaining
+        constraints are built with pyomo one modeling class at a time and are removed from the pyomo model after
+        they are written. Hence, the pyomo model (pyM) only keeps the sets, the variables and the objective function.
+
+        **Required arguments:**
+
+        :param fileName: name of the LP or MPS file.
+        :type fileName: string
+
+        **Default arguments:**
+
+        :param fileFormat: format of the file ('lp' or 'mps').
+            |br| * the default value is 'lp'
+        :type fileFormat: string
+
+        :param mappingFileName: name of the mapping file (JSON). If None, the file name with the ending '.map.json'
+            is used.
+            |br| * the default value is None
+        :type mappingFileName: string or None
+
+        :param timeSeriesAggregation: states if the optimization problem is declared with the full time series (False)
+            or with clustered time series data (True).
+            |br| * the default value is False
+        :type timeSeriesAggregation: boolean
+
+        :param useVariableBounds: states if restrictions are modeled as variable bounds where possible (cf.
+            declareOptimizationProblem).
+            |br| * the default value is False
+        :type useVariableBounds: boolean
+        """
+        utils.checkWriteOptimizationProblemInput(fileName, fileFormat, mappingFileName)
+        writer = ProblemWriter(fileName, fileFormat, mappingFileName)
+        self.declareOptimizationProblem(timeSeriesAggregation=timeSeriesAggregation, buildBackend='arrays',
+                                        useVariableBounds=useVariableBounds, problemWriter=writer)
+        writer.close()
+        utils.output('Optimization problem written to ' + fileName + ' (' + str(len(writer.variables)) +
+                     ' columns, ' + str(writer.numberOfRows) + ' rows).', self.verbose, 0)
+
+    def readOptimizationSolution(self, solution, mappingFileName):
+        """
+        Read the solution of an optimization problem which was written with the writeOptimizationProblem function
+        and post-process it like the optimize function does. The optimization problem has to be declared with the
+        same settings as when it was written (this is the case directly after calling writeOptimizationProblem).
+
+        **Required arguments:**
+
+        :param solution: name of a solution file in which each line lists a column name (x0, x1, ...) followed by
+            its value (e.g. the solution files of Gurobi, CPLEX, HiGHS or CBC) or a dictionary with the column names
+            as keys and the values of the columns as values.
+        :type solution: string or dict
+
+        :param mappingFileName: name of the mapping file which was written with the optimization problem.
+        :type mappingFileName: string
+        """
+        if self.pyM is None:
+            raise TypeError('The optimization problem is not declared yet. Call the writeOptimizationProblem or the '
+                            'declareOptimizationProblem function first.')
+        readSolution(self.pyM, solution, mappingFileName)
+        for key, mdl in self.componentModelingDict.items():
+            mdl.setOptimalValues(self, getattr(self.pyM, mdl.abbrvName))
 
     def optimize(self, declaresOptimizationProblem=True, timeSeriesAggregation=False, logFileName='', threads=3,
-                 solver='gurobi', timeLimit=None, optimizationSpecs='', warmstart=False):
+                 solver='gurobi', timeLimit=None, optimizationSpecs='', warmstart=False, buildBackend='rules',
+                 useVariableBounds=False, useMutableParameters=False, rebuildChangedOnly=False, profileBuild=False):
         """
         Optimize the specified energy system for which a pyomo ConcreteModel instance is built or called upon.
         A pyomo instance is optimized with the specified inputs, and the optimization results are further
@@ -647,14 +1387,20 @@ class EnergySystemModel:
         :type logFileName: string
 
         :param threads: number of computational threads used for solving the optimization (solver dependent
-            input) if gurobi is used as the solver. A value of 0 results in using all available threads. If
-            a value larger than the available number of threads are chosen, the value will reset to the maximum
-            number of threads.
+            input) if gurobi or the in-memory HiGHS interface ('highs_inmemory') is used as the solver. A value
+            of 0 results in using all available threads (gurobi) respectively in the HiGHS default. If a value
+            larger than the available number of threads are chosen, the value will reset to the maximum number
+            of threads.
             |br| * the default value is 3
         :type threads: positive integer
 
         :param solver: specifies which solver should solve the optimization problem (which of course has to be
-            installed on the machine on which the model is run).
+            installed on the machine on which the model is run). If 'highs_inmemory' is specified, the optimization
+            problem is passed to HiGHS in memory via the highspy python package without writing and reading files
+            and the optimal values (and, if the model has an importing dual suffix, the dual values) are read
+            directly into the pyomo model (cf. IOManagement.inMemorySolver). The same holds for the direct and
+            persistent pyomo solver interfaces (e.g. 'gurobi_direct', 'gurobi_persistent' or, in newer pyomo
+            versions, 'appsi_highs'). Other solver names (e.g. 'highs') are passed to pyomo's SolverFactory.
             |br| * the default value is 'gurobi'
         :type solver: string
 
@@ -672,26 +1418,75 @@ class EnergySystemModel:
         :type timeLimit: string
 
         :param warmstart: specifies if a warm start of the optimization should be considered
-            (not always supported by the solvers).
+            (not always supported by the solvers). If an energy system model with the same components and time
+            horizon is given whose optimization problem was optimized (e.g. with clustered time series data), the
+            variables are initialized with its optimal values before the optimization with the full time series data.
+            The optimal values of the operation variables are expanded to the full time horizon and the state of
+            charge of storage components is reconstructed from the inter- and intra-period states of charge (cf.
+            getTimeStepMap and ComponentModel.setWarmstartValues). The energy system model can be this one.
+            |br| * the default value is False
+        :type warmstart: boolean or EnergySystemModel instance
+
+        :param buildBackend: states how the operation mode constraints of the components are built if the
+            optimization problem is declared ('rules' or 'arrays', cf. declareOptimizationProblem).
+            |br| * the default value is 'rules'
+        :type buildBackend: string ('rules' or 'arrays')
+
+        :param useVariableBounds: states if restrictions which only bound single variables are modeled as variable
+            bounds instead of constraints if the optimization problem is declared (cf. declareOptimizationProblem).
+            |br| * the default value is False
+        :type useVariableBounds: boolean
+
+        :param useMutableParameters: states if mutable parameters are used if the optimization problem is declared
+            (cf. declareOptimizationProblem and updateComponentData).
+            |br| * the default value is False
+        :type useMutableParameters: boolean
+
+        :param rebuildChangedOnly: states if only the parts of the optimization problem which belong to changed
+            modeling classes are rebuilt if the optimization problem is declared (cf. declareOptimizationProblem).
+            |br| * the default value is False
+        :type rebuildChangedOnly: boolean
+
+        :param profileBuild: states if the number of nonzeros and the peak memory of each pyomo component are
+            recorded in the build profile if the optimization problem is declared (cf. declareOptimizationProblem).
             |br| * the default value is False
-        :type warmstart: boolean
+        :type profileBuild: boolean
 
         Last edited: August 10, 2018
         |br| @author: Lara Welder
         """
+        # Get the optimal values of the energy system model which is used for a warm start before the optimization
+        # problem is declared (since it can be this energy system model)
+        warmstartValues = None
+        if isinstance(warmstart, EnergySystemModel):
+            utils.checkWarmstartModel(self, warmstart, timeSeriesAggregation)
+            warmstartValues, warmstart = (warmstart.pyM, warmstart.getTimeStepMap()), True
+
+        # Check that the in-memory HiGHS interface is available before the optimization problem is declared (such that
+        # the optimal values of a previous optimization are kept otherwise)
+        if solver == 'highs_inmemory':
+            checkHighsAvailability()
+
         if declaresOptimizationProblem:
-            self.declareOptimizationProblem(timeSeriesAggregation=timeSeriesAggregation)
+            self.declareOptimizationProblem(timeSeriesAggregation=timeSeriesAggregation, buildBackend=buildBackend,
+                                            useVariableBounds=useVariableBounds,
+                                            useMutableParameters=useMutableParameters,
+                                            rebuildChangedOnly=rebuildChangedOnly, profileBuild=profileBuild)
         else:
             if self.pyM is None:
                 raise TypeError('The optimization problem is not declared yet. Set the argument declaresOptimization'
                                 ' problem to True or call the declareOptimizationProblem function first.')
+            if self.pyM.problemWriter is not None:
+                raise TypeError('The optimization problem was written to a file and can not be solved with pyomo. '
+                                'Set the argument declaresOptimizationProblem to True.')
 
         # Get starting time of the optimization to, later on, obtain the total run time of the optimize function call
         timeStart = time.time()
 
         # Check correctness of inputs
         utils.checkOptimizeInput(timeSeriesAggregation, self.isTimeSeriesDataClustered, logFileName, threads, solver,
-                                 timeLimit, optimizationSpecs, warmstart)
+                                 timeLimit, optimizationSpecs, warmstart, buildBackend, useVariableBounds,
+                                 useMutableParameters, rebuildChangedOnly, profileBuild)
 
         # Store keyword arguments in the EnergySystemModel instance
         self.solverSpecs['logFileName'], self.solverSpecs['threads'] = logFileName, threads
@@ -702,22 +1497,34 @@ class EnergySystemModel:
         #                                  Solve the specified optimization problem                                    #
         ################################################################################################################
 
-        # Set which solver should solve the specified optimization problem
-        optimizer = opt.SolverFactory(solver)
+        # Initialize the variables with the optimal values of the energy system model which is used for a warm start
+        if warmstartValues is not None:
+            sourcePyM, timeStepMap = warmstartValues
+            for mdl in self.componentModelingDict.values():
+                mdl.setWarmstartValues(getattr(self.pyM, mdl.abbrvName), getattr(sourcePyM, mdl.abbrvName),
+                                       timeStepMap)
+
+        # Set which solver should solve the specified optimization problem (cf. inMemorySolver for 'highs_inmemory')
+        optimizer = opt.SolverFactory(solver) if solver != 'highs_inmemory' else None
 
         # Set, if specified, the time limit
         if self.solverSpecs['timeLimit'] is not None and solver == 'gurobi':
             optimizer.options['timelimit'] = timeLimit
 
         # Set the specified solver options
-        if 'LogToConsole=' not in optimizationSpecs:
+        if 'LogToConsole=' not in optimizationSpecs and solver != 'highs_inmemory':
             if self.verbose == 2:
                 optimizationSpecs += ' LogToConsole=0'
 
         # Solve optimization problem. The optimization solve time is stored and the solver information is printed.
-        if solver=='gurobi':
+        if solver == 'highs_inmemory':
+            solver_info = solveHighs(self.pyM, threads=threads, timeLimit=timeLimit, logFileName=logFileName,
+                                     optimizationSpecs=optimizationSpecs, warmstart=warmstart, tee=self.verbose < 2)
+        elif solver=='gurobi':
             optimizer.set_options('Threads=' + str(threads) + ' logfile=' + logFileName + ' ' + optimizationSpecs)
             solver_info = optimizer.solve(self.pyM, warmstart=warmstart, tee=True)
+        elif warmstart and optimizer.warm_start_capable():
+            solver_info = optimizer.solve(self.pyM, warmstart=warmstart, tee=True)
         else:
             solver_info = optimizer.solve(self.pyM, tee=True)
         self.solverSpecs['solvetime'] = time.time() - timeStart
@@ -753,7 +1560,7 @@ class EnergySystemModel:
             w = str(len(max(self.componentModelingDict.keys()))+6)
             for key, mdl in self.componentModelingDict.items():
                 __t = time.time()
-                mdl.setOptimalValues(self, self.pyM)
+                mdl.setOptimalValues(self, getattr(self.pyM, mdl.abbrvName))
                 outputString = ('for {:' + w + '}').format(key + ' ...') + "(%.4f" % (time.time() - __t) + "sec)"
                 utils.output(outputString, self.verbose, 0)
 
@@ -761,3 +1568,257 @@ class EnergySystemModel:
 
         # Store the runtime of the optimize function call in the EnergySystemModel instance
         self.solverSpecs['runtime'] = self.solverSpecs['buildtime'] + time.time() - timeStart
+
+    def optimizeDesignAndDispatch(self, **kwargs):
+        """
+        Optimize the design of the energy system with the clustered time series data and its operation (dispatch)
+        with the full time series data. First, the optimization problem is optimized with the clustered time series
+        data (cf. cluster). Then, the optimization problem is declared with the full time series data, its design
+        variables (capacities, numbers of installed components and binary design decision variables) are fixed to
+        the optimal values of the first optimization and it is optimized. Since fixed variables are not passed to the
+        solver, the second optimization problem is a linear program. The optimization results which are stored in
+        the modeling classes are the ones of the second optimization.
+
+        :param kwargs: keyword arguments of the optimize function (except declaresOptimizationProblem and
+            timeSeriesAggregation) which are used for both optimizations.
+
+        :return: objective function values of the design and the dispatch optimization and the absolute and relative
+            gap between them (NaN if the dispatch optimization problem has no solution)
+        :rtype: pandas Series
+        """
+        if 'declaresOptimizationProblem' in kwargs or 'timeSeriesAggregation' in kwargs:
+            raise TypeError('The declaresOptimizationProblem and timeSeriesAggregation parameters are set by the '
+                            'optimizeDesignAndDispatch function.')
+        declarationArgs = {key: kwargs[key] for key in ['buildBackend', 'useVariableBounds', 'useMutableParameters',
+                                                        'rebuildChangedOnly', 'profileBuild'] if key in kwargs}
+
+        # Optimize the design with the clustered time series data
+        utils.output('Optimizing the design with the clustered time series data...', self.verbose, 0)
+        self.optimize(timeSeriesAggregation=True, **kwargs)
+        designObjective = pyomo.value(self.pyM.Obj, exception=False)
+        designVariableValues = {key: mdl.getDesignVariableValues(getattr(self.pyM, mdl.abbrvName))
+                                for key, mdl in self.componentModelingDict.items()}
+        if designObjective is None or any(value is None for values in designVariableValues.values()
+                                          for varValues in values.values() for value in varValues.values()):
+            raise ValueError('The optimization with the clustered time series data did not yield a solution.')
+
+        # Optimize the dispatch with the full time series data and the fixed design variables
+        utils.output('Optimizing the dispatch with the full time series data...', self.verbose, 0)
+        self.declareOptimizationProblem(timeSeriesAggregation=False, **declarationArgs)
+        for key, mdl in self.componentModelingDict.items():
+            mdl.fixDesignVariables(getattr(self.pyM, mdl.abbrvName), designVariableValues[key])
+        self.optimize(declaresOptimizationProblem=False, timeSeriesAggregation=False,
+                      **{key: value for key, value in kwargs.items() if key not in declarationArgs})
+        dispatchObjective = pyomo.value(self.pyM.Obj, exception=False)
+        dispatchObjective = np.nan if dispatchObjective is None else dispatchObjective
+
+        gap = dispatchObjective - designObjective
+        return pd.Series([designObjective, dispatchObjective, gap,
+                          gap / abs(designObjective) if designObjective != 0 else np.nan],
+                         index=['designObjective', 'dispatchObjective', 'gap', 'relativeGap'])
+
+    def optimizeRollingHorizon(self, windowLength, overlap=0, **kwargs):
+        """
+        Optimize the operation of the energy system with the full time series data in consecutive time windows
+        (rolling horizon) instead of in one optimization problem, such that the size of the optimization problem is
+        bounded by the window length. The capacities (and binary design decisions) of all components have to be fixed.
+        The windows start every windowLength - overlap time steps. The results of the last overlap time steps of a
+        window are discarded and the state of charge of the storage components at the end of the remaining time steps
+        is handed over as the initial state of charge of the next window. In the first window, the state of charge at
+        the end of the window has to be the same as at its beginning. In the last window, the state of charge at the
+        end of the window has to be the same as at the beginning of the first window (cf. cyclic state of charge).
+        The optimal values of the operation variables of the windows are stitched together in the modeling classes
+        (e.g. operationVariablesOptimum) while the pyomo ConcreteModel instance and the optimization summaries refer
+        to the last window.
+
+        **Required arguments:**
+
+        :param windowLength: number of time steps of a time window.
+        :type windowLength: strictly positive integer
+
+        **Default arguments:**
+
+        :param overlap: number of time steps at the end of a time window which are optimized again in the next
+            window.
+            |br| * the default value is 0
+        :type overlap: positive integer (smaller than the windowLength)
+
+        :param kwargs: keyword arguments of the optimize function (except declaresOptimizationProblem,
+            timeSeriesAggregation and rebuildChangedOnly) which are used for the optimization of each window.
+
+        :return: objective function values of the windows with the first time steps of the windows as index
+        :rtype: pandas Series
+        """
+        if any(key in kwargs for key in ['declaresOptimizationProblem', 'timeSeriesAggregation', 'rebuildChangedOnly']):
+            raise TypeError('The declaresOptimizationProblem, timeSeriesAggregation and rebuildChangedOnly parameters '
+                            'are set by the optimizeRollingHorizon function.')
+        numberOfTimeSteps = len(self.totalTimeSteps)
+        utils.checkRollingHorizonInput(windowLength, overlap, numberOfTimeSteps, self.componentModelingDict)
+        declarationArgs = {key: kwargs[key] for key in ['buildBackend', 'useVariableBounds', 'useMutableParameters',
+                                                        'profileBuild'] if key in kwargs}
+        solveArgs = {key: value for key, value in kwargs.items() if key not in declarationArgs}
+
+        fullTimeSeriesData = {compName: comp.getFullTimeSeriesData() for mdl in self.componentModelingDict.values()
+                              for compName, comp in mdl.componentsDict.items()}
+        optVals, objectives = {key: {} for key in self.componentModelingDict}, {}
+        initialStates, cyclicStates, start = None, None, 0
+
+        try:
+            while True:
+                end = min(start + windowLength, numberOfTimeSteps)
+                isLastWindow = end == numberOfTimeSteps
+                keep = end - start if isLastWindow else windowLength - overlap
+                utils.output('Optimizing the time steps ' + str(start) + ' to ' + str(end - 1) + '...', self.verbose, 0)
+
+                # Set the time series data of the window and optimize the operation of the window
+                for mdl in self.componentModelingDict.values():
+                    for compName, comp in mdl.componentsDict.items():
+                        comp.setTimeSeriesWindow(fullTimeSeriesData[compName], start, end)
+                self.setTemporalParameters(end - start)
+                self.declareOptimizationProblem(timeSeriesAggregation=False, **declarationArgs)
+                for key, mdl in self.componentModelingDict.items():
+                    block = getattr(self.pyM, mdl.abbrvName)
+                    mdl.fixStateOfCharge(block, None if initialStates is None else initialStates[key],
+                                         None if not isLastWindow or cyclicStates is None else cyclicStates[key])
+                self.optimize(declaresOptimizationProblem=False, timeSeriesAggregation=False, **solveArgs)
+                objectives[start] = pyomo.value(self.pyM.Obj, exception=False)
+                if objectives[start] is None:
+                    raise ValueError('The optimization of the time steps ' + str(start) + ' to ' + str(end - 1) +
+                                     ' did not yield a solution.')
+
+                # Store the results of the time steps which are not optimized again in the next window
+                for key, mdl in self.componentModelingDict.items():
+                    for name, optVal in mdl.getOptimalValues().items():
+                        if optVal['timeDependent'] and optVal['values'] is not None:
+                            values = optVal['values'].loc[:, :keep - 1]
+                            values.columns = values.columns + start
+                            optVals[key].setdefault(name, []).append(values)
+
+                if isLastWindow:
+                    break
+                # Hand over the states of charge to the next window
+                if cyclicStates is None:
+                    cyclicStates = {key: mdl.getStateOfChargeValues(getattr(self.pyM, mdl.abbrvName), 0)
+                                   for key, mdl in self.componentModelingDict.items()}
+                initialStates = {key: mdl.getStateOfChargeValues(getattr(self.pyM, mdl.abbrvName), keep)
+                                 for key, mdl in self.componentModelingDict.items()}
+                start += keep
+        finally:
+            # Restore the full time series data
+            for mdl in self.componentModelingDict.values():
+                for compName, comp in mdl.componentsDict.items():
+                    comp.setTimeSeriesWindow(fullTimeSeriesData[compName])
+            self.setTemporalParameters(numberOfTimeSteps)
+            self.changedModelingClasses.update(self.componentModelingDict.keys())
+
+        # Stitch the results of the windows together
+        for key, mdl in self.componentModelingDict.items():
+            for name, values in optVals[key].items():
+                mdl.setOptimalOperationValues(name, pd.concat(values, axis=1))
+        return pd.Series(objectives)
+
+    def optimizeAdaptiveClustering(self, numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=24,
+                                   numberOfAddedPeriods=1, tolerance=1e-3, maxIterations=10,
+                                   clusterMethod='hierarchical', sortValues=True, **kwargs):
+        """
+        Optimize the energy system with clustered time series data whose typical periods are refined iteratively.
+        First, the time series data is clustered into a small number of typical periods and the optimization problem
+        is optimized. Then, the (original) periods which are represented worst are added as additional typical
+        periods (cf. cluster and addTypicalPeriods) and the optimization problem is optimized again. This is repeated
+        until the relative change of the objective function value falls below the tolerance, the maximum number of
+        iterations is reached or no period can be added anymore. A period is represented the worse, the larger the
+        product of its representation error (cf. getPeriodRepresentationErrors) and the absolute dual values of the
+        commodity balance constraints of its typical period (per period which is represented by the typical period)
+        is. If no dual values are available (e.g. for mixed integer problems), only the representation errors are
+        considered. Afterwards, the time series data is clustered with the typical periods of the last iteration.
+
+        **Default arguments:**
+
+        :param numberOfTypicalPeriods: number of typical periods of the first iteration (cf. cluster).
+            |br| * the default value is 2
+        :type numberOfTypicalPeriods: strictly positive integer
+
+        :param numberOfTimeStepsPerPeriod: number of time steps per period (cf. cluster).
+            |br| * the default value is 24
+        :type numberOfTimeStepsPerPeriod: strictly positive integer
+
+        :param numberOfAddedPeriods: number of periods which are added in each iteration.
+            |br| * the default value is 1
+        :type numberOfAddedPeriods: strictly positive integer
+
+        :param tolerance: relative change of the objective function value between two iterations below which the
+            refinement is stopped.
+            |br| * the default value is 1e-3
+        :type tolerance: positive float
+
+        :param maxIterations: maximum number of iterations (i.e. optimizations).
+            |br| * the default value is 10
+        :type maxIterations: strictly positive integer
+
+        :param clusterMethod: clustering method of the tsam package (cf. cluster).
+            |br| * the default value is 'hierarchical'
+        :type clusterMethod: string
+
+        :param sortValues: states if the sorted duration curves are clustered (cf. cluster).
+            |br| * the default value is True
+        :type sortValues: boolean
+
+        :param kwargs: keyword arguments of the optimize function (except declaresOptimizationProblem and
+            timeSeriesAggregation) which are used for each optimization.
+
+        :return: number of typical periods, objective function value, relative change of the objective function
+            value and the periods which are added afterwards for each iteration
+        :rtype: pandas DataFrame
+        """
+        if 'declaresOptimizationProblem' in kwargs or 'timeSeriesAggregation' in kwargs:
+            raise TypeError('The declaresOptimizationProblem and timeSeriesAggregation parameters are set by the '
+                            'optimizeAdaptiveClustering function.')
+        utils.checkAdaptiveClusteringInput(numberOfAddedPeriods, tolerance, maxIterations)
+        declarationArgs = {key: kwargs[key] for key in ['buildBackend', 'useVariableBounds', 'useMutableParameters',
+                                                        'rebuildChangedOnly', 'profileBuild'] if key in kwargs}
+        solveArgs = {key: value for key, value in kwargs.items() if key not in declarationArgs}
+
+        additionalPeriods, iterations, objective = [], [], None
+        for _ in range(maxIterations):
+            self.cluster(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, clusterMethod, sortValues,
+                         additionalPeriods=list(additionalPeriods))
+            # Import the dual values of the constraints (if the solver provides them)
+            self.declareOptimizationProblem(timeSeriesAggregation=True, **declarationArgs)
+            if self.pyM.component('dual') is None:
+                self.pyM.dual = pyomo.Suffix(direction=pyomo.Suffix.IMPORT)
+            self.optimize(declaresOptimizationProblem=False, timeSeriesAggregation=True, **solveArgs)
+
+            previousObjective, objective = objective, pyomo.value(self.pyM.Obj, exception=False)
+            if objective is None:
+                raise ValueError('The optimization with ' + str(len(self.typicalPeriods)) + ' typical periods did '
+                                 'not yield a solution.')
+            change = np.nan if previousObjective is None else \
+                abs(objective - previousObjective) / (abs(previousObjective) if previousObjective != 0 else 1)
+            iterations.append([len(self.typicalPeriods), objective, change, []])
+            if change < tolerance:
+                break
+
+            # Rank the periods by their representation error weighted with the dual values of their typical period
+            clusterOrder = np.asarray(self.clusterOrder)
+            occurrences = np.bincount(clusterOrder, minlength=len(self.typicalPeriods))
+            dualWeights = np.zeros(len(self.typicalPeriods))
+            for (loc, commod, p, t), constr in self.pyM.commodityBalanceConstraint.items():
+                dual = self.pyM.dual.get(constr)
+                dualWeights[p] += abs(dual) if dual is not None else 0
+            if dualWeights.sum() > 0:
+                dualWeights = dualWeights / np.maximum(occurrences, 1)
+            else:
+                dualWeights[:] = 1
+            scores = self.getPeriodRepresentationErrors() * dualWeights[clusterOrder]
+            # Periods which are the only period of their typical period are represented exactly
+            scores[occurrences[clusterOrder] <= 1] = 0
+            addedPeriods = [int(period) for period in np.argsort(-scores, kind='stable')
+                            if scores[period] > 0][:numberOfAddedPeriods]
+            if not addedPeriods:
+                break
+            additionalPeriods += addedPeriods
+            iterations[-1][3] = addedPeriods
+            utils.output('Adding the periods ' + str(addedPeriods) + ' as typical periods...', self.verbose, 0)
+
+        return pd.DataFrame(iterations, columns=['numberOfTypicalPeriods', 'objective', 'relativeChange',
+                                                 'addedPeriods'])
@@ -1,5 +1,7 @@
-from FINE.component import Component, ComponentModel
+from FINE.component import Component, ComponentModel, TimeSeriesParameter
 from FINE import utils
+import numbers
+import numpy as np
 import pandas as pd
 import pyomo.environ as pyomo
 import warnings
@@ -9,6 +11,19 @@ class Source(Component):
     """
     A Source component can transfer a commodity over the energy system boundary into the system.
     """
+    # Time series parameters (kept as NumPy arrays in the time series store of the component)
+    fullOperationRateMax = TimeSeriesParameter('fullOperationRateMax')
+    aggregatedOperationRateMax = TimeSeriesParameter('aggregatedOperationRateMax')
+    operationRateMax = TimeSeriesParameter('operationRateMax')
+    fullOperationRateFix = TimeSeriesParameter('fullOperationRateFix')
+    aggregatedOperationRateFix = TimeSeriesParameter('aggregatedOperationRateFix')
+    operationRateFix = TimeSeriesParameter('operationRateFix')
+    fullCommodityCostTimeSeries = TimeSeriesParameter('fullCommodityCostTimeSeries')
+    aggregatedCommodityCostTimeSeries = TimeSeriesParameter('aggregatedCommodityCostTimeSeries')
+    commodityCostTimeSeries = TimeSeriesParameter('commodityCostTimeSeries')
+    fullCommodityRevenueTimeSeries = TimeSeriesParameter('fullCommodityRevenueTimeSeries')
+    aggregatedCommodityRevenueTimeSeries = TimeSeriesParameter('aggregatedCommodityRevenueTimeSeries')
+    commodityRevenueTimeSeries = TimeSeriesParameter('commodityRevenueTimeSeries')
 
     def __init__(self, esM, name, commodity, hasCapacityVariable,
                  capacityVariableDomain='continuous', capacityPerPlantUnit=1,
@@ -216,37 +231,102 @@ class Source(Component):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.operationRateMax = self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax
-        self.operationRateFix = self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix
-        self.commodityCostTimeSeries = \
-            self.aggregatedCommodityCostTimeSeries if hasTSA else self.fullCommodityCostTimeSeries
-        self.commodityRevenueTimeSeries = \
-            self.aggregatedCommodityRevenueTimeSeries if hasTSA else self.fullCommodityRevenueTimeSeries
-
-    def getDataForTimeSeriesAggregation(self):
-        """ Function for getting the required data if a time series aggregation is requested. """
-        weightDict, data = {}, []
-        weightDict, data = self.prepareTSAInput(self.fullOperationRateFix, self.fullOperationRateMax,
-                                                '_operationRate_', self.tsaWeight, weightDict, data)
-        weightDict, data = self.prepareTSAInput(self.fullCommodityCostTimeSeries, None,
-                                                '_commodityCostTimeSeries_', self.tsaWeight, weightDict, data)
-        weightDict, data = self.prepareTSAInput(self.fullCommodityRevenueTimeSeries, None,
-                                                '_commodityRevenueTimeSeries_', self.tsaWeight, weightDict, data)
-        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
-
-    def setAggregatedTimeSeriesData(self, data):
+        self.selectTimeSeries('operationRateMax', hasTSA)
+        self.selectTimeSeries('operationRateFix', hasTSA)
+        self.selectTimeSeries('commodityCostTimeSeries', hasTSA)
+        self.selectTimeSeries('commodityRevenueTimeSeries', hasTSA)
+
+    def getDataForTimeSeriesAggregation(self, registry):
+        """ Function for registering the required data if a time series aggregation is requested. """
+        rateFix, rateMax = self.getTimeSeries('fullOperationRateFix'), self.getTimeSeries('fullOperationRateMax')
+        self.prepareTSAInput(rateFix, rateMax, '_operationRate_', self.tsaWeight, registry)
+        self.prepareTSAInput(self.getTimeSeries('fullCommodityCostTimeSeries'), None, '_commodityCostTimeSeries_',
+                             self.tsaWeight, registry)
+        self.prepareTSAInput(self.getTimeSeries('fullCommodityRevenueTimeSeries'), None,
+                             '_commodityRevenueTimeSeries_', self.tsaWeight, registry)
+
+    def setAggregatedTimeSeriesData(self, registry):
         """
         Function for determining the aggregated maximum rate and the aggregated fixed operation rate.
 
-        :param data: Pandas DataFrame with the clustered time series data of the source component
-        :type data: Pandas DataFrame
+        :param registry: column registry with the clustered time series data of the energy system
+        :type registry: TimeSeriesColumnRegistry
         """
-        self.aggregatedOperationRateFix = self.getTSAOutput(self.fullOperationRateFix, '_operationRate_', data)
-        self.aggregatedOperationRateMax = self.getTSAOutput(self.fullOperationRateMax, '_operationRate_', data)
+        rateFix, rateMax = self.getTimeSeries('fullOperationRateFix'), self.getTimeSeries('fullOperationRateMax')
+        self.aggregatedOperationRateFix = self.getTSAOutput(rateFix, '_operationRate_', registry)
+        self.aggregatedOperationRateMax = self.getTSAOutput(rateMax, '_operationRate_', registry)
         self.aggregatedCommodityCostTimeSeries = \
-            self.getTSAOutput(self.fullCommodityCostTimeSeries, '_commodityCostTimeSeries_', data)
+            self.getTSAOutput(self.getTimeSeries('fullCommodityCostTimeSeries'), '_commodityCostTimeSeries_', registry)
         self.aggregatedCommodityRevenueTimeSeries = \
-            self.getTSAOutput(self.fullCommodityRevenueTimeSeries, '_commodityRevenueTimeSeries_', data)
+            self.getTSAOutput(self.getTimeSeries('fullCommodityRevenueTimeSeries'), '_commodityRevenueTimeSeries_',
+                              registry)
+
+    def getTimeSeriesResamplingMethod(self, name):
+        """
+        Function for getting the method with which a time series is aggregated when the temporal resolution is
+        reduced. The commodity cost and revenue time series are given as specific values and are hence averaged
+        (cf. getTimeSeriesResamplingWeights).
+
+        :param name: name of the time series parameter.
+        :type name: string
+        """
+        if name in ['fullCommodityCostTimeSeries', 'fullCommodityRevenueTimeSeries']:
+            return 'mean'
+        return super().getTimeSeriesResamplingMethod(name)
+
+    def getTimeSeriesResamplingWeights(self, name):
+        """
+        Function for getting the weights of an averaged time series when the temporal resolution is reduced. The
+        commodity cost and revenue time series are weighted with the operation rates of the component (the fixed
+        operation rates if given, otherwise the maximum operation rates). Thus, the costs and revenues of a fixed
+        operation are preserved.
+
+        :param name: name of the time series parameter.
+        :type name: string
+        """
+        if name in ['fullCommodityCostTimeSeries', 'fullCommodityRevenueTimeSeries']:
+            rateFix = self.getTimeSeries('fullOperationRateFix')
+            return rateFix if rateFix is not None else self.getTimeSeries('fullOperationRateMax')
+        return super().getTimeSeriesResamplingWeights(name)
+
+    def isUpdatableParameter(self, name):
+        """
+        Function for checking if a parameter can be updated in a declared optimization problem. Additionally to the
+        parameters listed in the Component class, the yearly limit can be updated.
+
+        :param name: name of the parameter.
+        :type name: string
+        """
+        return name == 'yearlyLimit' or super().isUpdatableParameter(name)
+
+    def updateParameters(self, esM, params):
+        """
+        Function for updating parameters of the source/sink component. The yearly limit is updated for all
+        components with the same commodityLimitID. Its sign can not be changed since it determines the direction
+        of the yearly limitation constraint.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: EnergySystemModel instance
+
+        :param params: new parameter values with the parameter names as keys.
+        :type params: dict
+        """
+        params = dict(params)
+        if 'yearlyLimit' in params:
+            yearlyLimit = params.pop('yearlyLimit')
+            if self.commodityLimitID is None:
+                raise ValueError('The yearlyLimit of component ' + self.name + ' can not be updated since no ' +
+                                 'commodityLimitID is given.')
+            if isinstance(yearlyLimit, (bool, np.bool_)) or not isinstance(yearlyLimit, numbers.Real):
+                raise TypeError('The yearlyLimit parameter has to be a number.')
+            if (yearlyLimit < 0) != (self.yearlyLimit < 0):
+                raise ValueError('The sign of the yearlyLimit of component ' + self.name + ' can not be changed.')
+            super().updateParameters(esM, params)
+            for comp in esM.componentModelingDict[self.modelingClass.__name__].componentsDict.values():
+                if comp.commodityLimitID == self.commodityLimitID:
+                    comp.yearlyLimit = float(yearlyLimit)
+        else:
+            super().updateParameters(esM, params)
 
 
 class Sink(Source):
@@ -304,7 +384,8 @@ class SourceSinkModel(ComponentModel):
     def declareYearlyCommodityLimitationDict(self, pyM):
         """
         Declare source/sink components with linked commodity limits and check if the linked components have the same
-        yearly upper limit.
+        yearly upper limit. For each limitation ID, the indices (location, component) of the operation variables
+        of the linked components are stored together with their sign.
 
         :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
         :type pyM: pyomo ConcreteModel
@@ -316,7 +397,15 @@ class SourceSinkModel(ComponentModel):
                 ID, limit = comp.commodityLimitID, comp.yearlyLimit
                 if ID in yearlyCommodityLimitationDict and limit != yearlyCommodityLimitationDict[ID][0]:
                     raise ValueError('yearlyLimitationIDs with different upper limits detected.')
-                yearlyCommodityLimitationDict.setdefault(ID, (limit, []))[1].append(compName)
+                yearlyCommodityLimitationDict.setdefault(ID, (limit, [], []))[1].append(compName)
+
+        # Index of the operation variables of each limitation ID (one pass over the operation variable set)
+        limitIDs = {compName: self.componentsDict[compName].commodityLimitID for ID in yearlyCommodityLimitationDict
+                    for compName in yearlyCommodityLimitationDict[ID][1]}
+        for loc, compName in getattr(pyM, 'operationVarSet_' + self.abbrvName):
+            if compName in limitIDs:
+                yearlyCommodityLimitationDict[limitIDs[compName]][2].append(
+                    ((loc, compName), self.componentsDict[compName].sign))
         setattr(pyM, 'yearlyCommodityLimitationDict_' + self.abbrvName, yearlyCommodityLimitationDict)
 
     def declareSets(self, esM, pyM):
@@ -387,19 +476,52 @@ class SourceSinkModel(ComponentModel):
         :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
         :type pyM: pyomo ConcreteModel
         """
-        compDict, abbrvName = self.componentsDict, self.abbrvName
+        abbrvName = self.abbrvName
         opVar = getattr(pyM, 'op_' + abbrvName)
         limitDict = getattr(pyM, 'yearlyCommodityLimitationDict_' + abbrvName)
+        if pyM.useMutableParameters:
+            setattr(pyM, 'yearlyLimitParam_' + abbrvName, pyomo.Param(list(limitDict.keys()), mutable=True,
+                    initialize={key: limitDict[key][0] for key in limitDict}))
+            limits = getattr(pyM, 'yearlyLimitParam_' + abbrvName)
+        else:
+            limits = {key: limitDict[key][0] for key in limitDict}
+
+        # Premultiplied coefficients of the operation variables for each period
+        factors = [-occurrences/esM.numberOfYears for occurrences in esM.periodOccurrences]
 
         def yearlyLimitationConstraint(pyM, key):
-            sumEx = -sum(opVar[loc, compName, p, t] * compDict[compName].sign *
-                         esM.periodOccurrences[p]/esM.numberOfYears
-                         for loc, compName, p, t in opVar if compName in limitDict[key][1])
+            sumEx = sum(opVar[loc, compName, p, t] * (compSign * factors[p])
+                        for (loc, compName), compSign in limitDict[key][2] for p, t in pyM.timeSet)
             sign = limitDict[key][0]/abs(limitDict[key][0]) if limitDict[key][0] != 0 else 1
-            return sign * sumEx <= sign * limitDict[key][0]
+            return sign * sumEx <= sign * limits[key]
         setattr(pyM, 'ConstrYearlyLimitation_' + abbrvName,
                 pyomo.Constraint(limitDict.keys(), rule=yearlyLimitationConstraint))
 
+    def updateComponentData(self, esM, pyM, compName, paramNames):
+        """
+        Push updated parameters of a source/sink component into the declared optimization problem. Additionally to
+        the parameters considered in the ComponentModel class, the yearly limit is updated.
+
+        :param esM: EnergySystemModel instance representing the energy system in which the component is modeled.
+        :type esM: esM - EnergySystemModel class instance
+
+        :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
+        :type pyM: pyomo ConcreteModel
+
+        :param compName: name of the component.
+        :type compName: string
+
+        :param paramNames: names of the updated parameters.
+        :type paramNames: list of strings
+        """
+        super().updateComponentData(esM, pyM, compName, paramNames)
+        if 'yearlyLimit' in paramNames:
+            comp, limitDict = self.componentsDict[compName], getattr(pyM, 'yearlyCommodityLimitationDict_' +
+                                                                     self.abbrvName)
+            ID = comp.commodityLimitID
+            limitDict[ID] = (comp.yearlyLimit,) + limitDict[ID][1:]
+            getattr(pyM, 'yearlyLimitParam_' + self.abbrvName)[ID] = comp.yearlyLimit
+
     def declareComponentConstraints(self, esM, pyM):
         """
         Declare time independent and dependent constraints.
@@ -472,6 +594,15 @@ class SourceSinkModel(ComponentModel):
         return any([comp.commodity == commod and comp.locationalEligibility[loc] == 1
                     for comp in self.componentsDict.values()])
 
+    def getCommodityBalanceIncidence(self, pyM):
+        """ Get the incidence of the operation variables in the commodity balances (cf. ComponentModel). """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar, incidence = getattr(pyM, 'op_' + abbrvName), {}
+        for loc, compName in getattr(pyM, 'operationVarSet_' + abbrvName):
+            comp = compDict[compName]
+            incidence.setdefault((loc, comp.commodity), []).append((opVar, (loc, compName), comp.sign))
+        return incidence
+
     def getCommodityBalanceContribution(self, pyM, commod, loc, p, t):
         """ Get contribution to a commodity balance. """
         compDict, abbrvName = self.componentsDict, self.abbrvName
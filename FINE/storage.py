@@ -1,4 +1,4 @@
-from FINE.component import Component, ComponentModel
+from FINE.component import Component, ComponentModel, TimeSeriesParameter
 from FINE import utils
 import pyomo.environ as pyomo
 import warnings
@@ -9,6 +9,20 @@ class Storage(Component):
     """
     A Storage component can store a commodity and thus transfers it between time steps.
     """
+    # Time series parameters (kept as NumPy arrays in the time series store of the component)
+    fullChargeOpRateMax = TimeSeriesParameter('fullChargeOpRateMax')
+    aggregatedChargeOpRateMax = TimeSeriesParameter('aggregatedChargeOpRateMax')
+    chargeOpRateMax = TimeSeriesParameter('chargeOpRateMax')
+    fullChargeOpRateFix = TimeSeriesParameter('fullChargeOpRateFix')
+    aggregatedChargeOpRateFix = TimeSeriesParameter('aggregatedChargeOpRateFix')
+    chargeOpRateFix = TimeSeriesParameter('chargeOpRateFix')
+    fullDischargeOpRateMax = TimeSeriesParameter('fullDischargeOpRateMax')
+    aggregatedDischargeOpRateMax = TimeSeriesParameter('aggregatedDischargeOpRateMax')
+    dischargeOpRateMax = TimeSeriesParameter('dischargeOpRateMax')
+    fullDischargeOpRateFix = TimeSeriesParameter('fullDischargeOpRateFix')
+    aggregatedDischargeOpRateFix = TimeSeriesParameter('aggregatedDischargeOpRateFix')
+    dischargeOpRateFix = TimeSeriesParameter('dischargeOpRateFix')
+
     def __init__(self, esM, name, commodity, chargeRate=1, dischargeRate=1,
                  chargeEfficiency=1, dischargeEfficiency=1, selfDischarge=0, cyclicLifetime=None,
                  stateOfChargeMin=0, stateOfChargeMax=1,
@@ -254,34 +268,36 @@ class Storage(Component):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.chargeOpRateMax = self.aggregatedChargeOpRateMax if hasTSA else self.fullChargeOpRateMax
-        self.chargeOpRateFix = self.aggregatedChargeOpRateFix if hasTSA else self.fullChargeOpRateFix
-        self.dischargeOpRateMax = self.aggregatedDischargeOpRateMax if hasTSA else self.fullDischargeOpRateMax
-        self.dischargeOpRateFix = self.aggregatedDischargeOpRateFix if hasTSA else self.fullDischargeOpRateFix
-
-    def getDataForTimeSeriesAggregation(self):
-        """ Function for getting the required data if a time series aggregation is requested. """
-        weightDict, data = {}, []
-        I = [(self.fullChargeOpRateFix, self.fullChargeOpRateMax, 'chargeRate_', self.chargeTsaWeight),
-             (self.fullDischargeOpRateFix, self.fullDischargeOpRateMax, 'dischargeRate_', self.dischargeTsaWeight)]
+        self.selectTimeSeries('chargeOpRateMax', hasTSA)
+        self.selectTimeSeries('chargeOpRateFix', hasTSA)
+        self.selectTimeSeries('dischargeOpRateMax', hasTSA)
+        self.selectTimeSeries('dischargeOpRateFix', hasTSA)
+
+    def getDataForTimeSeriesAggregation(self, registry):
+        """ Function for registering the required data if a time series aggregation is requested. """
+        I = [(self.getTimeSeries('fullChargeOpRateFix'), self.getTimeSeries('fullChargeOpRateMax'), 'chargeRate_',
+              self.chargeTsaWeight),
+             (self.getTimeSeries('fullDischargeOpRateFix'), self.getTimeSeries('fullDischargeOpRateMax'),
+              'dischargeRate_', self.dischargeTsaWeight)]
 
         for rateFix, rateMax, rateName, rateWeight in I:
-            weightDict, data = self.prepareTSAInput(rateFix, rateMax, rateName, rateWeight, weightDict, data)
-        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
+            self.prepareTSAInput(rateFix, rateMax, rateName, rateWeight, registry)
 
-    def setAggregatedTimeSeriesData(self, data):
+    def setAggregatedTimeSeriesData(self, registry):
         """
         Function for determining the aggregated maximum rate and the aggregated fixed operation rate for charging
         and discharging.
 
-        :param data: Pandas DataFrame with the clustered time series data of the source component
-        :type data: Pandas DataFrame
+        :param registry: column registry with the clustered time series data of the energy system
+        :type registry: TimeSeriesColumnRegistry
         """
-        self.aggregatedChargeOpRateFix = self.getTSAOutput(self.fullChargeOpRateFix, 'chargeRate_', data)
-        self.aggregatedChargeOpRateMax = self.getTSAOutput(self.fullChargeOpRateMax, 'chargeRate_', data)
+        rateFix, rateMax = self.getTimeSeries('fullChargeOpRateFix'), self.getTimeSeries('fullChargeOpRateMax')
+        self.aggregatedChargeOpRateFix = self.getTSAOutput(rateFix, 'chargeRate_', registry)
+        self.aggregatedChargeOpRateMax = self.getTSAOutput(rateMax, 'chargeRate_', registry)
 
-        self.aggregatedDischargeOpRateFix = self.getTSAOutput(self.fullDischargeOpRateFix, 'dischargeRate_', data)
-        self.aggregatedDischargeOpRateMax = self.getTSAOutput(self.fullDischargeOpRateMax, 'dischargeRate_', data)
+        rateFix, rateMax = self.getTimeSeries('fullDischargeOpRateFix'), self.getTimeSeries('fullDischargeOpRateMax')
+        self.aggregatedDischargeOpRateFix = self.getTSAOutput(rateFix, 'dischargeRate_', registry)
+        self.aggregatedDischargeOpRateMax = self.getTSAOutput(rateMax, 'dischargeRate_', registry)
 
 
 class StorageModel(ComponentModel):
@@ -408,7 +424,7 @@ class StorageModel(ComponentModel):
         Declare the constraint for connecting the state of charge with the charge and discharge operation:
         the change in the state of charge between two points in time has to match the values of charging and
         discharging (considering the efficiencies of these processes) within the time step in between minus
-        the self-discharge of the storage.
+        the self-discharge of the storage (during the duration of the time step).
 
         :param pyM: pyomo ConcreteModel which stores the mathematical formulation of the model.
         :type pyM: pyomo ConcreteModel
@@ -419,11 +435,11 @@ class StorageModel(ComponentModel):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         SOC = getattr(pyM, 'stateOfCharge_' + abbrvName)
         chargeOp, dischargeOp = getattr(pyM, 'chargeOp_' + abbrvName), getattr(pyM, 'dischargeOp_' + abbrvName)
-        opVarSet = getattr(pyM, 'operationVarSet_' + abbrvName)
+        opVarSet, durations = getattr(pyM, 'operationVarSet_' + abbrvName), pyM.timeStepDurations
 
         def connectSOCs(pyM, loc, compName, p, t):
             return (SOC[loc, compName, p, t+1] - SOC[loc, compName, p, t] *
-                    (1 - compDict[compName].selfDischarge) ** esM.hoursPerTimeStep ==
+                    (1 - compDict[compName].selfDischarge) ** (esM.hoursPerTimeStep * durations[p, t]) ==
                     chargeOp[loc, compName, p, t] * compDict[compName].chargeEfficiency -
                     dischargeOp[loc, compName, p, t] / compDict[compName].dischargeEfficiency)
         setattr(pyM, 'ConstrConnectSOC_' + abbrvName, pyomo.Constraint(opVarSet, pyM.timeSet, rule=connectSOCs))
@@ -465,13 +481,18 @@ class StorageModel(ComponentModel):
         chargeOp, capVar = getattr(pyM, 'chargeOp_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         capVarSet = getattr(pyM, 'designDimensionVarSet_' + abbrvName)
 
+        # Set of the components for which a cyclic lifetime is given
+        def initCyclicLifetimeSet(pyM):
+            return ((loc, compName) for loc, compName in capVarSet if compDict[compName].cyclicLifetime is not None)
+        setattr(pyM, 'cyclicLifetimeConstrSet_' + abbrvName, pyomo.Set(dimen=2, initialize=initCyclicLifetimeSet))
+
         def cyclicLifetime(pyM, loc, compName):
             return (sum(chargeOp[loc, compName, p, t] * esM.periodOccurrences[p] for p, t in pyM.timeSet) /
                     esM.numberOfYears <= capVar[loc, compName] *
                     (compDict[compName].stateOfChargeMax - compDict[compName].stateOfChargeMin) *
-                    compDict[compName].cyclicLifetime / compDict[compName].economicLifetime[loc]
-                    if compDict[compName].cyclicLifetime is not None else pyomo.Constraint.Skip)
-        setattr(pyM, 'ConstrCyclicLifetime_' + abbrvName, pyomo.Constraint(capVarSet, rule=cyclicLifetime))
+                    compDict[compName].cyclicLifetime / compDict[compName].economicLifetime[loc])
+        setattr(pyM, 'ConstrCyclicLifetime_' + abbrvName,
+                pyomo.Constraint(getattr(pyM, 'cyclicLifetimeConstrSet_' + abbrvName), rule=cyclicLifetime))
 
     def connectInterPeriodSOC(self, pyM, esM):
         """
@@ -489,11 +510,12 @@ class StorageModel(ComponentModel):
         opVarSet = getattr(pyM, 'operationVarSet_' + abbrvName)
         SOC = getattr(pyM, 'stateOfCharge_' + abbrvName)
         SOCInter = getattr(pyM, 'stateOfChargeInterPeriods_' + abbrvName)
+        starts = pyM.timeStepStarts
 
         def connectInterSOC(pyM, loc, compName, pInter):
             return SOCInter[loc, compName, pInter + 1] == \
                    SOCInter[loc, compName, pInter] * (1 - compDict[compName].selfDischarge) ** \
-                   ((esM.timeStepsPerPeriod[-1] + 1) * esM.hoursPerTimeStep) + \
+                   (starts[esM.periodsOrder[pInter], esM.timeStepsPerPeriod[-1] + 1] * esM.hoursPerTimeStep) + \
                    SOC[loc, compName, esM.periodsOrder[pInter], esM.timeStepsPerPeriod[-1] + 1]
         setattr(pyM, 'ConstrInterSOC_' + abbrvName, pyomo.Constraint(opVarSet, esM.periods, rule=connectInterSOC))
 
@@ -531,10 +553,16 @@ class StorageModel(ComponentModel):
         opVarSet = getattr(pyM, 'operationVarSet_' + abbrvName)
         SOCInter = getattr(pyM, 'stateOfChargeInterPeriods_' + abbrvName)
 
+        # Set of the periodical storage components
+        def initEqualInterSOCSet(pyM):
+            return ((loc, compName) for loc, compName in opVarSet if compDict[compName].isPeriodicalStorage)
+        setattr(pyM, 'equalInterSOCConstrSet_' + abbrvName, pyomo.Set(dimen=2, initialize=initEqualInterSOCSet))
+
         def equalInterSOC(pyM, loc, compName, pInter):
-            return (SOCInter[loc, compName, pInter] == SOCInter[loc, compName, pInter + 1]
-                    if compDict[compName].isPeriodicalStorage else pyomo.Constraint.Skip)
-        setattr(pyM, 'ConstrEqualInterSOC_' + abbrvName, pyomo.Constraint(opVarSet, esM.periods, rule=equalInterSOC))
+            return SOCInter[loc, compName, pInter] == SOCInter[loc, compName, pInter + 1]
+        setattr(pyM, 'ConstrEqualInterSOC_' + abbrvName,
+                pyomo.Constraint(getattr(pyM, 'equalInterSOCConstrSet_' + abbrvName), esM.periods,
+                                 rule=equalInterSOC))
 
     def minSOC(self, pyM):
         """
@@ -567,7 +595,7 @@ class StorageModel(ComponentModel):
         capVarSimpleSet = getattr(pyM, 'designDimensionVarSetSimple_' + abbrvName)
         SOC, capVar = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         SOCmax, SOCmin = getattr(pyM, 'stateOfChargeMax_' + abbrvName), getattr(pyM, 'stateOfChargeMin_' + abbrvName)
-        SOCInter = getattr(pyM, 'stateOfChargeInterPeriods_' + abbrvName)
+        SOCInter, starts = getattr(pyM, 'stateOfChargeInterPeriods_' + abbrvName), pyM.timeStepStarts
 
         # The maximum (virtual) state of charge during a typical period is larger than all occurring (virtual)
         # states of charge in that period (the last time step is considered in the subsequent period for t=0).
@@ -597,7 +625,7 @@ class StorageModel(ComponentModel):
         # state of charge.
         def SOCMinSimple(pyM, loc, compName, pInter):
             return (SOCInter[loc, compName, pInter] * (1 - compDict[compName].selfDischarge) **
-                    ((esM.timeStepsPerPeriod[-1] + 1) * esM.hoursPerTimeStep)
+                    (starts[esM.periodsOrder[pInter], esM.timeStepsPerPeriod[-1] + 1] * esM.hoursPerTimeStep)
                     + SOCmin[loc, compName, esM.periodsOrder[pInter]]
                     >= capVar[loc, compName] * compDict[compName].stateOfChargeMin)
         setattr(pyM, 'ConstrSOCMinSimple_' + abbrvName,
@@ -639,12 +667,13 @@ class StorageModel(ComponentModel):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         SOCinter = getattr(pyM, 'stateOfChargeInterPeriods_' + abbrvName)
         SOC, capVar = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
-        constrSet = getattr(pyM, 'designDimensionVarSet_' + abbrvName)
+        constrSet, starts = getattr(pyM, 'designDimensionVarSet_' + abbrvName), pyM.timeStepStarts
 
         def SOCMaxPrecise(pyM, loc, compName, pInter, t):
             if compDict[compName].doPreciseTsaModeling:
                 return (SOCinter[loc, compName, pInter] *
-                        ((1 - compDict[compName].selfDischarge) ** (t * esM.hoursPerTimeStep)) +
+                        ((1 - compDict[compName].selfDischarge) **
+                         (starts[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
                         SOC[loc, compName, esM.periodsOrder[pInter], t]
                         <= capVar[loc, compName] * compDict[compName].stateOfChargeMax)
             else:
@@ -666,11 +695,12 @@ class StorageModel(ComponentModel):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         SOCinter = getattr(pyM, 'stateOfChargeInterPeriods_' + abbrvName)
         SOC, capVar = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
-        capVarPreciseSet = getattr(pyM, 'designDimensionVarSetPrecise_' + abbrvName)
+        capVarPreciseSet, starts = getattr(pyM, 'designDimensionVarSetPrecise_' + abbrvName), pyM.timeStepStarts
 
         def SOCMinPrecise(pyM, loc, compName, pInter, t):
             return (SOCinter[loc, compName, pInter] * ((1 - compDict[compName].selfDischarge) **
-                    (t * esM.hoursPerTimeStep)) + SOC[loc, compName, esM.periodsOrder[pInter], t]
+                    (starts[esM.periodsOrder[pInter], t] * esM.hoursPerTimeStep)) +
+                    SOC[loc, compName, esM.periodsOrder[pInter], t]
                     >= capVar[loc, compName] * compDict[compName].stateOfChargeMin)
         setattr(pyM, 'ConstrSOCMinPrecise_' + abbrvName,
                 pyomo.Constraint(capVarPreciseSet, esM.periods, esM.timeStepsPerPeriod, rule=SOCMinPrecise))
@@ -812,6 +842,16 @@ class StorageModel(ComponentModel):
         return any([comp.commodity == commod and comp.locationalEligibility[loc] == 1
                     for comp in self.componentsDict.values()])
 
+    def getCommodityBalanceIncidence(self, pyM):
+        """ Get the incidence of the operation variables in the commodity balances (cf. ComponentModel). """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        chargeOp, dischargeOp = getattr(pyM, 'chargeOp_' + abbrvName), getattr(pyM, 'dischargeOp_' + abbrvName)
+        incidence = {}
+        for loc, compName in getattr(pyM, 'operationVarSet_' + abbrvName):
+            incidence.setdefault((loc, compDict[compName].commodity), []).extend(
+                [(dischargeOp, (loc, compName), 1), (chargeOp, (loc, compName), -1)])
+        return incidence
+
     def getCommodityBalanceContribution(self, pyM, commod, loc, p, t):
         """ Get contribution to a commodity balance. """
         compDict, abbrvName = self.componentsDict, self.abbrvName
@@ -844,6 +884,31 @@ class StorageModel(ComponentModel):
     #                                  Return optimal values of the component class                                    #
     ####################################################################################################################
 
+    def setWarmstartValues(self, pyM, sourcePyM, timeStepMap):
+        """
+        Set the values of the variables to the optimal values of another optimization problem (cf.
+        ComponentModel.setWarmstartValues). If the other optimization problem is based on clustered time series data,
+        the state of charge is reconstructed from the inter-period and the intra-period state of charge in the same
+        way as it is done in setOptimalValues.
+        """
+        abbrvName = self.abbrvName
+        self.setDesignWarmstartValues(pyM, sourcePyM)
+        self.setOperationWarmstartValues(pyM, sourcePyM, 'chargeOp', timeStepMap)
+        self.setOperationWarmstartValues(pyM, sourcePyM, 'dischargeOp', timeStepMap)
+
+        SOC, sourceSOC = getattr(pyM, 'stateOfCharge_' + abbrvName), getattr(sourcePyM, 'stateOfCharge_' + abbrvName)
+        if not sourcePyM.hasTSA:
+            for index in SOC:
+                SOC[index].value = sourceSOC[index].value
+            return
+        SOCInter = getattr(sourcePyM, 'stateOfChargeInterPeriods_' + abbrvName)
+        # The state of charge after the last time step is the one at the end of the last period
+        timeStepMap = timeStepMap + [(timeStepMap[-1][0], timeStepMap[-1][1], len(sourcePyM.timeStepsSet))]
+        for loc, compName, p, t in SOC:
+            k, pSource, tSource = timeStepMap[t]
+            intra, inter = sourceSOC[loc, compName, pSource, tSource].value, SOCInter[loc, compName, k].value
+            SOC[loc, compName, p, t].value = None if intra is None or inter is None else inter + intra
+
     def setOptimalValues(self, esM, pyM):
         """
         Set the optimal values of the components.
@@ -982,3 +1047,37 @@ class StorageModel(ComponentModel):
                                                            'timeDependent': True, 'dimension': self.dimension},
                     'stateOfChargeOperationVariablesOptimum': {'values': self.stateOfChargeOperationVariablesOptimum,
                                                                'timeDependent': True, 'dimension': self.dimension}}
+
+    def setOptimalOperationValues(self, name, optVal):
+        """
+        Set the optimal values of time dependent variables (cf. ComponentModel.setOptimalOperationValues). The
+        optimal state of charge values are furthermore set in the components.
+        """
+        super().setOptimalOperationValues(name, optVal)
+        if name == 'stateOfChargeOperationVariablesOptimum':
+            utils.setOptimalComponentVariables(optVal, '_stateOfChargeVariablesOptimum', self.componentsDict)
+
+    def getStateOfChargeValues(self, pyM, timeStep):
+        """
+        Get the values of the state of charge variables of the components at a point in time of the (not aggregated)
+        inter time steps set (cf. ComponentModel.getStateOfChargeValues).
+        """
+        SOC = getattr(pyM, 'stateOfCharge_' + self.abbrvName)
+        return {(loc, compName): SOC[loc, compName, 0, timeStep].value
+                for loc, compName in getattr(pyM, 'operationVarSet_' + self.abbrvName)}
+
+    def fixStateOfCharge(self, pyM, initialValues=None, finalValues=None):
+        """
+        Fix the state of charge variables of the components at the beginning and/or at the end of the (not aggregated)
+        time horizon (cf. ComponentModel.fixStateOfCharge). If initial values are given, the state of charge at the
+        end of the time horizon is no longer connected to the one at its beginning.
+        """
+        abbrvName = self.abbrvName
+        SOC = getattr(pyM, 'stateOfCharge_' + abbrvName)
+        if initialValues is not None:
+            getattr(pyM, 'ConstrCyclicState_' + abbrvName).deactivate()
+            for (loc, compName), value in initialValues.items():
+                SOC[loc, compName, 0, 0].fix(max(value, 0))
+        if finalValues is not None:
+            for (loc, compName), value in finalValues.items():
+                SOC[loc, compName, 0, len(pyM.timeStepsSet)].fix(max(value, 0))
@@ -41,6 +41,7 @@ class LinearOptimalPowerFlow(Transmission):
 
         self.reactances2dim = reactances
         self.reactances = pd.Series(self._mapC).apply(lambda loc: self.reactances2dim[loc[0]][loc[1]])
+        self._reactances = self.reactances[self._edges].values.astype(float)
 
     def addToEnergySystemModel(self, esM):
         """
@@ -164,12 +165,17 @@ class LOPFModel(TransmissionModel):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         phaseAngleVar = getattr(pyM, 'phaseAngle_' + self.abbrvName)
         opVar, opVarSet = getattr(pyM, 'op_' + abbrvName), getattr(pyM, 'operationVarSet_' + abbrvName)
+        durations = pyM.timeStepDurations
 
         def powerFlowDC(pyM, loc, compName, p, t):
-            node1, node2 = compDict[compName]._mapC[loc]
-            return (opVar[loc, compName, p, t] - opVar[compDict[compName]._mapI[loc], compName, p, t] ==
-                    (phaseAngleVar[node1, compName, p, t]-phaseAngleVar[node2, compName, p, t])/
-                    compDict[compName].reactances[loc])
+            comp = compDict[compName]
+            edge = comp._edgeIds[loc]
+            (node1, node2), reverse = comp._edgeLocations[edge], comp._reverseEdges[edge]
+            flow = opVar[loc, compName, p, t] - opVar[comp._edges[reverse], compName, p, t] if reverse >= 0 else \
+                opVar[loc, compName, p, t]
+            # Note: the flow refers to the whole duration of the time step
+            return (flow == (phaseAngleVar[node1, compName, p, t]-phaseAngleVar[node2, compName, p, t])/
+                    (comp._reactances[edge] / durations[p, t]))
         setattr(pyM, 'ConstrpowerFlowDC_' + abbrvName,  pyomo.Constraint(opVarSet, pyM.timeSet, rule=powerFlowDC))
 
     def basePhaseAngle(self, pyM):
@@ -181,10 +187,10 @@ class LOPFModel(TransmissionModel):
         """
         compDict, abbrvName = self.componentsDict, self.abbrvName
         phaseAngleVar = getattr(pyM, 'phaseAngle_' + self.abbrvName)
+        nodes0 = {compName: sorted(comp._mapL)[0] for compName, comp in compDict.items()}
 
         def basePhaseAngle(pyM, compName, p, t):
-            node0 = sorted(compDict[compName]._mapL)[0]
-            return phaseAngleVar[node0, compName, p, t] == 0
+            return phaseAngleVar[nodes0[compName], compName, p, t] == 0
         setattr(pyM, 'ConstrBasePhaseAngle_' + abbrvName,
                 pyomo.Constraint(compDict.keys(), pyM.timeSet, rule=basePhaseAngle))
 
@@ -247,6 +253,14 @@ class LOPFModel(TransmissionModel):
         """
         return super().getObjectiveFunctionContribution(esM, pyM)
 
+    def setWarmstartValues(self, pyM, sourcePyM, timeStepMap):
+        """
+        Set the values of the variables to the optimal values of another optimization problem (cf.
+        ComponentModel.setWarmstartValues). The phase angle variables are set as well.
+        """
+        super().setWarmstartValues(pyM, sourcePyM, timeStepMap)
+        self.setOperationWarmstartValues(pyM, sourcePyM, 'phaseAngle', timeStepMap)
+
     def setOptimalValues(self, esM, pyM):
         """
         Set the optimal values of the components.
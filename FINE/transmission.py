@@ -1,8 +1,9 @@
-from FINE.component import Component, ComponentModel
+from FINE.component import Component, ComponentModel, TimeSeriesParameter
 from FINE import utils
 import warnings
 import pyomo.environ as pyomo
 import pandas as pd
+import numpy as np
 
 
 class Transmission(Component):
@@ -12,6 +13,14 @@ class Transmission(Component):
     Last edited: November 28, 2018
     |br| @author: Lara Welder
     """
+    # Time series parameters (kept as NumPy arrays in the time series store of the component)
+    fullOperationRateMax = TimeSeriesParameter('fullOperationRateMax')
+    aggregatedOperationRateMax = TimeSeriesParameter('aggregatedOperationRateMax')
+    operationRateMax = TimeSeriesParameter('operationRateMax')
+    fullOperationRateFix = TimeSeriesParameter('fullOperationRateFix')
+    aggregatedOperationRateFix = TimeSeriesParameter('aggregatedOperationRateFix')
+    operationRateFix = TimeSeriesParameter('operationRateFix')
+
     def __init__(self, esM, name, commodity, losses=0, distances=None,
                  hasCapacityVariable=True, capacityVariableDomain='continuous', capacityPerPlantUnit=1,
                  hasIsBuiltBinaryVariable=False, bigM=None,
@@ -140,6 +149,7 @@ class Transmission(Component):
         self.losses = utils.preprocess2dimData(losses, self._mapC)
         self.distances = utils.checkAndSetDistances(self.distances, self.locationalEligibility, esM)
         self.losses = utils.checkAndSetTransmissionLosses(self.losses, self.distances, self.locationalEligibility)
+        self.setTopology()
         self.modelingClass = TransmissionModel
 
         # Set additional economic data
@@ -171,6 +181,34 @@ class Transmission(Component):
         """
         super().addToEnergySystemModel(esM)
 
+    def setTopology(self):
+        """
+        Function for setting the integer edge indexing of the transmission network of the component. The eligible
+        connections ('loc1_loc2') are numbered consecutively (edge ids). For each edge, the locations, the reverse
+        edge (-1 if the reverse connection is not eligible) and the loss factor (1 - losses * distances) are stored
+        in arrays. Furthermore, the ids of the outgoing and incoming edges are stored for each location. The 2dim
+        constraints and commodity balance contributions are built on these arrays; the connection names are only
+        used for the input data and the indices of the optimization variables.
+        """
+        self._edges = sorted(loc for loc in self._mapC if self.locationalEligibility[loc] == 1)
+        self._edgeIds = {edge: i for i, edge in enumerate(self._edges)}
+        self._edgeLocations = [self._mapC[edge] for edge in self._edges]
+        self._reverseEdges = np.array([self._edgeIds.get(self._mapI[edge], -1) for edge in self._edges], dtype=int)
+        self._lossFactors = (1 - self.losses * self.distances)[self._edges].values.astype(float)
+        edgesOut, edgesIn = {}, {}
+        for i, (loc1, loc2) in enumerate(self._edgeLocations):
+            edgesOut.setdefault(loc1, []).append(i), edgesIn.setdefault(loc2, []).append(i)
+        self._edgesOut = {loc: np.array(edges, dtype=int) for loc, edges in edgesOut.items()}
+        self._edgesIn = {loc: np.array(edges, dtype=int) for loc, edges in edgesIn.items()}
+
+    def getReverseEdge(self, edge):
+        """
+        Return the reverse connection ('loc2_loc1') of an eligible connection ('loc1_loc2') or None if the reverse
+        connection is not eligible.
+        """
+        reverse = self._reverseEdges[self._edgeIds[edge]]
+        return self._edges[reverse] if reverse >= 0 else None
+
     def setTimeSeriesData(self, hasTSA):
         """
         Function for setting the maximum operation rate and fixed operation rate depending on whether a time series
@@ -179,25 +217,38 @@ class Transmission(Component):
         :param hasTSA: states whether a time series aggregation is requested (True) or not (False).
         :type hasTSA: boolean
         """
-        self.operationRateMax = self.aggregatedOperationRateMax if hasTSA else self.fullOperationRateMax
-        self.operationRateFix = self.aggregatedOperationRateFix if hasTSA else self.fullOperationRateFix
+        self.selectTimeSeries('operationRateMax', hasTSA)
+        self.selectTimeSeries('operationRateFix', hasTSA)
 
-    def getDataForTimeSeriesAggregation(self):
-        """ Function for getting the required data if a time series aggregation is requested. """
-        weightDict, data = {}, []
-        weightDict, data = self.prepareTSAInput(self.fullOperationRateFix, self.fullOperationRateMax,
-                                                '_operationRate_', self.tsaWeight, weightDict, data)
-        return (pd.concat(data, axis=1), weightDict) if data else (None, {})
+    def getDataForTimeSeriesAggregation(self, registry):
+        """ Function for registering the required data if a time series aggregation is requested. """
+        rateFix, rateMax = self.getTimeSeries('fullOperationRateFix'), self.getTimeSeries('fullOperationRateMax')
+        self.prepareTSAInput(rateFix, rateMax, '_operationRate_', self.tsaWeight, registry)
 
-    def setAggregatedTimeSeriesData(self, data):
+    def setAggregatedTimeSeriesData(self, registry):
         """
         Function for determining the aggregated maximum rate and the aggregated fixed operation rate.
 
-        :param data: Pandas DataFrame with the clustered time series data of the conversion component
-        :type data: Pandas DataFrame
+        :param registry: column registry with the clustered time series data of the energy system
+        :type registry: TimeSeriesColumnRegistry
         """
-        self.aggregatedOperationRateFix = self.getTSAOutput(self.fullOperationRateFix, '_operationRate_', data)
-        self.aggregatedOperationRateMax = self.getTSAOutput(self.fullOperationRateMax, '_operationRate_', data)
+        rateFix, rateMax = self.getTimeSeries('fullOperationRateFix'), self.getTimeSeries('fullOperationRateMax')
+        self.aggregatedOperationRateFix = self.getTSAOutput(rateFix, '_operationRate_', registry)
+        self.aggregatedOperationRateMax = self.getTSAOutput(rateMax, '_operationRate_', registry)
+
+    def prepareDesignParameter(self, name, data):
+        """
+        Function for converting a design parameter given as a DataFrame (loc1 x loc2) into a Series with the
+        connections as index (cf. Component.updateParameters).
+
+        :param name: name of the design parameter (capacityMin, capacityMax or capacityFix).
+        :type name: string
+
+        :param data: design parameter data.
+        :type data: positive (>=0) float or Pandas DataFrame/Series with positive (>=0) values or None
+        """
+        return utils.preprocess2dimData(data, self._mapC) if name == 'capacityMin' else \
+            utils.preprocess2dimData(data)
 
 
 class TransmissionModel(ComponentModel):
@@ -285,9 +336,17 @@ class TransmissionModel(ComponentModel):
         compDict, abbrvName = self.componentsDict, self.abbrvName
         capVar, capVarSet = getattr(pyM, 'cap_' + abbrvName), getattr(pyM, 'designDimensionVarSet_' + abbrvName)
 
+        # Set of the edges which have a reverse edge
+        def initSymmetricalCapacitySet(pyM):
+            return ((loc, compName) for loc, compName in capVarSet
+                    if compDict[compName].getReverseEdge(loc) is not None)
+        setattr(pyM, 'symmetricalCapacityConstrSet_' + abbrvName,
+                pyomo.Set(dimen=2, initialize=initSymmetricalCapacitySet))
+
         def symmetricalCapacity(pyM, loc, compName):
-            return capVar[loc, compName] == capVar[compDict[compName]._mapI[loc], compName]
-        setattr(pyM, 'ConstrSymmetricalCapacity_' + abbrvName,  pyomo.Constraint(capVarSet, rule=symmetricalCapacity))
+            return capVar[loc, compName] == capVar[compDict[compName].getReverseEdge(loc), compName]
+        setattr(pyM, 'ConstrSymmetricalCapacity_' + abbrvName,
+                pyomo.Constraint(getattr(pyM, 'symmetricalCapacityConstrSet_' + abbrvName), rule=symmetricalCapacity))
 
     def operationMode1_2dim(self, pyM, esM, constrName, constrSetName, opVarName):
         """
@@ -307,9 +366,15 @@ class TransmissionModel(ComponentModel):
         opVar, capVar = getattr(pyM, opVarName + '_' + abbrvName), getattr(pyM, 'cap_' + abbrvName)
         constrSet1 = getattr(pyM, constrSetName + '1_' + abbrvName)
 
+        # The reverse connection of each connection is looked up once in the edge arrays of the component
+        reverseEdges = {(loc, compName): compDict[compName].getReverseEdge(loc) for loc, compName in constrSet1}
+        durations = pyM.timeStepDurations
+
         def op1(pyM, loc, compName, p, t):
-            return opVar[loc, compName, p, t] + opVar[compDict[compName]._mapI[loc], compName, p, t] <= \
-                   capVar[loc, compName] * esM.hoursPerTimeStep
+            reverse = reverseEdges[loc, compName]
+            flow = opVar[loc, compName, p, t] + opVar[reverse, compName, p, t] if reverse is not None else \
+                opVar[loc, compName, p, t]
+            return flow <= capVar[loc, compName] * (esM.hoursPerTimeStep * durations[p, t])
         setattr(pyM, constrName + '_' + abbrvName, pyomo.Constraint(constrSet1, pyM.timeSet, rule=op1))
 
     def declareComponentConstraints(self, esM, pyM):
@@ -383,25 +448,33 @@ class TransmissionModel(ComponentModel):
         :param commod: string
         """
 
-        return any([comp.commodity == commod and
-                    (loc + '_' + loc_ in comp.locationalEligibility.index or
-                     loc_ + '_' + loc in comp.locationalEligibility.index)
-                    for comp in self.componentsDict.values() for loc_ in esM.locations])
+        return any(comp.commodity == commod and (loc in comp._edgesOut or loc in comp._edgesIn)
+                   for comp in self.componentsDict.values())
+
+    def getCommodityBalanceIncidence(self, pyM):
+        """
+        Get the incidence of the operation variables in the commodity balances (cf. ComponentModel). The commodity
+        flow from loc1 to loc2 leaves loc1 completely and arrives at loc2 reduced by the transmission losses.
+        """
+        compDict, abbrvName = self.componentsDict, self.abbrvName
+        opVar, incidence = getattr(pyM, 'op_' + abbrvName), {}
+        for compName, comp in compDict.items():
+            for edge, (loc1, loc2), factor in zip(comp._edges, comp._edgeLocations, comp._lossFactors.tolist()):
+                incidence.setdefault((loc1, comp.commodity), []).append((opVar, (edge, compName), -1))
+                if factor != 0:
+                    incidence.setdefault((loc2, comp.commodity), []).append((opVar, (edge, compName), factor))
+        return incidence
 
     def getCommodityBalanceContribution(self, pyM, commod, loc, p, t):
         """ Get contribution to a commodity balance. """
         compDict, abbrvName = self.componentsDict, self.abbrvName
-        opVar, opVarDictIn = getattr(pyM, 'op_' + abbrvName), getattr(pyM, 'operationVarDictIn_' + abbrvName)
-        opVarDictOut = getattr(pyM, 'operationVarDictOut_' + abbrvName)
-        return sum(opVar[loc_ + '_' + loc, compName, p, t] *
-                   (1 - compDict[compName].losses[loc_ + '_' + loc] * compDict[compName].distances[loc_ + '_' + loc])
-                   for loc_ in opVarDictIn[loc].keys()
-                   for compName in opVarDictIn[loc][loc_]
-                   if commod in compDict[compName].commodity) - \
-               sum(opVar[loc + '_' + loc_, compName, p, t]
-                   for loc_ in opVarDictOut[loc].keys()
-                   for compName in opVarDictOut[loc][loc_]
-                   if commod in compDict[compName].commodity)
+        opVar, empty = getattr(pyM, 'op_' + abbrvName), np.array([], dtype=int)
+        return sum(opVar[comp._edges[e], compName, p, t] * comp._lossFactors[e]
+                   for compName, comp in compDict.items() if comp.commodity == commod
+                   for e in comp._edgesIn.get(loc, empty)) - \
+            sum(opVar[comp._edges[e], compName, p, t]
+                for compName, comp in compDict.items() if comp.commodity == commod
+                for e in comp._edgesOut.get(loc, empty))
 
     def getObjectiveFunctionContribution(self, esM, pyM):
         """
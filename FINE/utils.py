@@ -4,7 +4,13 @@ Last edited: March 26, 2019
 @author: Lara Welder
 """
 import warnings
+import time
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
+import pyomo.environ as pyomo
+from pyomo.core.expr.visitor import identify_variables
 import FINE as fn
 
 def isString(string):
@@ -526,28 +532,111 @@ def checkAndSetTimeSeriesCostParameter(esM, name, data, locationalEligibility, d
     else:
         return None
 
-def checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, totalNumberOfTimeSteps):
+def checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, totalNumberOfTimeSteps,
+                         cacheDirectory=None, maxCacheSize=1024, numberOfSegmentsPerPeriod=None,
+                         additionalPeriods=None):
     isStrictlyPositiveInt(numberOfTypicalPeriods), isStrictlyPositiveInt(numberOfTimeStepsPerPeriod)
+    if cacheDirectory is not None and not isinstance(cacheDirectory, str):
+        raise TypeError('The cacheDirectory parameter has to be a string or None.')
+    isStrictlyPositiveNumber(maxCacheSize)
+    if numberOfSegmentsPerPeriod is not None:
+        isStrictlyPositiveInt(numberOfSegmentsPerPeriod)
+        if numberOfSegmentsPerPeriod > numberOfTimeStepsPerPeriod:
+            raise ValueError('The numberOfSegmentsPerPeriod cannot be larger than the numberOfTimeStepsPerPeriod.')
     if not totalNumberOfTimeSteps % numberOfTimeStepsPerPeriod == 0:
         raise ValueError('The numberOfTimeStepsPerPeriod has to be an integer divisor of the total number of time\n' +
                          ' steps considered in the energy system model.')
     if totalNumberOfTimeSteps < numberOfTypicalPeriods * numberOfTimeStepsPerPeriod:
         raise ValueError('The product of the numberOfTypicalPeriods and the numberOfTimeStepsPerPeriod has to be \n' +
                          'smaller than the total number of time steps considered in the energy system model.')
-
-
-def checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesDataClustered):
+    if additionalPeriods is not None:
+        if not isinstance(additionalPeriods, list) or \
+                any(not type(period) == int or period < 0 for period in additionalPeriods):
+            raise TypeError('The additionalPeriods parameter has to be a list of nonnegative integers or None.')
+        if any(period >= totalNumberOfTimeSteps // numberOfTimeStepsPerPeriod for period in additionalPeriods) or \
+                len(set(additionalPeriods)) != len(additionalPeriods):
+            raise ValueError('The additionalPeriods have to be unique indices of the periods of the time series data.')
+        if additionalPeriods and numberOfSegmentsPerPeriod is not None:
+            raise ValueError('Additional periods can not be combined with segmentation.')
+
+
+def checkClusterSweepInput(candidates, numberOfTimeStepsPerPeriod, totalNumberOfTimeSteps, errorMetric,
+                           errorBudget, processes):
+    if not hasattr(candidates, '__iter__') or len(list(candidates)) == 0:
+        raise TypeError('The candidates parameter has to be a non-empty list of integers.')
+    for numberOfTypicalPeriods in candidates:
+        checkClusteringInput(numberOfTypicalPeriods, numberOfTimeStepsPerPeriod, totalNumberOfTimeSteps)
+    if errorMetric not in ['RMSE', 'RMSE duration', 'Peak error']:
+        raise ValueError('The errorMetric parameter has to be \'RMSE\', \'RMSE duration\' or \'Peak error\'.')
+    if errorBudget is not None:
+        isPositiveNumber(errorBudget)
+    if processes is not None:
+        isStrictlyPositiveInt(processes)
+
+
+def checkAdaptiveClusteringInput(numberOfAddedPeriods, tolerance, maxIterations):
+    isStrictlyPositiveInt(numberOfAddedPeriods), isPositiveNumber(tolerance), isStrictlyPositiveInt(maxIterations)
+
+
+def checkResamplingInput(hoursPerTimeStep, currentHoursPerTimeStep, totalNumberOfTimeSteps):
+    isStrictlyPositiveNumber(hoursPerTimeStep)
+    factor = hoursPerTimeStep / currentHoursPerTimeStep
+    if factor < 1 or not np.isclose(factor, round(factor)):
+        raise ValueError('The hoursPerTimeStep has to be an integer multiple of the current hours per time step.')
+    if not totalNumberOfTimeSteps % int(round(factor)) == 0:
+        raise ValueError('The number of time steps which are merged into one time step (hoursPerTimeStep divided\n' +
+                         'by the current hours per time step) has to be an integer divisor of the total number of\n' +
+                         'time steps considered in the energy system model.')
+
+
+def checkRollingHorizonInput(windowLength, overlap, totalNumberOfTimeSteps, componentModelingDict):
+    isStrictlyPositiveInt(windowLength)
+    if not type(overlap) == int or overlap < 0:
+        raise TypeError('The overlap parameter has to be a nonnegative integer.')
+    if overlap >= windowLength:
+        raise ValueError('The overlap has to be smaller than the windowLength.')
+    if windowLength > totalNumberOfTimeSteps:
+        raise ValueError('The windowLength cannot be larger than the total number of time steps considered in the\n' +
+                         'energy system model.')
+    for mdl in componentModelingDict.values():
+        for compName, comp in mdl.componentsDict.items():
+            if (comp.hasCapacityVariable and comp.capacityFix is None) or \
+                    (comp.hasIsBuiltBinaryVariable and comp.isBuiltFix is None):
+                raise ValueError('The rolling horizon optimization requires fixed capacities (and fixed binary\n' +
+                                 'design decisions) of all components. These are not given for ' + compName + '.')
+
+
+def checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesDataClustered, buildBackend='rules',
+                                         useVariableBounds=False, useMutableParameters=False,
+                                         rebuildChangedOnly=False, profileBuild=False):
     if not isinstance(timeSeriesAggregation, bool):
         raise TypeError('The timeSeriesAggregation parameter has to be a boolean.')
 
+    if buildBackend not in ['rules', 'arrays']:
+        raise ValueError('The buildBackend parameter has to be either \'rules\' or \'arrays\'.')
+
+    if not isinstance(useVariableBounds, bool):
+        raise TypeError('The useVariableBounds parameter has to be a boolean.')
+
+    if not isinstance(useMutableParameters, bool):
+        raise TypeError('The useMutableParameters parameter has to be a boolean.')
+
+    if not isinstance(rebuildChangedOnly, bool):
+        raise TypeError('The rebuildChangedOnly parameter has to be a boolean.')
+
+    if not isinstance(profileBuild, bool):
+        raise TypeError('The profileBuild parameter has to be a boolean.')
+
     if timeSeriesAggregation and not isTimeSeriesDataClustered:
         raise ValueError('The time series flag indicates possible inconsistencies in the aggregated time series '
                          ' data.\n--> Call the cluster function first, then the optimize function.')
 
 
 def checkOptimizeInput(timeSeriesAggregation, isTimeSeriesDataClustered, logFileName, threads, solver,
-                       timeLimit, optimizationSpecs, warmstart):
-    checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesDataClustered)
+                       timeLimit, optimizationSpecs, warmstart, buildBackend='rules', useVariableBounds=False,
+                       useMutableParameters=False, rebuildChangedOnly=False, profileBuild=False):
+    checkDeclareOptimizationProblemInput(timeSeriesAggregation, isTimeSeriesDataClustered, buildBackend,
+                                         useVariableBounds, useMutableParameters, rebuildChangedOnly, profileBuild)
 
     if not isinstance(logFileName, str):
         raise TypeError('The logFileName parameter has to be a string.')
@@ -568,6 +657,31 @@ def checkOptimizeInput(timeSeriesAggregation, isTimeSeriesDataClustered, logFile
         raise ValueError('The warmstart parameter has to be a boolean.')
 
 
+def checkWarmstartModel(esM, warmstartModel, timeSeriesAggregation):
+    if timeSeriesAggregation:
+        raise ValueError('The variables can only be initialized with the optimal values of another energy system\n' +
+                         'model if the full time series data is considered (timeSeriesAggregation=False).')
+    if warmstartModel.pyM is None or warmstartModel.pyM.problemWriter is not None:
+        raise ValueError('The optimization problem of the energy system model which is used for the warm start has\n' +
+                         'to be optimized.')
+    if len(esM.totalTimeSteps) != len(warmstartModel.totalTimeSteps) or \
+            esM.hoursPerTimeStep != warmstartModel.hoursPerTimeStep:
+        raise ValueError('The energy system model which is used for the warm start has to have the same time horizon.')
+    if esM.componentNames != warmstartModel.componentNames:
+        raise ValueError('The energy system model which is used for the warm start has to have the same components.')
+
+
+def checkWriteOptimizationProblemInput(fileName, fileFormat, mappingFileName):
+    if not isinstance(fileName, str):
+        raise TypeError('The fileName parameter has to be a string.')
+
+    if fileFormat not in ['lp', 'mps']:
+        raise ValueError('The fileFormat parameter has to be either \'lp\' or \'mps\'.')
+
+    if mappingFileName is not None and not isinstance(mappingFileName, str):
+        raise TypeError('The mappingFileName parameter has to be a string or None.')
+
+
 def setFormattedTimeSeries(timeSeries):
     if timeSeries is None:
         return timeSeries
@@ -584,6 +698,53 @@ def buildFullTimeSeries(df, periodsOrder):
     return pd.concat(data, axis=1, ignore_index=True)
 
 
+def getAggregationErrors(original, predicted, weightDict=None):
+    """
+    Compute error metrics of aggregated (e.g. clustered) time series data with respect to the original time series
+    data. The time series are normalized with the range of the original values such that the errors of different
+    time series are comparable. The metrics are the root mean squared error ('RMSE'), the root mean squared error
+    of the duration curves ('RMSE duration') and the absolute error of the peak value ('Peak error').
+
+    :param original: original time series data (one column per time series).
+    :type original: pandas DataFrame
+
+    :param predicted: aggregated time series data with the same shape and columns as the original data (e.g. the
+        typical periods placed in the order of the periods).
+    :type predicted: pandas DataFrame
+
+    :param weightDict: weights of the time series. Time series without a weight are weighted with 1.
+        |br| * the default value is None
+    :type weightDict: dictionary or None
+
+    :return: error metrics (columns) and weights (column 'Weight') of each time series (rows)
+    :rtype: pandas DataFrame
+    """
+    values, predictedValues = original.values.astype(float), predicted[original.columns].values.astype(float)
+    valueRange = values.max(axis=0) - values.min(axis=0)
+    valueRange[valueRange == 0] = 1
+    values, predictedValues = values / valueRange, predictedValues / valueRange
+    errors = pd.DataFrame(index=original.columns)
+    errors['RMSE'] = np.sqrt(((predictedValues - values) ** 2).mean(axis=0))
+    errors['RMSE duration'] = np.sqrt(((np.sort(predictedValues, axis=0) - np.sort(values, axis=0)) ** 2).mean(axis=0))
+    errors['Peak error'] = np.abs(predictedValues.max(axis=0) - values.max(axis=0))
+    errors['Weight'] = [1 if weightDict is None else weightDict.get(col, 1) for col in original.columns]
+    return errors
+
+
+def getWeightedAggregationErrors(errors):
+    """
+    Compute the weighted mean of the error metrics of all time series (cf. getAggregationErrors).
+
+    :param errors: error metrics and weights of the time series.
+    :type errors: pandas DataFrame
+
+    :return: weighted error metrics
+    :rtype: pandas Series
+    """
+    weights = errors['Weight']
+    return errors.drop(columns='Weight').mul(weights, axis=0).sum() / (weights.sum() if weights.sum() > 0 else 1)
+
+
 def formatOptimizationOutput(data, varType, dimension, periodsOrder=None, compDict=None):
     # If data is an empty dictionary (because no variables of that type were declared) return None
     if not data:
@@ -685,6 +846,98 @@ def output(output, verbose, val):
     if verbose == val:
         print(output)
 
+
+class BuildProfiler(object):
+    """
+    The BuildProfiler class records statistics of the pyomo components (sets, parameters, variables, constraints and
+    the objective) which are declared when the optimization problem of an energy system model is built. For each
+    component, the declaration time (including the preparation of its data since the previous component was
+    declared) and the number of rows or variables are recorded. Optionally, the number of nonzeros and the peak
+    memory allocated for the component are recorded as well.
+    """
+    def __init__(self, detailed=False):
+        """
+        Constructor for creating a BuildProfiler class instance.
+
+        :param detailed: states if the number of nonzeros and the peak memory are recorded as well (True). This
+            slows down the declaration of the optimization problem considerably.
+            |br| * the default value is False
+        :type detailed: boolean
+        """
+        self.detailed = detailed
+        self.records = []
+        self._depth = 0
+        # Memory is only traced if it is not already traced elsewhere since clearing the traces would interfere
+        self._tracesMemory = detailed and not tracemalloc.is_tracing()
+        if self._tracesMemory:
+            tracemalloc.start()
+        self.startSection('EnergySystemModel')
+
+    def startSection(self, section):
+        """ Start recording the components of a section of the model (i.e. of a modeling class). """
+        self.section = section
+        self._reset()
+
+    def _reset(self):
+        if self._tracesMemory:
+            tracemalloc.clear_traces()
+        self._time = time.time()
+
+    @contextmanager
+    def profile(self, component):
+        """
+        Record the component after it was added to the model. Components which are implicitly added while another
+        component is added (e.g. index sets) are included in the statistics of the latter. Blocks are not recorded
+        themselves since the components declared in them are recorded.
+        """
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+        if self._depth == 0 and self.getComponentType(component) is not pyomo.Block:
+            self.record(component)
+
+    @staticmethod
+    def getComponentType(component):
+        """ Return the type of a pyomo component (ctype, which is called type() in pyomo versions before 5.7). """
+        return component.ctype if hasattr(component, 'ctype') else component.type()
+
+    def record(self, component):
+        """ Record the statistics of a pyomo component. """
+        buildTime = time.time() - self._time
+        peakMemory = tracemalloc.get_traced_memory()[1] / 1e6 if self._tracesMemory else float('nan')
+        ctype = self.getComponentType(component)
+        rows = len(component) if ctype is pyomo.Constraint else 0
+        variables = len(component) if ctype is pyomo.Var else 0
+        nonzeros = float('nan')
+        if self.detailed and ctype is pyomo.Constraint:
+            nonzeros = sum(len(list(identify_variables(component[index].body, include_fixed=False)))
+                           for index in component)
+        elif self.detailed and ctype is pyomo.Objective:
+            nonzeros = len(list(identify_variables(component.expr, include_fixed=False)))
+        self.records.append((self.section, component.local_name, ctype.__name__, buildTime, rows, variables,
+                             nonzeros, peakMemory))
+        self._reset()
+
+    def stop(self):
+        """ Stop tracing the memory. """
+        if self._tracesMemory:
+            tracemalloc.stop()
+            self._tracesMemory = False
+
+    def getProfile(self):
+        """
+        Return the recorded statistics.
+
+        :return: statistics with the modeling class (respectively 'EnergySystemModel' for the component
+            overreaching parts of the model) and the component name as index.
+        :rtype: pandas DataFrame
+        """
+        profile = pd.DataFrame(self.records, columns=['Modeling class', 'Component', 'Type', 'Time [s]', 'Rows',
+                                                      'Variables', 'Nonzeros', 'Peak memory [MB]'])
+        return profile.set_index(['Modeling class', 'Component'])
+
 def checkModelClassEquality(esM, file):
     mdlListFromModel = list(esM.componentModelingDict.keys())
     mdlListFromExcel = []
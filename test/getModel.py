@@ -0,0 +1,58 @@
+"""
+Small two-region energy system model and helper functions which are shared by the tests of the declaration and the
+optimization of the optimization problem.
+"""
+import FINE as fn
+import pandas as pd
+import numpy as np
+import pyomo.environ as pyomo
+from pyomo.repn import generate_standard_repn
+
+
+def getModel():
+    locations = {'loc1', 'loc2'}
+    commodities = {'electricity', 'hydrogen'}
+    commodityUnitDict = {'electricity': r'GW$_{el}$', 'hydrogen': r'GW$_{H_{2},LHV}$'}
+    numberOfTimeSteps = 48
+
+    esM = fn.EnergySystemModel(locations=locations, commodities=commodities, numberOfTimeSteps=numberOfTimeSteps,
+                               commodityUnitsDict=commodityUnitDict, hoursPerTimeStep=2, costUnit='1e9 Euro',
+                               lengthUnit='km', verboseLogLevel=2)
+
+    np.random.seed(42)
+    profile = pd.DataFrame(np.random.rand(numberOfTimeSteps, 2), columns=['loc1', 'loc2'])
+    demand = pd.DataFrame(np.random.rand(numberOfTimeSteps, 2) + 1, columns=['loc1', 'loc2'])
+
+    esM.add(fn.Source(esM=esM, name='Wind', commodity='electricity', hasCapacityVariable=True,
+                      operationRateMax=profile, investPerCapacity=1))
+    esM.add(fn.Source(esM=esM, name='Run-of-river', commodity='electricity', hasCapacityVariable=True,
+                      operationRateFix=profile, capacityFix=pd.Series([1, 2], index=['loc1', 'loc2'])))
+    esM.add(fn.Source(esM=esM, name='Import', commodity='electricity', hasCapacityVariable=False,
+                      operationRateMax=demand, commodityCost=0.1))
+    esM.add(fn.Conversion(esM=esM, name='Electrolyzer', physicalUnit=r'GW$_{el}$',
+                          commodityConversionFactors={'electricity': -1, 'hydrogen': 0.7},
+                          hasCapacityVariable=True, investPerCapacity=0.5))
+    esM.add(fn.Storage(esM=esM, name='Battery', commodity='electricity', chargeRate=0.5,
+                       dischargeOpRateMax=profile, investPerCapacity=0.2))
+    distances = pd.DataFrame([[0, 100], [100, 0]], index=['loc1', 'loc2'], columns=['loc1', 'loc2'])
+    esM.add(fn.Transmission(esM=esM, name='Cable', commodity='electricity', distances=distances, losses=0.0001,
+                            investPerCapacity=0.1))
+    esM.add(fn.Sink(esM=esM, name='Electricity demand', commodity='electricity', hasCapacityVariable=False,
+                    operationRateFix=demand))
+    esM.add(fn.Sink(esM=esM, name='Hydrogen demand', commodity='hydrogen', hasCapacityVariable=False,
+                    operationRateFix=demand * 0.5))
+    return esM
+
+
+def getConstraintRows(pyM):
+    rows, names = {}, {}
+    for constr in pyM.component_objects(pyomo.Constraint):
+        for index in constr:
+            repn = generate_standard_repn(constr[index].body)
+            coefficients = {var.getname(fully_qualified=True, name_buffer=names): round(pyomo.value(coef), 10)
+                            for var, coef in zip(repn.linear_vars, repn.linear_coefs) if pyomo.value(coef) != 0}
+            lower, upper = constr[index].lower, constr[index].upper
+            rows[constr.name, index] = (None if lower is None else round(pyomo.value(lower) - repn.constant, 10),
+                                        None if upper is None else round(pyomo.value(upper) - repn.constant, 10),
+                                        coefficients, constr[index].equality)
+    return rows
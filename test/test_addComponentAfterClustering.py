@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that components which are added after the time series data was clustered are aggregated with the stored
+# cluster order.
+
+import os
+import sys
+import FINE as fn
+import pandas as pd
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_addComponentAfterClustering():
+    esM = getModel()
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12)
+    wind = esM.getComponent('Wind')
+    data, profile = wind.aggregatedOperationRateMax, wind.fullOperationRateMax
+
+    # Components are aggregated with the stored cluster order without re-clustering the time series data
+    esM.add(fn.Conversion(esM=esM, name='Fuel cell', physicalUnit=r'GW$_{el}$',
+                          commodityConversionFactors={'electricity': 1, 'hydrogen': -2}, hasCapacityVariable=True))
+    esM.add(fn.Source(esM=esM, name='Wind', commodity='electricity', hasCapacityVariable=True,
+                      operationRateMax=pd.DataFrame(profile.values, columns=profile.columns), investPerCapacity=1))
+    assert esM.isTimeSeriesDataClustered
+    assert np.allclose(esM.getComponent('Wind').aggregatedOperationRateMax.values, data.values, atol=1e-2)
+
+    solver = 'glpk'
+    esM.optimize(timeSeriesAggregation=False, solver=solver)
+    esM.optimize(timeSeriesAggregation=True, solver=solver)
+    assert len(esM.pyM.timeSet) == 24
+
+
+if __name__ == "__main__":
+    test_addComponentAfterClustering()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that the rule-based and the array-based build backend of the operation mode constraints result in the
+# same optimization problem and that the problem of the array-based backend can be written and solved by pyomo.
+
+import os
+import tempfile
+import sys
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel, getConstraintRows
+
+
+def test_buildBackend():
+    esM = getModel()
+
+    for timeSeriesAggregation in [False, True]:
+        if timeSeriesAggregation:
+            esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12)
+
+        esM.declareOptimizationProblem(timeSeriesAggregation=timeSeriesAggregation, buildBackend='rules')
+        rulesRows = getConstraintRows(esM.pyM)
+        esM.declareOptimizationProblem(timeSeriesAggregation=timeSeriesAggregation, buildBackend='arrays')
+        arraysRows = getConstraintRows(esM.pyM)
+
+        # All rows of the operation mode constraints are recorded by the profiler
+        assert esM.solverSpecs['buildProfile']['Rows'].sum() == len(arraysRows)
+
+        assert rulesRows.keys() == arraysRows.keys()
+        for key in rulesRows:
+            assert rulesRows[key] == arraysRows[key], key
+
+
+def test_buildBackendSolve():
+    solver = 'glpk'
+
+    esM = getModel()
+    esM.optimize(solver=solver, buildBackend='rules')
+    obj = pyomo.value(esM.pyM.Obj)
+
+    # The problem of the array-based backend is written by pyomo's problem writer and solved by a pyomo solver
+    esM.optimize(solver=solver, buildBackend='arrays')
+    assert np.isclose(pyomo.value(esM.pyM.Obj), obj)
+
+    fileName = os.path.join(tempfile.mkdtemp(), 'problem.lp')
+    esM.pyM.write(fileName, io_options={'symbolic_solver_labels': True})
+    assert os.path.getsize(fileName) > 0
+    with open(fileName) as file:
+        assert 'ConstrOperation' in file.read()
+
+
+if __name__ == "__main__":
+    test_buildBackend()
+    test_buildBackendSolve()
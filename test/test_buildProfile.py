@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that the build profile records all rows of the declared optimization problem.
+
+import os
+import sys
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel, getConstraintRows
+
+
+def test_buildProfile():
+    esM = getModel()
+    esM.declareOptimizationProblem(timeSeriesAggregation=False, profileBuild=True)
+    profile = esM.solverSpecs['buildProfile']
+
+    assert ('StorageModel', 'ConstrConnectSOC_stor') in profile.index
+    assert ('EnergySystemModel', 'commodityBalanceConstraint') in profile.index
+    assert profile['Rows'].sum() == len(getConstraintRows(esM.pyM))
+    assert profile['Variables'].sum() == len(list(esM.pyM.component_data_objects(pyomo.Var)))
+    assert (profile.loc[profile['Rows'] > 0, 'Nonzeros'] > 0).all()
+    assert (profile['Time [s]'] >= 0).all()
+
+
+if __name__ == "__main__":
+    test_buildProfile()
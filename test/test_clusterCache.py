@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that the results of the time series aggregation are stored in and loaded from the cluster cache and
+# that the least recently used entries are removed if the cache exceeds its maximum size.
+
+import os
+import tempfile
+import sys
+import FINE as fn
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_clusterCache():
+    esM = getModel()
+    cacheDirectory = tempfile.mkdtemp()
+
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12, cacheDirectory=cacheDirectory)
+    data, periodsOrder = esM.getComponent('Wind').aggregatedOperationRateMax, esM.periodsOrder
+    assert len(os.listdir(cacheDirectory)) == 1
+
+    # Load the clustering results from the cache without calling the tsam package
+    aggregation = fn.energySystemModel.TimeSeriesAggregation
+    fn.energySystemModel.TimeSeriesAggregation = None
+    try:
+        esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12, cacheDirectory=cacheDirectory)
+    finally:
+        fn.energySystemModel.TimeSeriesAggregation = aggregation
+    assert esM.getComponent('Wind').aggregatedOperationRateMax.equals(data)
+    assert (esM.periodsOrder == periodsOrder).all()
+
+    # A different clustering is stored as a new entry, the least recently used one is removed if the cache is full
+    esM.cluster(numberOfTypicalPeriods=3, numberOfTimeStepsPerPeriod=12, cacheDirectory=cacheDirectory)
+    assert len(os.listdir(cacheDirectory)) == 2
+    esM.cluster(numberOfTypicalPeriods=4, numberOfTimeStepsPerPeriod=12, cacheDirectory=cacheDirectory,
+                maxCacheSize=1e-6)
+    assert len(os.listdir(cacheDirectory)) == 1
+
+
+if __name__ == "__main__":
+    test_clusterCache()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check the sweep over the number of typical periods and the selection of the number of typical periods with an
+# error budget.
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_clusterSweep():
+    esM = getModel()
+    summary, errors = esM.clusterSweep([1, 2, 3], numberOfTimeStepsPerPeriod=12, errorBudget=0.3, processes=2)
+
+    assert list(summary.index) == [1, 2, 3]
+    assert (summary['RMSE'].diff().dropna() <= 0).all()
+    assert len(errors.loc[2]) == len(esM.getTimeSeriesDataForClustering()[0].columns)
+    assert esM.isTimeSeriesDataClustered
+    numberOfTypicalPeriods = len(esM.typicalPeriods)
+    assert summary.loc[numberOfTypicalPeriods, 'RMSE'] <= 0.3
+
+    # The applied candidate equals the result of the cluster function
+    data = esM.getComponent('Wind').aggregatedOperationRateMax
+    esM.cluster(numberOfTypicalPeriods=numberOfTypicalPeriods, numberOfTimeStepsPerPeriod=12)
+    assert esM.getComponent('Wind').aggregatedOperationRateMax.equals(data)
+
+
+if __name__ == "__main__":
+    test_clusterSweep()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check the in-memory assembly of the optimization problem for the HiGHS interface.
+
+import os
+import sys
+import numpy as np
+import pyomo.environ as pyomo
+import pyomo.opt as opt
+from FINE.IOManagement import inMemorySolver
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_inMemorySolver():
+    esM = getModel()
+    esM.optimize(solver='glpk')
+    objective = pyomo.value(esM.pyM.Obj)
+    numberOfConstraints = len(list(esM.pyM.component_data_objects(pyomo.Constraint, active=True)))
+
+    matrix = inMemorySolver.ProblemMatrix(esM.pyM)
+    values = np.array([varData.value for varData in matrix.variables])
+    activities = matrix.getRowActivities(values)
+    assert matrix.numberOfRows == numberOfConstraints
+    assert len(list(esM.pyM.component_data_objects(pyomo.Constraint, active=True))) == numberOfConstraints
+    assert np.isclose(np.dot(matrix.getObjectiveCoefficients(), values) + matrix.objectiveConstant, objective)
+    assert (activities >= np.array(matrix.rowLower) - 1e-5).all()
+    assert (activities <= np.array(matrix.rowUpper) + 1e-5).all()
+
+    # Without a valid primal solution no output is generated (even if HiGHS reports an optimal model status)
+    assert inMemorySolver.getSolverStatus('kOptimal', True) == \
+        (opt.SolverStatus.ok, opt.TerminationCondition.optimal)
+    assert inMemorySolver.getSolverStatus('kOptimal', False)[0] == opt.SolverStatus.error
+    assert inMemorySolver.getSolverStatus('kTimeLimit', True)[0] == opt.SolverStatus.warning
+    assert inMemorySolver.getSolverStatus('kTimeLimit', False)[0] == opt.SolverStatus.aborted
+
+    if inMemorySolver.highspy is None:
+        try:
+            esM.optimize(solver='highs_inmemory')
+        except ImportError:
+            pass
+        else:
+            raise AssertionError('An ImportError should be raised if highspy is not installed.')
+        # The optimal values of the previous optimization are kept
+        assert np.isclose(pyomo.value(esM.pyM.Obj), objective)
+    else:
+        # HiGHS solves with different numbers of threads in the same process (cf. its global task scheduler)
+        for threads in [1, 2, 0, 1]:
+            esM.optimize(solver='highs_inmemory', threads=threads)
+            assert np.isclose(pyomo.value(esM.pyM.Obj), objective)
+
+        try:
+            esM.optimize(solver='highs_inmemory', optimizationSpecs='unknown_option=1')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('A ValueError should be raised if a HiGHS option can not be set.')
+
+
+if __name__ == "__main__":
+    test_inMemorySolver()
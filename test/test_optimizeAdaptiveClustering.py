@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check the adaptive refinement of the typical periods.
+
+import os
+import sys
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_optimizeAdaptiveClustering():
+    esM = getModel()
+
+    # Additional periods are represented by themselves
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12, additionalPeriods=[1])
+    assert len(esM.typicalPeriods) == 3 and esM.clusterOrder[1] == 2
+    assert np.allclose(esM.getComponent('Wind').aggregatedOperationRateMax.loc[2].values,
+                       esM.getComponent('Wind').fullOperationRateMax.values[12:24])
+    assert esM.getPeriodRepresentationErrors()[1] == 0
+
+    iterations = esM.optimizeAdaptiveClustering(numberOfTypicalPeriods=1, numberOfTimeStepsPerPeriod=12, tolerance=0,
+                                                solver='glpk')
+    assert list(iterations['numberOfTypicalPeriods']) == list(range(1, len(iterations) + 1))
+    assert np.isnan(iterations['relativeChange'][0]) and iterations['addedPeriods'].iloc[-1] == []
+    assert len(esM.typicalPeriods) == len(iterations) and np.isclose(pyomo.value(esM.pyM.Obj),
+                                                                     iterations['objective'].iloc[-1])
+
+
+if __name__ == "__main__":
+    test_optimizeAdaptiveClustering()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check the optimization of the design with the clustered and of the dispatch with the full time series data.
+
+import os
+import sys
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_optimizeDesignAndDispatch():
+    esM = getModel()
+    esM.cluster(numberOfTypicalPeriods=4, numberOfTimeStepsPerPeriod=12)
+
+    gap = esM.optimizeDesignAndDispatch(solver='glpk', useVariableBounds=True)
+    capacities = esM.componentModelingDict['ConversionModel'].capacityVariablesOptimum
+    assert not esM.pyM.hasTSA and np.isclose(gap['gap'], 0, atol=1e-6)
+    assert np.isclose(gap['dispatchObjective'], pyomo.value(esM.pyM.Obj))
+
+    # The design variables of the dispatch optimization are fixed to the optimal values of the design optimization
+    for mdl in esM.componentModelingDict.values():
+        for varName in ['cap', 'nbReal', 'nbInt', 'designBin']:
+            block = getattr(esM.pyM, mdl.abbrvName)
+            assert all(var.fixed for var in getattr(block, varName + '_' + mdl.abbrvName).values())
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+    assert np.allclose(esM.componentModelingDict['ConversionModel'].capacityVariablesOptimum, capacities)
+
+
+if __name__ == "__main__":
+    test_optimizeDesignAndDispatch()
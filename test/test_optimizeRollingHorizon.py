@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check the rolling horizon optimization of the operation with fixed capacities.
+
+import os
+import sys
+import pandas as pd
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_optimizeRollingHorizon():
+    esM = getModel()
+    esM.optimize(timeSeriesAggregation=False, solver='glpk')
+    for mdl in esM.componentModelingDict.values():
+        capacities = mdl.getDesignVariableValues(getattr(esM.pyM, mdl.abbrvName))['cap']
+        for compName, comp in mdl.componentsDict.items():
+            if comp.hasCapacityVariable:
+                comp.capacityFix = pd.Series({loc: value for (loc, name), value in capacities.items()
+                                              if name == compName})
+    esM.optimize(timeSeriesAggregation=False, solver='glpk')
+    fullObj = pyomo.value(esM.pyM.Obj)
+    srcSnk = esM.componentModelingDict['SourceSinkModel']
+    fullImport = srcSnk.operationVariablesOptimum.loc['Import'].values.sum()
+
+    # One window which covers all time steps results in the same optimization problem
+    objectives = esM.optimizeRollingHorizon(windowLength=48, solver='glpk')
+    assert list(objectives.index) == [0] and np.isclose(objectives[0], fullObj)
+
+    # The stitched results cover all time steps and are a feasible (but not necessarily optimal) operation
+    objectives = esM.optimizeRollingHorizon(windowLength=16, overlap=4, solver='glpk')
+    assert list(objectives.index) == [0, 12, 24, 36] and len(esM.totalTimeSteps) == 48
+    demand = srcSnk.operationVariablesOptimum.loc['Electricity demand']
+    assert np.allclose(demand.T.values, esM.getComponent('Electricity demand').fullOperationRateFix[demand.index])
+    assert srcSnk.operationVariablesOptimum.loc['Import'].values.sum() >= fullImport - 1e-6
+    assert esM.getComponent('Battery')._stateOfChargeVariablesOptimum.shape == (2, 48)
+
+
+if __name__ == "__main__":
+    test_optimizeRollingHorizon()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that rebuilding only the modeling classes whose components changed results in the same optimization
+# problem as a full rebuild.
+
+import os
+import sys
+import FINE as fn
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel, getConstraintRows
+
+
+def test_rebuildChangedOnly():
+    solver = 'glpk'
+
+    esM = getModel()
+    esM.optimize(timeSeriesAggregation=False, solver=solver)
+    sourceSinkBlock = esM.pyM.srcSnk
+
+    # Overwrite the storage component and only rebuild the storage block
+    esM.add(fn.Storage(esM=esM, name='Battery', commodity='electricity', chargeRate=0.25, investPerCapacity=0.05))
+    assert esM.changedModelingClasses == {'StorageModel'}
+    esM.optimize(timeSeriesAggregation=False, solver=solver, rebuildChangedOnly=True)
+    rebuiltObj, rebuiltRows = pyomo.value(esM.pyM.Obj), getConstraintRows(esM.pyM)
+    assert esM.pyM.srcSnk is sourceSinkBlock
+    assert not esM.changedModelingClasses
+
+    # Declare the whole optimization problem anew
+    esM.optimize(timeSeriesAggregation=False, solver=solver)
+    assert esM.pyM.srcSnk is not sourceSinkBlock
+    assert np.isclose(rebuiltObj, pyomo.value(esM.pyM.Obj))
+    assert rebuiltRows == getConstraintRows(esM.pyM)
+
+
+if __name__ == "__main__":
+    test_rebuildChangedOnly()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check the resampling of the time series data to a coarser time resolution.
+
+import os
+import sys
+import FINE as fn
+import pandas as pd
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_resample():
+    esM = getModel()
+    np.random.seed(1)
+    rate, price = pd.DataFrame(np.random.rand(48, 2), columns=['loc1', 'loc2']) * 0.1, \
+        pd.DataFrame(np.random.rand(48, 2), columns=['loc1', 'loc2'])
+    esM.add(fn.Source(esM=esM, name='Hydrogen import', commodity='hydrogen', hasCapacityVariable=False,
+                      operationRateFix=rate, commodityCostTimeSeries=price))
+    cost = (rate.values * price.values).sum()
+    demand = esM.getComponent('Electricity demand').fullOperationRateFix.sum()
+    wind = esM.getComponent('Wind').fullOperationRateMax.mean()
+
+    errors = esM.resample(hoursPerTimeStep=6)
+    assert len(esM.totalTimeSteps) == 16 and esM.hoursPerTimeStep == 6
+    assert np.isclose(esM.numberOfYears, 48 * 2 / 8760)
+    assert ('Wind', 'operationRateMax', 'loc1') in errors.index and (errors['RMSE'] > 0).all()
+
+    # Absolute time series are summed up, relative time series are averaged
+    assert np.allclose(esM.getComponent('Electricity demand').fullOperationRateFix.sum(), demand)
+    assert np.allclose(esM.getComponent('Wind').fullOperationRateMax.mean(), wind)
+
+    # Commodity cost time series are weighted with the operation rates, i.e. the costs of a fixed operation are kept
+    hydrogenImport = esM.getComponent('Hydrogen import')
+    assert np.isclose((hydrogenImport.fullOperationRateFix.values *
+                       hydrogenImport.fullCommodityCostTimeSeries.values).sum(), cost)
+
+    esM.optimize(timeSeriesAggregation=False, solver='glpk')
+    demandOpt = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.loc['Electricity demand']
+    assert len(demandOpt.columns) == 16
+    assert np.isclose(demandOpt.values.sum(), demand.sum())
+
+
+if __name__ == "__main__":
+    test_resample()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check the segmentation of the typical periods.
+
+import os
+import sys
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel, getConstraintRows
+
+
+def test_segmentation():
+    esM = getModel()
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12)
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+    demand = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.loc['Electricity demand']
+
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12, numberOfSegmentsPerPeriod=4)
+    assert esM.timeStepsPerPeriod == [0, 1, 2, 3]
+    assert all(sum(esM.segmentDurations[p, t] for t in range(4)) == 12 for p in esM.typicalPeriods)
+
+    esM.declareOptimizationProblem(timeSeriesAggregation=True, buildBackend='rules')
+    rulesRows = getConstraintRows(esM.pyM)
+    esM.declareOptimizationProblem(timeSeriesAggregation=True, buildBackend='arrays')
+    assert rulesRows == getConstraintRows(esM.pyM)
+
+    # The operation of a segment refers to the whole segment, i.e. the demand is preserved
+    objectives = []
+    for kwargs in [{}, {'useVariableBounds': True, 'useMutableParameters': True}]:
+        esM.optimize(timeSeriesAggregation=True, solver='glpk', **kwargs)
+        objectives.append(pyomo.value(esM.pyM.Obj))
+        demandSegments = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum.loc[
+            'Electricity demand']
+        assert len(demandSegments.columns) == len(esM.periods) * 4
+        assert np.isclose(demandSegments.values.sum(), demand.values.sum())
+    assert np.isclose(objectives[0], objectives[1])
+
+
+if __name__ == "__main__":
+    test_segmentation()
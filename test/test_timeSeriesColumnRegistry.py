@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that the time series of the components are registered in one shared column array for the time series
+# aggregation.
+
+import os
+import sys
+import pandas as pd
+import numpy as np
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_timeSeriesColumnRegistry():
+    esM = getModel()
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12, storeTSAinstance=True)
+
+    # The aggregated time series of the components are views of one shared array
+    wind, battery = esM.getComponent('Wind'), esM.getComponent('Battery')
+    windData, batteryData = wind.getTimeSeries('aggregatedOperationRateMax'), \
+        battery.getTimeSeries('aggregatedDischargeOpRateMax')
+    assert windData.values.base is not None and windData.values.base is batteryData.values.base
+
+    data = pd.DataFrame.from_dict(esM.tsaInstance.clusterPeriodDict)
+    for loc in ['loc1', 'loc2']:
+        assert np.allclose(wind.aggregatedOperationRateMax[loc].values, data['Wind_operationRate_' + loc].values)
+        assert np.allclose(battery.aggregatedDischargeOpRateMax[loc].values, data['BatterydischargeRate_' + loc].values)
+
+
+if __name__ == "__main__":
+    test_timeSeriesColumnRegistry()
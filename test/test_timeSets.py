@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that the time sets, which are declared as products of a period set and integer range sets, contain the
+# (period, time step) tuples in the order of the periods and time steps for the full and the clustered time series.
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_timeSets():
+    esM = getModel()
+
+    for timeSeriesAggregation in [False, True]:
+        if timeSeriesAggregation:
+            esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12)
+        esM.declareOptimizationProblem(timeSeriesAggregation=timeSeriesAggregation)
+        pyM = esM.pyM
+
+        periods = esM.typicalPeriods if timeSeriesAggregation else [0]
+        numberOfTimeSteps = 12 if timeSeriesAggregation else 48
+        timeSteps = [(p, t) for p in periods for t in range(numberOfTimeSteps)]
+        interTimeSteps = [(p, t) for p in periods for t in range(numberOfTimeSteps + 1)]
+
+        assert list(pyM.timeSet) == timeSteps and len(pyM.timeSet) == len(timeSteps)
+        assert list(pyM.interTimeStepsSet) == interTimeSteps and len(pyM.interTimeStepsSet) == len(interTimeSteps)
+        assert all(timeStep in pyM.timeSet for timeStep in timeSteps)
+        assert (periods[0], numberOfTimeSteps) not in pyM.timeSet
+        assert (periods[0], numberOfTimeSteps) in pyM.interTimeStepsSet
+        assert (len(periods), 0) not in pyM.timeSet and (0, -1) not in pyM.interTimeStepsSet
+
+        # The time-indexed variables keep their (location, component name, period, time step) index
+        stateOfCharge = pyM.stor.stateOfCharge_stor
+        assert sorted(key[2:] for key in stateOfCharge if key[:2] == ('loc1', 'Battery')) == interTimeSteps
+
+
+if __name__ == "__main__":
+    test_timeSets()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that the data of components can be updated in a declared optimization problem with mutable parameters
+# and that the updated optimization problem results in the same optimal solution as a rebuilt one.
+
+import os
+import sys
+import FINE as fn
+import pandas as pd
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_updateComponentData():
+    solver = 'glpk'
+
+    for useVariableBounds in [False, True]:
+        esM = getModel()
+        esM.optimize(timeSeriesAggregation=False, solver=solver, useVariableBounds=useVariableBounds,
+                     useMutableParameters=True)
+        initialObj = pyomo.value(esM.pyM.Obj)
+
+        # Update the data of the declared optimization problem and solve it again
+        np.random.seed(0)
+        profile = pd.DataFrame(np.random.rand(len(esM.totalTimeSteps), 2), columns=['loc1', 'loc2'])
+        esM.updateComponentData('Wind', operationRateMax=profile * 0.5)
+        esM.updateComponentData('Import', operationRateMax=profile + 0.5)
+        esM.updateComponentData('Run-of-river', capacityFix=pd.Series([2, 1], index=['loc1', 'loc2']))
+        esM.optimize(declaresOptimizationProblem=False, solver=solver)
+        updatedObj = pyomo.value(esM.pyM.Obj)
+
+        # Rebuild the optimization problem with the updated data
+        esM.optimize(timeSeriesAggregation=False, solver=solver, useVariableBounds=useVariableBounds)
+        rebuiltObj = pyomo.value(esM.pyM.Obj)
+
+        assert not np.isclose(initialObj, updatedObj)
+        assert np.isclose(updatedObj, rebuiltObj)
+
+    try:
+        esM.updateComponentData('Wind', capacityMax=pd.Series([1, 1], index=['loc1', 'loc2']))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Component data was updated without mutable parameters.')
+
+    # The yearly limit can be updated with NumPy numbers (e.g. values taken from a DataFrame)
+    esM = getModel()
+    esM.add(fn.Source(esM=esM, name='Hydrogen import', commodity='hydrogen', hasCapacityVariable=False,
+                      commodityLimitID='Hydrogen import limit', yearlyLimit=-10))
+    esM.optimize(timeSeriesAggregation=False, solver=solver, useMutableParameters=True)
+    limitedObj = pyomo.value(esM.pyM.Obj)
+    esM.updateComponentData('Hydrogen import', yearlyLimit=np.float32(-20))
+    esM.optimize(declaresOptimizationProblem=False, solver=solver)
+
+    assert esM.getComponent('Hydrogen import').yearlyLimit == -20
+    assert pyomo.value(esM.pyM.Obj) < limitedObj
+
+
+if __name__ == "__main__":
+    test_updateComponentData()
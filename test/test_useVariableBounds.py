@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that modeling restrictions which only bound single variables as variable bounds instead of
+# constraints results in fewer constraints and the same optimal solution.
+
+import os
+import sys
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel, getConstraintRows
+
+
+def test_useVariableBounds():
+    esM = getModel()
+    solver = 'glpk'
+
+    esM.optimize(timeSeriesAggregation=False, solver=solver)
+    constraintsObj, constraintsRows = pyomo.value(esM.pyM.Obj), len(getConstraintRows(esM.pyM))
+    esM.optimize(timeSeriesAggregation=False, solver=solver, useVariableBounds=True)
+    boundsObj, boundsRows = pyomo.value(esM.pyM.Obj), len(getConstraintRows(esM.pyM))
+
+    assert boundsRows < constraintsRows
+    assert np.isclose(constraintsObj, boundsObj)
+    assert esM.pyM.srcSnk.cap_srcSnk['loc2', 'Run-of-river'].fixed
+    assert esM.pyM.srcSnk.op_srcSnk['loc1', 'Electricity demand', 0, 0].fixed
+    assert esM.pyM.srcSnk.op_srcSnk['loc1', 'Import', 0, 0].ub is not None
+
+
+if __name__ == "__main__":
+    test_useVariableBounds()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check the warm start of the optimization with the full time series data with the optimal values of the
+# clustered optimization problem.
+
+import os
+import sys
+import numpy as np
+import pyomo.environ as pyomo
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_warmstartFromClusteredModel():
+    esM = getModel()
+    esM.optimize(timeSeriesAggregation=False, solver='glpk')
+    fullObj = pyomo.value(esM.pyM.Obj)
+
+    esM.cluster(numberOfTypicalPeriods=2, numberOfTimeStepsPerPeriod=12)
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+    clusteredPyM, timeStepMap = esM.pyM, esM.getTimeStepMap()
+    assert len(timeStepMap) == 48 and timeStepMap[12] == (1, esM.periodsOrder[1], 0)
+    operation = esM.componentModelingDict['SourceSinkModel'].operationVariablesOptimum
+    stateOfCharge = esM.componentModelingDict['StorageModel'].stateOfChargeOperationVariablesOptimum
+
+    # The operation is expanded and the state of charge is reconstructed like the optimal values of the clustered model
+    esM.declareOptimizationProblem(timeSeriesAggregation=False)
+    for mdl in esM.componentModelingDict.values():
+        mdl.setWarmstartValues(getattr(esM.pyM, mdl.abbrvName), getattr(clusteredPyM, mdl.abbrvName), timeStepMap)
+    assert all(np.isclose(var.value, operation.loc[(compName, loc), t])
+               for (loc, compName, p, t), var in esM.pyM.srcSnk.op_srcSnk.items())
+    assert all(np.isclose(var.value, stateOfCharge.loc[(compName, loc), t])
+               for (loc, compName, p, t), var in esM.pyM.stor.stateOfCharge_stor.items() if t < 48)
+    assert esM.pyM.conv.cap_conv['loc1', 'Electrolyzer'].value == \
+        clusteredPyM.conv.cap_conv['loc1', 'Electrolyzer'].value
+
+    esM.optimize(timeSeriesAggregation=True, solver='glpk')
+    try:
+        esM.optimize(timeSeriesAggregation=True, solver='glpk', warmstart=esM)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('A clustered optimization problem was initialized with the values of another model.')
+    esM.optimize(timeSeriesAggregation=False, solver='glpk', warmstart=esM)
+    assert np.isclose(pyomo.value(esM.pyM.Obj), fullObj)
+
+
+if __name__ == "__main__":
+    test_warmstartFromClusteredModel()
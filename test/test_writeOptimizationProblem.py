@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Check that an optimization problem which is directly written to an LP or MPS file results in the same optimal
+# solution as the one declared in pyomo.
+
+import os
+import tempfile
+import sys
+import numpy as np
+import pyomo.environ as pyomo
+import pyomo.opt as opt
+
+sys.path.append(os.path.dirname(__file__))
+from getModel import getModel
+
+
+def test_writeOptimizationProblem():
+    solver = 'glpk'
+
+    esM = getModel()
+    esM.optimize(timeSeriesAggregation=False, solver=solver)
+    obj = pyomo.value(esM.pyM.Obj)
+    capacities = esM.componentModelingDict['SourceSinkModel'].capacityVariablesOptimum
+
+    tmpDir = tempfile.mkdtemp()
+    for fileFormat in ['lp', 'mps']:
+        fileName = os.path.join(tmpDir, 'problem.' + fileFormat)
+        esM.writeOptimizationProblem(fileName, fileFormat=fileFormat)
+        results = opt.SolverFactory(solver).solve(fileName)
+        solution = {name: data['Value'] for name, data in results.solution.variable.items()}
+        esM.readOptimizationSolution(solution, os.path.join(tmpDir, 'problem.map.json'))
+
+        assert np.isclose(pyomo.value(esM.pyM.Obj), obj)
+        assert np.allclose(esM.componentModelingDict['SourceSinkModel'].capacityVariablesOptimum.values,
+                           capacities.values)
+
+
+if __name__ == "__main__":
+    test_writeOptimizationProblem()